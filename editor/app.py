@@ -175,7 +175,7 @@ class MainWindow(QMainWindow):
         
         dialog = QDialog(self)
         dialog.setWindowTitle("Scene Settings")
-        dialog.setFixedSize(300, 150)
+        dialog.setMinimumSize(300, 150)
         
         layout = QFormLayout(dialog)
         
@@ -200,6 +200,9 @@ class MainWindow(QMainWindow):
                 
         color_btn.clicked.connect(pick_color)
         layout.addRow("Background Color:", color_btn)
+
+        # Physics Layers
+        self.add_physics_layer_settings(layout, scene)
         
         # Close Button
         close_btn = QPushButton("Close")
@@ -208,6 +211,61 @@ class MainWindow(QMainWindow):
         
         dialog.exec()
 
+    def add_physics_layer_settings(self, layout, scene):
+        """Layer names (comma separated) and the symmetric layer collision matrix."""
+        from PySide6.QtWidgets import QLineEdit, QWidget, QGridLayout, QCheckBox, QLabel
+        from shared.physics_layers import get_layer_names, layers_collide, set_layers_collide, DEFAULT_LAYER
+
+        names_edit = QLineEdit(", ".join(get_layer_names(scene.settings)[1:]))
+        names_edit.setPlaceholderText("Player, Bullet, Debris")
+        layout.addRow("Physics Layers:", names_edit)
+
+        matrix_widget = QWidget()
+        matrix = QGridLayout(matrix_widget)
+        matrix.setContentsMargins(0, 0, 0, 0)
+        matrix.setSpacing(2)
+        layout.addRow("Layer Collisions:", matrix_widget)
+
+        def rebuild_matrix():
+            while matrix.count():
+                item = matrix.takeAt(0)
+                if item.widget():
+                    item.widget().deleteLater()
+
+            names = get_layer_names(scene.settings)
+            for col, name in enumerate(names):
+                header = QLabel(name)
+                header.setStyleSheet("color: #888888; font-size: 9px;")
+                matrix.addWidget(header, 0, col + 1)
+            for row, row_name in enumerate(names):
+                label = QLabel(row_name)
+                label.setStyleSheet("color: #888888; font-size: 9px;")
+                matrix.addWidget(label, row + 1, 0)
+                # Lower triangle only, the matrix is symmetric
+                for col, col_name in enumerate(names[:row + 1]):
+                    check = QCheckBox()
+                    check.setChecked(layers_collide(scene.settings, row_name, col_name))
+                    check.stateChanged.connect(
+                        lambda state, a=row_name, b=col_name: set_layers_collide(scene.settings, a, b, state == 2))
+                    matrix.addWidget(check, row + 1, col + 1)
+
+        def commit_names():
+            names = []
+            for n in names_edit.text().split(","):
+                n = n.strip()
+                if n and n != DEFAULT_LAYER and n not in names:
+                    names.append(n)
+            physics = scene.settings.setdefault("physics", {})
+            physics["layers"] = [DEFAULT_LAYER] + names
+            # Drop matrix entries for layers that no longer exist
+            physics["ignore_layer_collisions"] = [
+                p for p in physics.get("ignore_layer_collisions", [])
+                if p[0] in physics["layers"] and p[1] in physics["layers"]]
+            rebuild_matrix()
+
+        names_edit.editingFinished.connect(commit_names)
+        rebuild_matrix()
+
     def refresh_ui(self):
         """Force a UI refresh after undo/redo."""
         # Hierarchy refresh
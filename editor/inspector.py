@@ -1,12 +1,13 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QScrollArea, QFrame, 
-    QFormLayout, QLineEdit, QHBoxLayout, QPushButton, QFileDialog, QCheckBox, QMenu
+    QFormLayout, QLineEdit, QHBoxLayout, QPushButton, QFileDialog, QCheckBox, QMenu, QComboBox
 )
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QDoubleValidator
 from editor.editor_state import EditorState
 from editor.script_parser import ScriptParser
 from editor.undo_redo import AddComponentCommand, ChangeComponentCommand, RemoveComponentCommand
+from shared.physics_layers import get_layer_names, DEFAULT_LAYER
 import os
 
 class FloatField(QLineEdit):
@@ -31,6 +32,9 @@ class FloatField(QLineEdit):
             QLineEdit:focus {
                 border: 1px solid #555555;
             }
+            QLineEdit:disabled {
+                color: #555555;
+            }
         """)
         self.setText(f"{value:.2f}")
         self.textChanged.connect(self._on_text_changed)
@@ -1041,6 +1045,17 @@ class InspectorPanel(QWidget):
         gravity_label.setStyleSheet("color: #666666; font-size: 10px;")
         form.addRow(gravity_label, gravity_check)
 
+        # Continuous Collision (fast bodies)
+        continuous = data.get("continuous", False)
+        continuous_check = QCheckBox()
+        continuous_check.setChecked(continuous)
+        continuous_check.stateChanged.connect(lambda s: self.update_component(obj, "RigidBody", "continuous", s == 2))
+        
+        continuous_label = QLabel("Continuous:")
+        continuous_label.setStyleSheet("color: #666666; font-size: 10px;")
+        continuous_label.setToolTip("Sweep this body between steps so it cannot tunnel through thin colliders")
+        form.addRow(continuous_label, continuous_check)
+
         # Restitution
         restitution = data.get("restitution", 0.5)
         rest_field = FloatField(restitution)
@@ -1104,6 +1119,59 @@ class InspectorPanel(QWidget):
         form_widget.setLayout(form)
         self.content_layout.addWidget(form_widget)
 
+    BITMASKS_ITEM = "(Bitmasks)"
+
+    def add_collision_filter_fields(self, form, data, obj, comp_name):
+        """
+        Layer combo box plus the raw Category/Mask fields. Like the runtime
+        (PhysicsSystem._shape_filter in runtime/physics.py), a named layer overrides
+        the bitmasks, so the fields are only editable while the "(Bitmasks)" entry
+        is selected.
+        """
+        settings = self.state.current_scene.settings if self.state.current_scene else {}
+        names = get_layer_names(settings)
+        current = data.get("layer")
+        if current is None:
+            uses_bitmasks = "category_bitmask" in data or "collision_mask" in data
+            current = self.BITMASKS_ITEM if uses_bitmasks else DEFAULT_LAYER
+        elif current not in names:
+            names.append(current) # Keep unknown layers visible instead of silently resetting them
+
+        combo = QComboBox()
+        combo.addItems(names + [self.BITMASKS_ITEM])
+        combo.setCurrentText(current)
+        form.addRow(QLabel("Layer:"), combo)
+
+        # Category
+        cat = data.get("category_bitmask", 1)
+        cat_field = FloatField(cat) # Using FloatField as IntField for simplicity MVP
+        cat_field.value_committed.connect(lambda v: self.update_component(obj, comp_name, "category_bitmask", int(v)))
+        form.addRow(QLabel("Category (Bitmask):"), cat_field)
+
+        # Mask
+        mask = data.get("collision_mask", 0xFFFFFFFF)
+        mask_field = FloatField(mask)
+        mask_field.value_committed.connect(lambda v: self.update_component(obj, comp_name, "collision_mask", int(v)))
+        form.addRow(QLabel("Mask (Bitmask):"), mask_field)
+
+        def set_bitmasks_enabled(enabled):
+            for field in (cat_field, mask_field):
+                field.setEnabled(enabled)
+                field.setToolTip("" if enabled else "Ignored while a layer is set; choose (Bitmasks) to use raw bits")
+
+        def on_layer_changed(name):
+            if name == self.BITMASKS_ITEM:
+                self.update_component(obj, comp_name, "layer", None)
+                if "category_bitmask" not in obj["components"][comp_name]:
+                    # Without any bitmask key the runtime would fall back to the Default layer
+                    self.update_component(obj, comp_name, "category_bitmask", int(cat))
+            else:
+                self.update_component(obj, comp_name, "layer", name)
+            set_bitmasks_enabled(name == self.BITMASKS_ITEM)
+
+        set_bitmasks_enabled(current == self.BITMASKS_ITEM)
+        combo.currentTextChanged.connect(on_layer_changed)
+
     def sync_collider_size(self, obj):
         # 1. Get Scale
         scale = [1.0, 1.0]
@@ -1167,8 +1235,8 @@ class InspectorPanel(QWidget):
     def add_component(self, obj, comp_name):
         defaults = {
             "SpriteRenderer": {"sprite_path": "", "layer": 0, "visible": True, "tint": [255, 255, 255, 255]},
-            "BoxCollider": {"size": [50.0, 50.0], "offset": [0.0, 0.0], "is_trigger": False},
-            "CircleCollider": {"radius": 25.0, "offset": [0.0, 0.0], "is_trigger": False},
+            "BoxCollider": {"size": [50.0, 50.0], "offset": [0.0, 0.0], "is_trigger": False, "layer": DEFAULT_LAYER},
+            "CircleCollider": {"radius": 25.0, "offset": [0.0, 0.0], "is_trigger": False, "layer": DEFAULT_LAYER},
             "RigidBody": {"mass": 1.0, "drag": 0.0, "use_gravity": True, "restitution": 0.5, "velocity": [0.0, 0.0]},
             "Script": {"script_path": ""},
             "Camera": {"width": 800.0, "height": 600.0, "zoom": 1.0, "is_main": True},
@@ -1210,17 +1278,8 @@ class InspectorPanel(QWidget):
         trigger_check.stateChanged.connect(lambda s: self.update_component(obj, "CircleCollider", "is_trigger", s == 2))
         form.addRow(QLabel("Is Trigger:"), trigger_check)
 
-        # Category
-        cat = data.get("category_bitmask", 1)
-        cat_field = FloatField(cat) # Using FloatField as IntField for simplicity MVP
-        cat_field.value_committed.connect(lambda v: self.update_component(obj, "CircleCollider", "category_bitmask", int(v)))
-        form.addRow(QLabel("Category (Bitmask):"), cat_field)
-
-        # Mask
-        mask = data.get("collision_mask", 0xFFFFFFFF)
-        mask_field = FloatField(mask)
-        mask_field.value_committed.connect(lambda v: self.update_component(obj, "CircleCollider", "collision_mask", int(v)))
-        form.addRow(QLabel("Mask (Bitmask):"), mask_field)
+        # Layer, Category, Mask
+        self.add_collision_filter_fields(form, data, obj, "CircleCollider")
 
         form_widget = QWidget()
         form_widget.setLayout(form)
@@ -1253,18 +1312,9 @@ class InspectorPanel(QWidget):
         trigger_check.setChecked(is_trigger)
         trigger_check.stateChanged.connect(lambda s: self.update_component(obj, "BoxCollider", "is_trigger", s == 2))
         form.addRow(QLabel("Is Trigger:"), trigger_check)
-        
-        # Category
-        cat = data.get("category_bitmask", 1)
-        cat_field = FloatField(cat) 
-        cat_field.value_committed.connect(lambda v: self.update_component(obj, "BoxCollider", "category_bitmask", int(v)))
-        form.addRow(QLabel("Category (Bitmask):"), cat_field)
 
-        # Mask
-        mask = data.get("collision_mask", 0xFFFFFFFF)
-        mask_field = FloatField(mask)
-        mask_field.value_committed.connect(lambda v: self.update_component(obj, "BoxCollider", "collision_mask", int(v)))
-        form.addRow(QLabel("Mask (Bitmask):"), mask_field)
+        # Layer, Category, Mask
+        self.add_collision_filter_fields(form, data, obj, "BoxCollider")
 
         form_widget = QWidget()
         form_widget.setLayout(form)
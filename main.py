@@ -11,15 +11,67 @@ if current_dir not in sys.path:
 def main():
     parser = argparse.ArgumentParser(description="Aspis Engine")
     parser.add_argument("--run-scene", help="Scene file to play immediately (Game Mode)")
+    parser.add_argument("--physics-threads", type=int, help="Solver threads for the physics world (Linux/macOS, overrides the scene)")
+    parser.add_argument("--profile", action="store_true", help="Show the frame profiler overlay (toggle with F3)")
+    parser.add_argument("--profile-csv", metavar="PATH", help="Record per-frame timings and write them to a CSV file on exit")
+    parser.add_argument("--trace", metavar="PATH", help="Record a Chrome trace timeline and write it on exit")
+    parser.add_argument("--trace-hitches", type=float, metavar="MS", help="Write the last frames as a trace whenever a frame takes longer than MS")
+    parser.add_argument("--memory-report", action="store_true", help="Check for leaks after each scene load and print a memory report on exit")
+    parser.add_argument("--log-level", metavar="LEVEL", help="Runtime log level: DEBUG, INFO, WARNING (default) or ERROR")
+    parser.add_argument("--log-file", metavar="PATH", help="Also write the runtime log to a file")
+    parser.add_argument("--pipelined", action="store_true", help="Run the simulation on its own thread, drawing the last published frame")
+    parser.add_argument("--seed", type=int, help="Random seed for scripts (recordings pick one if not given)")
+    parser.add_argument("--record", metavar="PATH", help="Record input and world hashes to a replay file (.replay.gz) on exit")
+    parser.add_argument("--replay", metavar="PATH", help="Play a replay file back and verify its world hashes (exit status 1 if it diverges)")
+    parser.add_argument("--replay-headless", action="store_true", help="Replay without a window, as fast as possible")
+    parser.add_argument("--bench", nargs="+", metavar="PATH", help="Benchmark scene files or folders headless and write a JSON report")
+    parser.add_argument("--bench-ticks", type=int, default=1200, help="Fixed steps per benchmarked scene")
+    parser.add_argument("--bench-seed", type=int, default=1234, help="Random seed for benchmarked scenes")
+    parser.add_argument("--bench-warmup", type=int, default=30, help="Frames left out of the percentiles")
+    parser.add_argument("--bench-out", default="bench_report.json", metavar="PATH", help="Benchmark report path")
+    parser.add_argument("--bench-baseline", metavar="PATH", help="Earlier report to compare against (exit status 1 on regressions)")
+    parser.add_argument("--bench-threshold", type=float, default=0.10, help="Allowed slowdown against the baseline (0.10 = 10%%)")
+    parser.add_argument("--bench-scale", metavar="N,N", help="Also benchmark copies of each scene prefilled with N FallingBox objects")
+    parser.add_argument("--bench-memory", type=int, default=0, metavar="N", help="Reload each benchmarked scene N times and report memory growth and leaks")
+    parser.add_argument("--bench-verbose", action="store_true", help="Show the output of benchmarked scenes")
+    parser.add_argument("--batch", metavar="SCENE", help="Simulate many headless instances of a scene on a process pool")
+    parser.add_argument("--batch-runs", type=int, default=8, help="Runs (seeds) per parameter set")
+    parser.add_argument("--batch-params", metavar="PATH", help="JSON list of scene overrides, e.g. [{\"settings.physics.spatial_hash_dim\": 50}]")
+    parser.add_argument("--batch-ticks", type=int, default=600, help="Fixed steps per run")
+    parser.add_argument("--batch-seed", type=int, default=1, help="Seed of the first run (the others count up from it)")
+    parser.add_argument("--batch-workers", type=int, help="Worker processes (default: one per core)")
+    parser.add_argument("--batch-out", metavar="PATH", help="Write one JSON line per run")
+    parser.add_argument("--batch-verbose", action="store_true", help="Show what the simulated scenes print")
     parser.add_argument("project", nargs="?", help="Project path to open directly")
     
     # Use parse_known_args to avoid choking on Qt specific args if any leak through
     args, unknown = parser.parse_known_args()
 
-    if args.run_scene:
+    if args.bench:
+        # --- BENCHMARK MODE ---
+        from runtime.bench import run_bench
+        scale = [int(n) for n in args.bench_scale.split(",")] if args.bench_scale else None
+        sys.exit(run_bench(args.bench, ticks=args.bench_ticks, seed=args.bench_seed, warmup=args.bench_warmup,
+                           out=args.bench_out, baseline=args.bench_baseline, threshold=args.bench_threshold,
+                           scale=scale, memory_loads=args.bench_memory, verbose=args.bench_verbose))
+    elif args.batch:
+        # --- BATCH SIMULATION MODE ---
+        from runtime.batch import run_batch
+        sys.exit(run_batch(args.batch, params_path=args.batch_params, runs=args.batch_runs, ticks=args.batch_ticks,
+                           seed=args.batch_seed, workers=args.batch_workers, out=args.batch_out,
+                           verbose=args.batch_verbose))
+    elif args.replay:
+        # --- REPLAY MODE ---
+        from runtime.replay import run_replay
+        sys.exit(run_replay(args.replay, headless=args.replay_headless))
+    elif args.run_scene:
         # --- GAME RUNTIME MODE ---
         from runtime.game_loop import run
-        run(args.run_scene)
+        run(args.run_scene, physics_threads=args.physics_threads,
+            profile=args.profile, profile_csv=args.profile_csv,
+            trace_path=args.trace, trace_hitch_ms=args.trace_hitches,
+            memory_report=args.memory_report, log_level=args.log_level, log_file=args.log_file,
+            seed=args.seed, record_path=args.record, pipelined=args.pipelined)
     else:
         # --- EDITOR MODE ---
         from editor.app import run
@@ -14,7 +14,44 @@ class Input:
 
 class Time:
     """Static helper for time."""
-    dt = 0.0
+    dt = 0.0 # Delta time of the phase being run (fixed step inside fixed_update)
+    fixed_dt = 1.0 / 120.0
+
+# --- Coroutine wait instructions ---
+# Yield one of these from a coroutine started with Script.start_coroutine():
+#     def blink(self):
+#         while True:
+#             yield wait_seconds(0.5)
+#             self.toggle()
+# Yielding None waits one frame; yielding a generator (or the handle returned by
+# start_coroutine) waits until that coroutine has finished.
+
+class WaitSeconds:
+    __slots__ = ("seconds",)
+    def __init__(self, seconds):
+        self.seconds = float(seconds)
+
+class WaitFrames:
+    __slots__ = ("frames",)
+    def __init__(self, frames):
+        self.frames = max(1, int(frames))
+
+class WaitUntil:
+    __slots__ = ("predicate",)
+    def __init__(self, predicate):
+        self.predicate = predicate
+
+def wait_seconds(seconds):
+    """Resume after the given game time in seconds."""
+    return WaitSeconds(seconds)
+
+def wait_frames(frames):
+    """Resume after the given number of rendered frames."""
+    return WaitFrames(frames)
+
+def wait_until(predicate):
+    """Resume on the first frame predicate() returns True (checked once per frame)."""
+    return WaitUntil(predicate)
 
 class GameObject:
     def __init__(self, id, name, position, rotation, scale):
@@ -69,8 +106,151 @@ class GameObject:
             return [self.scale[0] * ps[0], self.scale[1] * ps[1]]
         return self.scale
 
+class TransformView:
+    """
+    Array-backed view of the local transforms of many scripts (or GameObjects),
+    for System scripts that vectorize with NumPy:
+
+        @classmethod
+        def update_all(cls, instances, dt):
+            view = TransformView(instances)
+            view.rotations += 90.0 * dt
+            view.write_back()
+
+    positions/scales are (N, 2) and rotations (N,) float64 arrays, gathered on
+    first access. write_back() copies only the arrays that were accessed.
+    Gathering and writing back is per object, so the view pays off when the
+    batched math is heavier than a simple increment.
+    """
+
+    def __init__(self, items):
+        import numpy # Only Systems that use the view need NumPy
+        self._np = numpy
+        self.objects = [getattr(i, "game_object", i) for i in items]
+        self._positions = None
+        self._rotations = None
+        self._scales = None
+
+    @property
+    def positions(self):
+        if self._positions is None:
+            flat = self._np.fromiter((v for o in self.objects for v in o.position[:2]), self._np.float64,
+                                     count=len(self.objects) * 2)
+            self._positions = flat.reshape(-1, 2)
+        return self._positions
+
+    @positions.setter
+    def positions(self, value):
+        self._positions = self._np.asarray(value, dtype=self._np.float64).reshape(-1, 2)
+
+    @property
+    def rotations(self):
+        if self._rotations is None:
+            self._rotations = self._np.fromiter((o.rotation for o in self.objects), self._np.float64,
+                                                count=len(self.objects))
+        return self._rotations
+
+    @rotations.setter
+    def rotations(self, value):
+        self._rotations = self._np.asarray(value, dtype=self._np.float64)
+
+    @property
+    def scales(self):
+        if self._scales is None:
+            flat = self._np.fromiter((v for o in self.objects for v in o.scale[:2]), self._np.float64,
+                                     count=len(self.objects) * 2)
+            self._scales = flat.reshape(-1, 2)
+        return self._scales
+
+    @scales.setter
+    def scales(self, value):
+        self._scales = self._np.asarray(value, dtype=self._np.float64).reshape(-1, 2)
+
+    def write_back(self):
+        """Copies the accessed arrays back onto the GameObjects."""
+        if self._positions is not None:
+            for obj, (x, y) in zip(self.objects, self._positions.tolist()):
+                obj.position[0] = x
+                obj.position[1] = y
+        if self._rotations is not None:
+            for obj, rot in zip(self.objects, self._rotations.tolist()):
+                obj.rotation = rot
+        if self._scales is not None:
+            for obj, (x, y) in zip(self.objects, self._scales.tolist()):
+                obj.scale[0] = x
+                obj.scale[1] = y
+
+class Collision:
+    """
+    Contact information passed to collision callbacks that accept a second argument.
+    Contact points, normal and impulse are looked up lazily from the physics world,
+    so they are only valid during the callback.
+    """
+    __slots__ = ("game_object", "other", "is_trigger", "_shape", "_other_shape")
+
+    def __init__(self, game_object, other, shape, other_shape, is_trigger=False):
+        self.game_object = game_object
+        self.other = other
+        self.is_trigger = is_trigger
+        self._shape = shape
+        self._other_shape = other_shape
+
+    def _arbiter(self):
+        found = []
+        def check(arbiter):
+            if not found and self._other_shape in arbiter.shapes and self._shape in arbiter.shapes:
+                found.append(arbiter)
+        self._shape.body.each_arbiter(check)
+        return found[0] if found else None
+
+    @property
+    def contact_points(self):
+        """World-space contact points ([] once the objects separated)."""
+        arbiter = self._arbiter()
+        if arbiter is None:
+            return []
+        return [(p.point_a.x, p.point_a.y) for p in arbiter.contact_point_set.points]
+
+    @property
+    def normal(self):
+        """Contact normal pointing from this object towards the other one."""
+        arbiter = self._arbiter()
+        if arbiter is None:
+            return (0.0, 0.0)
+        n = arbiter.contact_point_set.normal
+        if arbiter.shapes[0] is not self._shape:
+            n = -n
+        return (n.x, n.y)
+
+    @property
+    def impulse(self):
+        """Total impulse applied to resolve the contact in the last step."""
+        arbiter = self._arbiter()
+        if arbiter is None:
+            return (0.0, 0.0)
+        i = arbiter.total_impulse
+        return (i.x, i.y)
+
+class RaycastHit:
+    """Result of a raycast or shape cast against the physics world."""
+    __slots__ = ("game_object", "point", "normal", "distance")
+
+    def __init__(self, game_object, point, normal, distance):
+        self.game_object = game_object
+        self.point = point
+        self.normal = normal
+        self.distance = distance
+
+    def __repr__(self):
+        return f"RaycastHit({self.game_object.name}, point={self.point}, distance={self.distance:.2f})"
+
 class Script:
     """Base class for all user scripts."""
+    always_update = False # Opt out of simulation LOD throttling when far from the camera
+    tick_rate = 0 # Max update()/late_update() calls per second, 0 = every frame
+    update_every_n = 1 # Run update()/late_update() only every N-th frame
+    parallel_safe = False # Run on the script thread pool; world changes are deferred (see runtime/parallel.py)
+
     def __init__(self):
         self.game_object = None  # Injected by runtime
         self.transform = None    # Helper to access transform
@@ -79,13 +259,42 @@ class Script:
         """Called when the scene starts."""
         pass
 
+    # A script class can also run as a System by defining classmethods
+    # fixed_update_all / update_all / late_update_all(cls, instances, dt): the runtime
+    # then calls them once per phase with every live instance instead of calling
+    # the per-instance method (see TransformView for NumPy batching).
+
+    def fixed_update(self, dt):
+        """Called every fixed physics step (120 Hz). Use for forces and velocities."""
+        pass
+
     def update(self, dt):
         """Called every frame. dt is delta time in seconds."""
         pass
 
+    def late_update(self, dt):
+        """Called every frame after all update() calls (e.g. cameras following objects)."""
+        pass
+
     def on_collision_enter(self, other):
         """Called when this object collides with another."""
         pass
+
+    def on_collision_stay(self, other):
+        """Called every physics step while this object keeps touching another."""
+        pass
+
+    def on_collision_exit(self, other):
+        """Called when this object stops touching another."""
+        pass
+
+    def on_trigger_enter(self, other):
+        """Called when this object starts overlapping a trigger (or is one)."""
+        pass
+
+    def on_trigger_exit(self, other):
+        """Called when this object stops overlapping a trigger."""
+        pass
         
     # --- API Methods (Delegated to Runtime) ---
     def instantiate(self, prefab_path, position, rotation=0.0):
@@ -114,6 +323,51 @@ class Script:
         # API hook
         return None
 
+    def start_coroutine(self, generator):
+        """Runs a generator as a coroutine (see wait_seconds). Returns a handle for stop_coroutine."""
+        # This will be monkey-patched by the runtime
+        print("Warning: start_coroutine called outside runtime")
+        return None
+
+    def stop_coroutine(self, handle):
+        """Stops a coroutine started with start_coroutine."""
+        pass
+
+    def stop_all_coroutines(self):
+        """Stops every coroutine this script started."""
+        pass
+
+    def report_metric(self, name, value):
+        """Records a named result of this run (e.g. a score) for batch simulations; the last value wins."""
+        pass
+
+    # --- Physics Queries (Delegated to Runtime) ---
+    # mask selects which collider categories can be hit (see layer_mask for named layers),
+    # category is the query's own category, tested against each collider's collision_mask.
+    def raycast(self, start, end, mask=0xFFFFFFFF, category=0xFFFFFFFF, include_triggers=True):
+        """Returns the first RaycastHit along the segment start -> end, or None."""
+        return None
+
+    def raycast_all(self, start, end, mask=0xFFFFFFFF, category=0xFFFFFFFF, include_triggers=True):
+        """Returns every RaycastHit along the segment, nearest first."""
+        return []
+
+    def shape_cast(self, radius, start, end, mask=0xFFFFFFFF, category=0xFFFFFFFF, include_triggers=True):
+        """Sweeps a circle of the given radius from start to end. Returns the first RaycastHit or None."""
+        return None
+
+    def overlap_circle(self, center, radius, mask=0xFFFFFFFF, category=0xFFFFFFFF, include_triggers=True):
+        """Returns the GameObjects whose colliders overlap the circle."""
+        return []
+
+    def overlap_box(self, center, size, rotation=0.0, mask=0xFFFFFFFF, category=0xFFFFFFFF, include_triggers=True):
+        """Returns the GameObjects whose colliders overlap the box (size in pixels, rotation in degrees)."""
+        return []
+
+    def layer_mask(self, *layer_names):
+        """Combined category bits of named physics layers, e.g. raycast(..., mask=self.layer_mask("Default", "Player"))."""
+        return 0xFFFFFFFF
+
 class KeyCode:
     """Mapping to Pygame keys."""
     W = pygame.K_w
@@ -0,0 +1,180 @@
+import os
+import sys
+import json
+import time
+import copy
+import multiprocessing
+
+# Batch simulation (main.py --batch SCENE ...): the same scene run many times with
+# different seeds and parameter overrides, for tuning and automated playtesting.
+# The scene file is read once; a pool of worker processes (one per core by default)
+# receives the parsed scene, and every run builds a headless GameRuntime from a copy
+# with its overrides applied, seeds `random`, runs a fixed number of fixed steps with
+# a constant 60 FPS frame time and sends back its metrics. Results arrive as runs
+# finish (iter_batch yields them, the command line writes one JSON line each).
+#
+#   python main.py --batch stress_test/scenes/05_stress_performance.scene.json --batch-runs 64
+#   python main.py --batch SCENE --batch-params sweep.json --batch-runs 16 --batch-out results.jsonl
+#
+# Overrides map dotted paths into the scene data to values. Inside "objects" the next
+# part is an object id or name:
+#   {"objects.Player.components.Script.properties.speed": 320,
+#    "settings.physics.spatial_hash_dim": 50}
+# Every part but the last must already exist in the scene (a KeyError names the
+# missing one, so a typo fails the run instead of being ignored); the last key is
+# set or added.
+# --batch-params is a JSON list of such dicts; each one runs with --batch-runs seeds.
+#
+# Every result has the run's seed and overrides, ticks, wall time, frame time
+# mean/p95/max, final object/body/script counts, script crashes and a world hash
+# (runtime/replay.py). Scripts add their own values with self.report_metric(name, value),
+# e.g. a score or whether a goal was reached; they show up under "metrics".
+
+FRAME_TIME = 1.0 / 60.0
+
+_scene_path = None # Set in each worker by _init_worker
+_scene_data = None
+
+
+def apply_overrides(scene_data, overrides):
+    """Sets each dotted path of overrides in scene_data (in place); returns scene_data."""
+    for path, value in (overrides or {}).items():
+        parts = path.split(".")
+        node = scene_data
+        for part in parts[:-1]:
+            if isinstance(node, list):
+                # Objects are addressed by id or name
+                match = [o for o in node if isinstance(o, dict) and part in (o.get("id"), o.get("name"))]
+                if not match:
+                    raise KeyError(f"{path}: no object '{part}'")
+                node = match[0]
+            elif isinstance(node, dict) and part in node:
+                node = node[part]
+            else:
+                # A typo must not silently create a branch the scene never reads
+                raise KeyError(f"{path}: no key '{part}'")
+        if not isinstance(node, dict):
+            raise KeyError(f"{path}: '{parts[-2] if len(parts) > 1 else path}' is not an object")
+        node[parts[-1]] = value
+    return scene_data
+
+
+def plan_runs(params, runs, seed):
+    """[(run index, seed, overrides)]: `runs` seeds for each override dict in params."""
+    plan = []
+    for overrides in params or [{}]:
+        for i in range(runs):
+            plan.append((len(plan), seed + i, overrides))
+    return plan
+
+
+def _init_worker(scene_path, scene_data, verbose):
+    global _scene_path, _scene_data
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ["SDL_NO_SIGNAL_HANDLERS"] = "1" # SDL would turn the pool's SIGTERM into a quit event
+    _scene_path = scene_path
+    _scene_data = scene_data
+    if not verbose:
+        sys.stdout = open(os.devnull, "w") # Script prints; results go back through the pool
+
+
+def simulate(scene_path, scene_data, seed, overrides, ticks):
+    """Runs one scene instance in this process and returns its result dict."""
+    from runtime.game_loop import GameRuntime
+    from runtime.replay import world_hash
+    from runtime.bench import summarize
+
+    data = apply_overrides(copy.deepcopy(scene_data), overrides)
+    # Only errors are logged: hundreds of runs would repeat the same warnings
+    runtime = GameRuntime(scene_path, seed=seed, scene_data=data, log_level="ERROR")
+    try:
+        frame_ms = []
+        start = time.perf_counter()
+        while runtime.running and runtime.tick < ticks:
+            frame_start = time.perf_counter()
+            runtime.advance_frame(FRAME_TIME)
+            frame_ms.append((time.perf_counter() - frame_start) * 1000.0)
+        wall_s = time.perf_counter() - start
+        frame = summarize(frame_ms)
+        return {
+            "seed": seed,
+            "overrides": overrides,
+            "ticks": runtime.tick,
+            "wall_s": round(wall_s, 3),
+            "frame_ms": {"mean": frame["mean"], "p95": frame["p95"], "max": frame["max"]},
+            "objects": len(runtime.objects),
+            "bodies": len(runtime.physics.bodies),
+            "scripts": len(runtime.active_scripts),
+            "crashes": runtime.crashes,
+            "world_hash": world_hash(runtime),
+            "metrics": dict(runtime.metrics),
+        }
+    finally:
+        runtime.parallel.shutdown()
+        runtime.watchdog.stop()
+        runtime.gc_policy.shutdown()
+
+
+def _run(task):
+    index, seed, overrides, ticks = task
+    try:
+        result = simulate(_scene_path, _scene_data, seed, overrides, ticks)
+    except Exception as e:
+        result = {"seed": seed, "overrides": overrides, "error": f"{type(e).__name__}: {e}"}
+    result["run"] = index
+    result["worker"] = os.getpid()
+    return result
+
+
+def iter_batch(scene_path, params=None, runs=8, ticks=600, seed=1, workers=None, verbose=False):
+    """
+    Runs the scene once per (seed, overrides) pair on a process pool and yields each
+    result dict as soon as its run finishes (not in submission order; see "run").
+    """
+    from shared.scene_loader import load_scene
+    scene_path = os.path.abspath(scene_path)
+    scene_data = load_scene(scene_path)
+    tasks = [(index, run_seed, overrides, ticks) for index, run_seed, overrides in plan_runs(params, runs, seed)]
+    workers = workers or os.cpu_count() or 1
+    with multiprocessing.Pool(min(workers, len(tasks)), initializer=_init_worker,
+                              initargs=(scene_path, scene_data, verbose)) as pool:
+        for result in pool.imap_unordered(_run, tasks):
+            yield result
+        pool.close()
+        pool.join()
+
+
+def run_batch(scene_path, params_path=None, runs=8, ticks=600, seed=1, workers=None, out=None, verbose=False):
+    """Command line entry: prints a line per run and writes JSON lines; returns the process exit code."""
+    params = None
+    if params_path:
+        with open(params_path, "r") as f:
+            params = json.load(f)
+        if isinstance(params, dict):
+            params = [params]
+    total = len(params or [{}]) * runs
+    print(f"Batch: {scene_path}, {total} runs of {ticks} ticks on {min(workers or os.cpu_count() or 1, total)} workers")
+
+    out_file = open(out, "w") if out else None
+    failed = 0
+    start = time.perf_counter()
+    try:
+        for result in iter_batch(scene_path, params, runs, ticks, seed, workers, verbose):
+            if out_file:
+                out_file.write(json.dumps(result) + "\n")
+                out_file.flush()
+            label = f"run {result['run']:>4} seed {result['seed']:<8}"
+            if "error" in result:
+                failed += 1
+                print(f"{label} ERROR {result['error']}")
+                continue
+            metrics = " ".join(f"{k}={v}" for k, v in result["metrics"].items())
+            print(f"{label} {result['wall_s']:>7.2f} s  p95 {result['frame_ms']['p95']:>7.3f} ms  "
+                  f"objects {result['objects']:>5}  crashes {result['crashes']}  {metrics}".rstrip())
+    finally:
+        if out_file:
+            out_file.close()
+    print(f"Batch: {total - failed}/{total} runs finished in {time.perf_counter() - start:.1f} s"
+          + (f", wrote {out}" if out else ""))
+    return 1 if failed else 0
@@ -0,0 +1,359 @@
+import os
+import sys
+import json
+import math
+import time
+import glob
+import random
+import platform
+import subprocess
+import tempfile
+
+# Scene benchmark runner (main.py --bench PATH ...).
+# Every scene runs headless in a fresh interpreter for a fixed number of fixed steps,
+# with a constant 60 FPS frame time, random.seed(seed) and PYTHONHASHSEED=seed, so two
+# runs on the same machine do the same work. The frame profiler records every frame;
+# the report has p50/p95/p99/max per phase, peak memory and object/body counts.
+#
+#   python main.py --bench stress_test/scenes --bench-out bench.json
+#   python main.py --bench stress_test/scenes --bench-baseline bench.json --bench-threshold 0.1
+#   python main.py --bench stress_test/scenes/05_stress_performance.scene.json --bench-scale 1000,10000
+#
+# --bench-memory N reloads each scene N times after the timed run with memory
+# diagnostics on (runtime/memory.py); objects of unloaded scenes that stay alive
+# are reported as leaks and also make the command exit with status 1.
+#
+# Replay files (main.py --record, runtime/replay.py) can be benchmarked like scenes:
+# they run their recorded frames with the recorded input and seed instead of `ticks`
+# constant frames, and a replay whose world hashes differ from the recording also
+# fails the run.
+#
+# With a baseline, frame time percentiles that got slower by more than the threshold
+# (and by more than MIN_DELTA_MS, to ignore noise on near-empty scenes) are listed
+# as regressions and the command exits with status 1.
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+FRAME_TIME = 1.0 / 60.0
+PERCENTILES = (50, 95, 99)
+COMPARED_STATS = ("p50", "p95", "p99")
+MIN_DELTA_MS = 0.1
+SCALE_PREFAB = os.path.join("stress_test", "prefabs", "FallingBox.json")
+SCALE_SPACING = 75 # px between prefilled objects (FallingBox is 70 px wide)
+
+
+def percentile(sorted_values, p):
+    """Linear interpolation between the closest ranks of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100.0
+    lo = math.floor(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(values):
+    values = sorted(values)
+    stats = {f"p{p}": round(percentile(values, p), 4) for p in PERCENTILES}
+    stats["max"] = round(values[-1], 4) if values else 0.0
+    stats["mean"] = round(sum(values) / len(values), 4) if values else 0.0
+    return stats
+
+
+def peak_memory_mb():
+    """Peak resident set size of this process, or None where `resource` is missing (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0, 1)
+
+
+# --- Scene scaling ---
+
+def scale_scene(scene_data, count, prefab_path=SCALE_PREFAB):
+    """
+    Returns a copy of scene_data with `count` prefab instances stacked in a grid on a
+    static floor wide enough to hold them, so a scene like 05_stress_performance can
+    be measured at 1k or 10k bodies without waiting for its spawner.
+    """
+    with open(os.path.join(PROJECT_ROOT, prefab_path), "r") as f:
+        prefab = json.load(f)
+    data = json.loads(json.dumps(scene_data))
+    objects = data.setdefault("objects", [])
+
+    columns = max(1, int(math.ceil(math.sqrt(count * 4.0 / 3.0))))
+    width = columns * SCALE_SPACING
+    floor_y = 590
+    objects.append({
+        "id": "bench_floor",
+        "name": "Bench Floor",
+        "components": {
+            "Transform": {"position": [width / 2.0, floor_y + 50], "scale": [width / 100.0 + 1, 1]},
+            "BoxCollider": {"size": [100, 100]},
+            "RigidBody": {"body_type": "static"},
+            "SpriteRenderer": {"sprite_path": "", "tint": [100, 100, 100, 255]},
+        },
+    })
+
+    for i in range(count):
+        comps = json.loads(json.dumps(prefab["components"]))
+        x = SCALE_SPACING / 2.0 + (i % columns) * SCALE_SPACING
+        y = floor_y - SCALE_SPACING / 2.0 - (i // columns) * SCALE_SPACING
+        comps.setdefault("Transform", {})["position"] = [x, y]
+        objects.append({"id": f"bench_{i}", "name": prefab.get("name", "Object"), "components": comps})
+
+    physics = data.setdefault("settings", {}).setdefault("physics", {})
+    physics["expected_bodies"] = physics.get("expected_bodies", 0) + count + 1
+    name = data.setdefault("metadata", {}).get("name", "Scene")
+    data["metadata"]["name"] = f"{name} x{count}"
+    return data
+
+
+def write_scaled_scenes(scene_path, counts, out_dir):
+    """Writes <name>_x<count>.scene.json variants of scene_path into out_dir."""
+    from shared.scene_loader import load_scene, save_scene
+    data = load_scene(scene_path)
+    base = os.path.basename(scene_path).replace(".scene.json", "")
+    paths = []
+    for count in counts:
+        path = os.path.join(out_dir, f"{base}_x{count}.scene.json")
+        save_scene(scale_scene(data, count), path)
+        paths.append(path)
+    return paths
+
+
+# --- Worker (one scene per interpreter) ---
+
+def bench_scene(scene_path, ticks, seed, warmup, memory_loads=0):
+    """
+    Runs one scene for `ticks` fixed steps in this process and returns its results.
+    With memory_loads, the scene is then reloaded that many times with memory
+    diagnostics on (after the timed run, so tracemalloc does not skew the timings).
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    random.seed(seed)
+
+    from collections import deque
+    import pygame
+    from runtime.game_loop import GameRuntime
+    from runtime.replay import InputReplay, REPLAY_SUFFIX
+
+    replay = InputReplay(scene_path) if scene_path.endswith(REPLAY_SUFFIX) else None
+    load_start = time.perf_counter()
+    if replay is not None:
+        runtime = GameRuntime(replay.scene_path, physics_threads=replay.physics_threads,
+                              seed=replay.seed, replay=replay)
+    else:
+        runtime = GameRuntime(scene_path)
+    load_ms = (time.perf_counter() - load_start) * 1000.0
+
+    profiler = runtime.profiler
+    profiler.enabled = True
+    profiler.frames = deque() # Keep every frame, not just the overlay history
+
+    run_start = time.perf_counter()
+    if replay is not None:
+        while runtime.running and not replay.finished:
+            runtime.advance_frame(replay.next_frame())
+    else:
+        while runtime.running and runtime.tick < ticks:
+            runtime.advance_frame(FRAME_TIME)
+    wall_s = time.perf_counter() - run_start
+
+    samples = list(profiler.frames)[warmup:] or list(profiler.frames)
+    phases = {"frame": summarize([s.frame_ms for s in samples])}
+    for name in profiler.section_order:
+        phases[name] = summarize([s.sections.get(name, 0.0) for s in samples])
+
+    counts = {}
+    for name in ("objects", "bodies", "scripts"):
+        values = [s.counters.get(name, 0) for s in samples]
+        counts[name] = {"max": max(values) if values else 0, "final": values[-1] if values else 0}
+
+    result = {
+        "scene": os.path.relpath(os.path.abspath(scene_path), PROJECT_ROOT),
+        "ticks": runtime.tick,
+        "frames": len(samples),
+        "load_ms": round(load_ms, 2),
+        "wall_s": round(wall_s, 3),
+        "phases": phases,
+        "counts": counts,
+        "peak_memory_mb": peak_memory_mb(),
+        "gc": {
+            "collections": list(runtime.gc_policy.collections),
+            "total_pause_ms": round(runtime.gc_policy.total_pause_ms, 3),
+            "max_pause_ms": round(runtime.gc_policy.max_pause_ms, 3),
+        },
+    }
+
+    if replay is not None:
+        result["replay"] = replay.summary()
+    if memory_loads:
+        result["memory"] = check_memory(runtime, memory_loads)
+
+    runtime.parallel.shutdown()
+    runtime.watchdog.stop()
+    runtime.gc_policy.shutdown()
+    pygame.quit()
+    return result
+
+
+def check_memory(runtime, loads, frames_per_load=60):
+    """Reloads the runtime's current scene `loads` times and returns the memory diagnostics summary."""
+    runtime.profiler.enabled = False # Its unbounded frame history would show up as growth
+    memory = runtime.memory
+    memory.configure({"tracemalloc": True}, force=True)
+    runtime.gc_policy.scene_unloading() # Frozen objects are invisible to gc.get_objects()
+    memory.scene_loaded(runtime.scene_path)
+    runtime.gc_policy.scene_loaded()
+    for _ in range(loads):
+        for _ in range(frames_per_load):
+            runtime.advance_frame(FRAME_TIME)
+        if not runtime.next_scene_path:
+            runtime.next_scene_path = runtime.scene_path # Scenes that switch by themselves keep doing so
+        runtime.process_lifecycle_events()
+    print(memory.format_report())
+    return memory.summary()
+
+
+def _run_worker(scene_path, ticks, seed, warmup, memory_loads, verbose):
+    """Benchmarks scene_path in a child interpreter; returns its result dict."""
+    from runtime.replay import InputReplay, REPLAY_SUFFIX
+    fd, result_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    env = dict(os.environ)
+    env["PYTHONHASHSEED"] = str(seed)
+    if scene_path.endswith(REPLAY_SUFFIX):
+        hash_seed = InputReplay(scene_path).hash_seed
+        if hash_seed is not None:
+            env["PYTHONHASHSEED"] = hash_seed # Same string hash order as the recording
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    cmd = [sys.executable, "-m", "runtime.bench", "--worker", os.path.abspath(scene_path),
+           str(ticks), str(seed), str(warmup), str(memory_loads), result_path]
+    output = None if verbose else subprocess.DEVNULL
+    try:
+        proc = subprocess.run(cmd, cwd=PROJECT_ROOT, env=env, stdout=output, stderr=output)
+        try:
+            with open(result_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"scene": scene_path, "error": f"worker exited with status {proc.returncode}"}
+    finally:
+        os.remove(result_path)
+
+
+# --- Baseline comparison ---
+
+def compare(report, baseline, threshold):
+    """[(scene, stat, baseline ms, current ms)] for frame time stats slower than the threshold allows."""
+    base_scenes = {s["scene"]: s for s in baseline.get("scenes", []) if "error" not in s}
+    regressions = []
+    for scene in report["scenes"]:
+        base = base_scenes.get(scene["scene"])
+        if base is None or "error" in scene:
+            continue
+        for stat in COMPARED_STATS:
+            old = base["phases"]["frame"][stat]
+            new = scene["phases"]["frame"][stat]
+            if new > old * (1.0 + threshold) and new - old > MIN_DELTA_MS:
+                regressions.append((scene["scene"], stat, old, new))
+    return regressions
+
+
+# --- Command line entry ---
+
+def collect_scenes(paths):
+    from runtime.replay import REPLAY_SUFFIX
+    scenes = []
+    for path in paths:
+        if os.path.isdir(path):
+            scenes.extend(sorted(glob.glob(os.path.join(path, "*.scene.json"))))
+            scenes.extend(sorted(glob.glob(os.path.join(path, "*" + REPLAY_SUFFIX))))
+        else:
+            scenes.append(path)
+    return scenes
+
+
+def run_bench(paths, ticks=1200, seed=1234, warmup=30, out="bench_report.json",
+              baseline=None, threshold=0.10, scale=None, memory_loads=0, verbose=False):
+    """Benchmarks every scene in paths (files or folders); returns the process exit code."""
+    scenes = collect_scenes(paths)
+    scale_dir = None
+    if scale:
+        # Scaled variants of every listed scene go to a temporary folder
+        scale_dir = tempfile.mkdtemp(prefix="aspis_bench_")
+        for path in list(scenes):
+            scenes.extend(write_scaled_scenes(path, scale, scale_dir))
+    if not scenes:
+        print("Bench: No scenes found.")
+        return 1
+
+    print(f"Bench: {len(scenes)} scenes, {ticks} ticks, seed {seed}")
+    print(f"{'Scene':<44}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'bodies':>8}{'mem MB':>8}")
+    results = []
+    for path in scenes:
+        result = _run_worker(path, ticks, seed, warmup, memory_loads, verbose)
+        if scale_dir and path.startswith(scale_dir):
+            result["scene"] = os.path.basename(path) # Temporary path is meaningless in a baseline
+        results.append(result)
+        name = os.path.basename(result["scene"])
+        if "error" in result:
+            print(f"{name:<44}  {result['error']}")
+            continue
+        frame = result["phases"]["frame"]
+        memory = result["peak_memory_mb"]
+        print(f"{name:<44}{frame['p50']:>9.3f}{frame['p95']:>9.3f}{frame['p99']:>9.3f}{frame['max']:>9.3f}"
+              f"{result['counts']['bodies']['max']:>8}{memory if memory is not None else '-':>8}")
+        replay = result.get("replay")
+        if replay and replay["mismatches"]:
+            print(f"  DIVERGED from the recording at tick {replay['first_mismatch']}")
+        leaks = result.get("memory", {}).get("leaks")
+        if leaks:
+            print(f"  LEAK after {memory_loads} reloads: " + ", ".join(f"{n} x{c}" for n, c in leaks.items()))
+
+    report = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "ticks": ticks,
+        "seed": seed,
+        "warmup": warmup,
+        "memory_loads": memory_loads,
+        "scenes": results,
+    }
+    if out:
+        with open(out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Bench: Wrote {out}")
+
+    status = 1 if any("error" in r or r.get("memory", {}).get("leaks") or r.get("replay", {}).get("mismatches")
+                      for r in results) else 0
+    if baseline:
+        with open(baseline, "r") as f:
+            base = json.load(f)
+        regressions = compare(report, base, threshold)
+        if regressions:
+            print(f"Bench: {len(regressions)} regressions over {threshold:.0%} against {baseline}:")
+            for scene, stat, old, new in regressions:
+                print(f"  {scene:<44}{stat:<5}{old:>9.3f} -> {new:.3f} ms (+{(new / old - 1.0) if old else 1.0:.0%})")
+            status = 1
+        else:
+            print(f"Bench: No regressions over {threshold:.0%} against {baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    # Worker mode: python -m runtime.bench --worker SCENE TICKS SEED WARMUP MEMORY_LOADS RESULT_PATH
+    if len(sys.argv) == 8 and sys.argv[1] == "--worker":
+        scene, ticks, seed, warmup, memory_loads, result_path = sys.argv[2:]
+        result = bench_scene(scene, int(ticks), int(seed), int(warmup), int(memory_loads))
+        with open(result_path, "w") as f:
+            json.dump(result, f)
+    else:
+        print("Usage: python main.py --bench PATH [PATH ...]")
+        sys.exit(2)
@@ -5,6 +5,9 @@ import json
 import importlib.util
 import inspect
 import math
+import time
+import random
+import weakref
 
 # Add project root to path
 # Use shared path utility to locate root
@@ -21,10 +24,62 @@ if PROJECT_ROOT not in sys.path:
 from shared.scene_schema import Scene
 from shared.scene_loader import load_scene
 from runtime.api import GameObject, Script, Input, Time
-from runtime.physics import PhysicsSystem
+from runtime.physics import PhysicsSystem, EVENT_COLLISION_STAY
+from runtime.lod import SimulationLOD
+from runtime.scheduler import ScriptScheduler, CoroutineScheduler, PHASE_FIXED_UPDATE, PHASE_UPDATE, PHASE_LATE_UPDATE
+from runtime.parallel import ParallelScriptRunner, DeferredTransform, deferred_commands
+from runtime.watchdog import ScriptWatchdog, ScriptTimeout
+from runtime.profiler import FrameProfiler
+from runtime.trace_recorder import TraceRecorder
+from runtime.script_costs import ScriptCostTracker
+from runtime.memory import MemoryDiagnostics
+from runtime.gc_policy import GCPolicy
+from runtime.replay import InputRecorder
+from runtime.snapshot import WorldSnapshot
+from runtime.pipeline import SimulationPipeline
+from runtime import log as runtime_log
+
+log = runtime_log.get_logger("runtime")
+
+FIXED_DT = Time.fixed_dt # 120 Hz fixed logic update (Sub-stepping)
+
+# Script callbacks fed by the physics collision pipeline
+COLLISION_CALLBACKS = (
+    "on_collision_enter", "on_collision_stay", "on_collision_exit",
+    "on_trigger_enter", "on_trigger_exit",
+)
+
+_collision_handler_cache = weakref.WeakKeyDictionary() # Script subclass -> {callback name: passes Collision?}
+
+def get_collision_handlers(script_cls):
+    """
+    Returns the collision callbacks a Script subclass actually overrides, mapped to
+    whether the override accepts the Collision object as a second argument.
+    """
+    handlers = _collision_handler_cache.get(script_cls)
+    if handlers is None:
+        handlers = {}
+        for name in COLLISION_CALLBACKS:
+            method = getattr(script_cls, name, None)
+            if method is None or method is getattr(Script, name):
+                continue
+            try:
+                params = list(inspect.signature(method).parameters.values())[1:] # skip self
+                handlers[name] = len(params) >= 2 or any(p.kind == p.VAR_POSITIONAL for p in params)
+            except (TypeError, ValueError):
+                handlers[name] = False
+        _collision_handler_cache[script_cls] = handlers
+    return handlers
 
 class GameRuntime:
-    def __init__(self, scene_path, width=800, height=600):
+    def __init__(self, scene_path, width=800, height=600, physics_threads=None, profile=False, profile_csv=None,
+                 trace_path=None, trace_hitch_ms=None, memory_report=False, log_level=None, log_file=None,
+                 seed=None, record_path=None, replay=None, scene_data=None, pipelined=False):
+        runtime_log.configure(log_level, log_file)
+        if record_path and seed is None:
+            seed = random.SystemRandom().randrange(2 ** 31)
+        if seed is not None:
+            random.seed(seed) # Before any script is loaded, so awake() draws the same numbers
         pygame.init()
         self.screen = pygame.display.set_mode((width, height))
         pygame.display.set_caption("Aspis Engine Runtime")
@@ -32,11 +87,56 @@ class GameRuntime:
         self.running = True
         
         self.scene_path = scene_path
+        self.scene_data = scene_data # Already loaded scene for the first load_level (batch runs)
         self.active_scripts = [] # List of instantiated Script objects
         self.sprites = {} # path -> surface
+        self.script_classes = {} # script file -> its Script subclass (None if it has none), per scene
         self.objects = [] # List of runtime GameObject instances
+        self.collision_listeners = {} # object.id -> scripts overriding a collision callback
         
+        self.physics_threads = physics_threads # CLI override of the scene's physics.threads
         self.physics = PhysicsSystem()
+        self.lod = SimulationLOD(None, self.physics) # Replaced per scene in load_level
+        self.tick = 0 # Fixed steps since start
+        self.frame = 0 # Rendered frames since start
+        self.accumulator = 0.0 # Frame time not yet consumed by fixed steps
+        self.parallel = ParallelScriptRunner() # Thread pool for parallel_safe scripts
+        self.scheduler = ScriptScheduler(self.parallel) # Which scripts run in each update phase
+        self.coroutines = CoroutineScheduler(self._on_script_error)
+        self.watchdog = ScriptWatchdog() # Reports and interrupts runaway script calls
+        self.scheduler.watchdog = self.watchdog
+        self.coroutines.watchdog = self.watchdog
+        
+        # Profiling (F3 toggles the overlay, F4 exports CSV, F6 writes a trace)
+        self.profiler = FrameProfiler()
+        self.tracer = TraceRecorder()
+        self.profiler.tracer = self.tracer
+        self.trace_path = trace_path # Chrome trace written on exit
+        if trace_path or trace_hitch_ms:
+            self.tracer.enabled = True
+        if trace_hitch_ms:
+            self.tracer.hitch_ms = trace_hitch_ms
+        self.script_costs = ScriptCostTracker(FrameProfiler.BUDGET_MS) # Sampled per-script timings
+        self.watchdog.costs = self.script_costs
+        self.profile_csv = profile_csv # Written on exit
+        if profile:
+            self.profiler.toggle_overlay()
+        if profile_csv:
+            self.profiler.enabled = True
+        self.memory = MemoryDiagnostics() # Leak checks across scene loads
+        self.memory.enabled = memory_report
+        self.gc_policy = GCPolicy(FrameProfiler.BUDGET_MS) # Freezes scene objects, optional idle-time collection
+        self.gc_policy.bind_profiler(self.profiler)
+        self.recorder = None # Input and world hashes written on exit (--record)
+        if record_path:
+            self.recorder = InputRecorder(record_path, scene_path, seed, physics_threads=physics_threads)
+        self.replay = replay # InputReplay providing the keys and checking the world hashes (--replay)
+        self.checkpoint = None # WorldSnapshot captured with F7, restored with F8
+        self.crashes = 0 # Script and System failures since start
+        self.metrics = {} # Values reported by scripts with report_metric (batch results)
+        self.pipelined = pipelined # Simulation on its own thread (--pipelined, or the scene's "pipeline" setting)
+        self.pipeline = None # SimulationPipeline while run() is pipelined
+        self.render_profiler = None # Times draw() on the main thread while pipelined
         
         # Lifecycle Queues
         self.instantiate_queue = [] # List of (prefab, pos, rot)
@@ -48,24 +148,51 @@ class GameRuntime:
         
         self.load_level()
         self.start_scripts()
+        self.memory.scene_loaded(self.scene_path)
+        self.gc_policy.scene_loaded()
 
     def _inject_api(self, script_instance):
         """Injects runtime methods into the script instance."""
+        # Inside a parallel batch, world changes are recorded and applied after the batch
         def inst(prefab, pos, rot=0):
+            commands = deferred_commands()
+            if commands is not None:
+                commands.append(lambda: self._perform_instantiate(prefab, pos, rot))
+                return None # Object does not exist until the batch is applied
             return self._perform_instantiate(prefab, pos, rot)
         
         def dest(obj):
+            commands = deferred_commands()
+            if commands is not None:
+                commands.append(lambda: self.destroy_queue.append(obj))
+                return
             self.destroy_queue.append(obj)
             
         def load(name):
             # Assume name is path relative to PROJECT_ROOT or simple name?
             # Let's assume full path or relative to project
-            self.next_scene_path = os.path.join(PROJECT_ROOT, name)
+            path = os.path.join(PROJECT_ROOT, name)
+            commands = deferred_commands()
+            if commands is not None:
+                commands.append(lambda: setattr(self, "next_scene_path", path))
+                return
+            self.next_scene_path = path
             
         def play_snd(path):
+            commands = deferred_commands()
+            if commands is not None:
+                commands.append(lambda: play_snd(path))
+                return
             full_path = os.path.join(PROJECT_ROOT, path)
             if os.path.exists(full_path):
                 pygame.mixer.Sound(full_path).play()
+
+        def start_co(gen):
+            commands = deferred_commands()
+            if commands is not None:
+                commands.append(lambda: self.coroutines.start(script_instance, gen))
+                return None
+            return self.coroutines.start(script_instance, gen)
         
         def find_obj(name):
             for obj in self.objects:
@@ -78,46 +205,214 @@ class GameRuntime:
         script_instance.load_scene = load
         script_instance.play_sound = play_snd
         script_instance.find_object = find_obj
+        script_instance.start_coroutine = start_co
+        def deferred(fn):
+            # Runs fn now, or after the batch inside a parallel batch
+            def call(*args):
+                commands = deferred_commands()
+                if commands is not None:
+                    commands.append(lambda: fn(*args))
+                    return
+                fn(*args)
+            return call
+
+        script_instance.stop_coroutine = deferred(lambda handle: self.coroutines.stop(handle))
+        script_instance.stop_all_coroutines = deferred(lambda: self.coroutines.stop_owner(script_instance))
+        script_instance.report_metric = deferred(lambda name, value: self.metrics.__setitem__(name, value))
+
+        # Physics queries go through self.physics at call time (it is replaced on scene load)
+        script_instance.raycast = lambda *a, **kw: self.physics.raycast(*a, **kw)
+        script_instance.raycast_all = lambda *a, **kw: self.physics.raycast_all(*a, **kw)
+        script_instance.shape_cast = lambda *a, **kw: self.physics.shape_cast(*a, **kw)
+        script_instance.overlap_circle = lambda *a, **kw: self.physics.overlap_circle(*a, **kw)
+        script_instance.overlap_box = lambda *a, **kw: self.physics.overlap_box(*a, **kw)
+        script_instance.layer_mask = lambda *names: self.physics.layer_mask(*names)
 
 
 
 
     def run(self):
-        FIXED_DT = 1.0 / 120.0 # 120 Hz fixed logic update (Sub-stepping)
-        accumulator = 0.0
+        if self.pipelined or getattr(self, "scene_settings", {}).get("pipeline", {}).get("enabled", False):
+            self._run_pipelined()
+        else:
+            while self.running:
+                # 1. Frame time measurement
+                frame_time = self.clock.tick(60) / 1000.0
+                if frame_time > 0.25: frame_time = 0.25 # Prevent spiral of death
+                self.profiler.fps = self.clock.get_fps()
+                self.advance_frame(frame_time)
         
+        if self.script_costs.enabled and self.script_costs.sampled_frames:
+            print(self.script_costs.format_report())
+        if self.profile_csv:
+            self.profiler.export_csv(self.profile_csv)
+        if self.memory.enabled:
+            print(self.memory.format_report())
+        if self.profiler.frames:
+            print(self.gc_policy.format_report())
+        if self.trace_path and self.tracer.frames:
+            print(f"Trace: Wrote {len(self.tracer.frames)} frames to {self.tracer.write(self.trace_path)}")
+        if self.recorder is not None:
+            print(f"Replay: Recorded {len(self.recorder.frames)} frames to {self.recorder.write()} (seed {self.recorder.header['seed']})")
+        self.parallel.shutdown()
+        self.watchdog.stop()
+        self.gc_policy.shutdown()
+        runtime_log.shutdown()
+        pygame.quit()
+        sys.exit()
+
+    def _run_pipelined(self):
+        """
+        Main thread side of the pipelined mode (runtime/pipeline.py): events and
+        drawing the latest RenderSnapshot while the simulation thread steps the world.
+        """
+        self.pipeline = SimulationPipeline(self)
+        # The simulation thread owns self.profiler; drawing is timed separately and the
+        # overlay shows both (the simulation's lines come with each RenderSnapshot)
+        self.render_profiler = profiler = FrameProfiler()
+        self.gc_policy.bind_profiler(profiler) # Collections triggered while drawing
+        self.pipeline.start()
         while self.running:
-            # 1. Frame time measurement
-            frame_time = self.clock.tick(60) / 1000.0
-            if frame_time > 0.25: frame_time = 0.25 # Prevent spiral of death
-            
+            self.clock.tick(60)
+            profiler.fps = self.clock.get_fps()
             self.handle_events()
+            frame = self.pipeline.take(1.0 / 60.0)
+            if frame is None:
+                continue
+            profiler.enabled = self.profiler.enabled
+            profiler.show_overlay = self.profiler.show_overlay
+            profiler.begin_frame()
+            profiler.start("draw")
+            self.draw(frame)
+            profiler.stop("draw")
+            profiler.end_frame()
+        self.pipeline.join()
+        if self.pipeline.error is not None:
+            raise self.pipeline.error
+        log.info(self.pipeline.format_report())
+
+    def advance_frame(self, frame_time):
+        """
+        Runs one frame: events, the fixed steps that fit into the accumulated time,
+        update/late_update and drawing. run() feeds it wall clock time; the scene
+        benchmark feeds it a constant frame time so runs are repeatable.
+        """
+        profiler = self.profiler
+        frame_start = self.begin_frame()
+        
+        profiler.start("events")
+        self.handle_events()
+        profiler.stop("events")
+        
+        self.simulate_frame(frame_time)
+        
+        # 5. Rendering (Variable rate)
+        # Future: Interpolate (alpha = self.accumulator / FIXED_DT)
+        profiler.start("draw")
+        self.draw()
+        profiler.stop("draw")
+        
+        self.end_frame(frame_start)
+
+    def begin_frame(self):
+        """Starts the per-frame bookkeeping (profiler, script costs, watchdog); returns the frame's start time."""
+        frame_start = time.perf_counter()
+        self.profiler.begin_frame()
+        self.script_costs.begin_frame(self.frame)
+        self.watchdog.update_active()
+        return frame_start
+
+    def simulate_frame(self, frame_time):
+        """Everything of a frame but events and drawing: fixed steps, update/late_update and lifecycle events."""
+        profiler = self.profiler
+        if self.recorder is not None:
+            self.recorder.record_frame(frame_time, Input._keys)
+        
+        # 2. Accumulate time
+        self.accumulator += frame_time
+        
+        # 3. Fixed Update Loop (Physics + fixed_update)
+        while self.accumulator >= FIXED_DT:
+            Time.dt = FIXED_DT
             
-            # 2. Accumulate time
-            accumulator += frame_time
-            
-            # 3. Fixed Update Loop (Physics + Scripts)
-            while accumulator >= FIXED_DT:
-                Time.dt = FIXED_DT
-                
+            with profiler.span("fixed_step"):
                 # Physics Step
-                events = self.physics.update(FIXED_DT, self.objects)
+                profiler.start("physics")
+                events = self.step_physics(FIXED_DT)
+                profiler.stop("physics")
+                profiler.start("collisions")
                 self.dispatch_collision_events(events)
+                profiler.stop("collisions")
                 
                 # Scripts Step (Fixed Update)
-                self.update_scripts(FIXED_DT)
+                profiler.start("fixed_update")
+                self.fixed_update_scripts(FIXED_DT)
+                profiler.stop("fixed_update")
                 
                 # Processing Queued Lifecycle Events
+                profiler.start("lifecycle")
                 self.process_lifecycle_events()
-                
-                accumulator -= FIXED_DT
+                profiler.stop("lifecycle")
             
-            # 4. Rendering (Variable rate)
-            # Future: Interpolate (alpha = accumulator / FIXED_DT)
-            self.draw()
+            self.tick += 1
+            self.accumulator -= FIXED_DT
+            if self.recorder is not None:
+                self.recorder.record_tick(self)
+            elif self.replay is not None:
+                self.replay.check_tick(self)
         
-        pygame.quit()
-        sys.exit()
+        # 4. Frame Update (update + late_update, once per rendered frame)
+        Time.dt = frame_time
+        profiler.start("update")
+        self.update_scripts(frame_time)
+        profiler.stop("update")
+        profiler.start("lifecycle")
+        self.process_lifecycle_events()
+        profiler.stop("lifecycle")
+        self.frame += 1
+
+    def end_frame(self, frame_start):
+        """Ends the per-frame bookkeeping begun with begin_frame, with idle-time garbage collection."""
+        profiler = self.profiler
+        profiler.set_counter("objects", len(self.objects))
+        profiler.set_counter("bodies", len(self.physics.bodies))
+        profiler.set_counter("scripts", len(self.active_scripts))
+        
+        # 6. Idle time: a due garbage collection, if the GC policy collects manually
+        self.gc_policy.end_frame((time.perf_counter() - frame_start) * 1000.0)
+        profiler.end_frame()
+        self.script_costs.end_frame()
+
+    def capture_snapshot(self):
+        """WorldSnapshot of the current state (see runtime/snapshot.py)."""
+        return WorldSnapshot.capture(self)
+
+    def restore_snapshot(self, snapshot):
+        """Restores a WorldSnapshot; call between frames, not from inside a script call."""
+        snapshot.restore(self)
+
+    def _write_trace(self):
+        """Writes the buffered timeline; starts recording first if it was off."""
+        if not self.tracer.frames:
+            self.tracer.enabled = True
+            self.profiler.enabled = True
+            print("Trace: Recording started, press F6 again to write the trace.")
+            return
+        os.makedirs(self.tracer.output_dir, exist_ok=True)
+        path = os.path.join(self.tracer.output_dir, time.strftime("trace_%Y%m%d_%H%M%S.json"))
+        self.tracer.write(path)
+        print(f"Trace: Wrote {len(self.tracer.frames)} frames to {path}")
+
+    def step_physics(self, dt):
+        """Steps the physics world, syncing only what the simulation LOD asks for when enabled."""
+        if not self.lod.enabled:
+            return self.physics.update(dt, self.objects)
+
+        camera_obj, _ = self.get_main_camera()
+        camera_pos = camera_obj.world_position if camera_obj else (0.0, 0.0)
+        self.lod.refresh(self.tick, self.objects, camera_pos)
+        sync_to, sync_from = self.lod.physics_objects(self.tick)
+        return self.physics.update(dt, sync_to, sync_from)
 
     def process_lifecycle_events(self):
         # 1. Instantiate
@@ -131,7 +426,7 @@ class GameRuntime:
             # Logic: Remove from objects list, active_scripts list, and physics bodies
             
             ids_to_destroy = set(obj.id for obj in self.destroy_queue)
-            print(f"DEBUG: Processing destruction for {len(ids_to_destroy)} objects.")
+            log.debug("Processing destruction for %d objects", len(ids_to_destroy))
             
             # Recursive destroy logic? For now, flat.
             # Actually, we need to handle children too if we support hierarchy destroy.
@@ -145,29 +440,34 @@ class GameRuntime:
             
             # Remove Physics
             for obj_id in ids_to_destroy:
-                if obj_id in self.physics.bodies:
-                    body = self.physics.bodies[obj_id]
-                    self.physics.space.remove(body, *body.shapes)
-                    del self.physics.bodies[obj_id]
+                self.physics.remove_body(obj_id)
             
             self.destroy_queue.clear()
+            self._scripts_changed()
+            self.lod.mark_dirty()
 
         # 3. Scene Load
         if self.next_scene_path:
             self.scene_path = self.next_scene_path
             self.next_scene_path = None
-            # Reset everything
+            # Reset everything (load_level creates a fresh physics world)
+            self.profiler.start("lifecycle.load_scene")
+            self.memory.retire_scene(self)
+            self.gc_policy.scene_unloading()
             self.active_scripts.clear()
             self.objects.clear()
-            self.physics = PhysicsSystem() # Reset physics world
-            self.sprites.clear()
+            self.sprites = {} # Not cleared: a published render snapshot may still draw from the old cache
+            self.script_classes.clear() # Scripts edited since are picked up by the next scene
             self.load_level()
             self.start_scripts()
+            self.memory.scene_loaded(self.scene_path)
+            self.gc_policy.scene_loaded()
+            self.profiler.stop("lifecycle.load_scene")
 
     def _perform_instantiate(self, prefab_path, pos, rot):
         full_path = os.path.join(PROJECT_ROOT, prefab_path)
         if not os.path.exists(full_path):
-            print(f"Error: Prefab not found {prefab_path}")
+            log.error("Prefab not found: %s", prefab_path)
             return None
             
         try:
@@ -201,6 +501,7 @@ class GameRuntime:
             if "CircleCollider" in comps: go.components["CircleCollider"] = comps["CircleCollider"].copy()
             
             self.objects.append(go)
+            self.lod.mark_dirty()
             
             # Load Assets
             if "SpriteRenderer" in comps:
@@ -218,94 +519,186 @@ class GameRuntime:
                 # Find the last added script
                 if self.active_scripts and self.active_scripts[-1].game_object == go:
                     try:
-                        self.active_scripts[-1].start()
-                        # Inject methods
+                        # Inject methods first so start() can use them
                         self._inject_api(self.active_scripts[-1])
+                        self.watchdog.begin(self.active_scripts[-1], "start")
+                        self.active_scripts[-1].start()
+                        self.watchdog.end()
                     except Exception as e:
-                        print(f"Error starting instantiated script: {e}")
+                        self.watchdog.end()
+                        log.error("Error starting instantiated script: %s", e)
+                    self._scripts_changed()
             
             return go
             
         except Exception as e:
-            print(f"Error instantiating {prefab_path}: {e}")
+            log.error("Error instantiating %s: %s", prefab_path, e)
             return None
 
     def dispatch_collision_events(self, events):
-        for obj, other in events:
-            # Find script attached to obj
-            # Iterate backwards or copy list if we might remove scripts? 
-            # Dispatch happens? scripts don't usually self-destruct in collision but catch errors anyway
-            for script in self.active_scripts[:]: # Copy list for safety
-                if script.game_object == obj:
-                    try:
-                        script.on_collision_enter(other)
-                    except Exception as e:
-                        print(f"CRASH: Script '{type(script).__name__}' on '{obj.name}' failed in on_collision_enter: {e}")
-                        self._disable_crashing_script(script)
+        """Delivers (event kind, Collision) tuples from the physics step, then empties the buffer."""
+        watchdog = self.watchdog
+        for kind, collision in events:
+            obj = collision.game_object
+            scripts = self.collision_listeners.get(obj.id)
+            if not scripts:
+                continue
+            for script in scripts:
+                passes_collision = get_collision_handlers(type(script)).get(kind)
+                if passes_collision is None:
+                    continue
+                try:
+                    watchdog.begin(script, kind)
+                    if passes_collision:
+                        getattr(script, kind)(collision.other, collision)
+                    else:
+                        getattr(script, kind)(collision.other)
+                    watchdog.end()
+                except Exception as e:
+                    watchdog.end()
+                    self._on_script_error(script, kind, e)
+        events.clear()
+
+    def _scripts_changed(self):
+        """Active scripts were added or removed: rebuild update phases and collision listeners, drop orphaned coroutines."""
+        self.scheduler.rebuild(self.active_scripts)
+        self.coroutines.remove_dead_owners(self.active_scripts)
+        self._refresh_collision_listeners()
+
+    def _refresh_collision_listeners(self):
+        """Rebuilds which objects receive collision events (only those with a script that handles them)."""
+        listeners = {}
+        stay = set()
+        for script in self.active_scripts:
+            handlers = get_collision_handlers(type(script))
+            if not handlers:
+                continue
+            obj_id = script.game_object.id
+            listeners.setdefault(obj_id, []).append(script)
+            if EVENT_COLLISION_STAY in handlers:
+                stay.add(obj_id)
+        self.collision_listeners = listeners
+        self.physics.listeners = set(listeners)
+        self.physics.stay_listeners = stay
+
+    def fixed_update_scripts(self, dt):
+        """fixed_update() on every script that implements it, once per physics step."""
+        lod = self.lod if self.lod.enabled else None
+        self.scheduler.run(PHASE_FIXED_UPDATE, dt, self.tick, self._on_script_error, lod)
 
     def update_scripts(self, dt):
-        # We iterate a copy because we might remove scripts if they crash
-        for script in self.active_scripts[:]:
-            try:
-                script.update(dt)
-            except Exception as e:
-                print(f"CRASH: Script '{type(script).__name__}' on '{script.game_object.name}' failed in update: {e}")
-                self._disable_crashing_script(script)
+        """update(), coroutines, then late_update(), once per frame."""
+        lod = self.lod if self.lod.enabled else None
+        self.scheduler.run(PHASE_UPDATE, dt, self.frame, self._on_script_error, lod)
+        self.coroutines.run(dt)
+        self.scheduler.run(PHASE_LATE_UPDATE, dt, self.frame, self._on_script_error, lod)
+
+    def _on_script_error(self, script, phase, e):
+        self.crashes += 1
+        if isinstance(e, ScriptTimeout):
+            e = "exceeded the watchdog time budget"
+        if isinstance(script, list):
+            # A System batch failed: the whole class is disabled at once
+            self._disable_crashing_system(script, phase, e)
+            return
+        log.error("CRASH: Script '%s' on '%s' failed in %s: %s", type(script).__name__, script.game_object.name, phase, e)
+        self._disable_crashing_script(script)
+
+    def _disable_crashing_system(self, instances, phase, e):
+        name = type(instances[0]).__name__ if instances else "?"
+        log.error("CRASH: System '%s' failed in %s: %s", name, phase, e)
+        doomed = set(id(s) for s in instances)
+        self.active_scripts = [s for s in self.active_scripts if id(s) not in doomed]
+        self._scripts_changed()
+        log.warning("SANDBOX: Disabled system '%s' (%d instances) due to error.", name, len(instances))
 
     def _disable_crashing_script(self, script):
         """Safely removes a crashing script to keep the engine stable."""
         if script in self.active_scripts:
             self.active_scripts.remove(script)
-            print(f"SANDBOX: Disabled script '{type(script).__name__}' on '{script.game_object.name}' due to error.")
+            self._scripts_changed()
+            log.warning("SANDBOX: Disabled script '%s' on '%s' due to error.", type(script).__name__, script.game_object.name)
 
     def load_script(self, script_path, game_object):
         """Dynamically load a script file and instantiate its Script class."""
         try:
             full_path = os.path.join(PROJECT_ROOT, script_path)
             if not os.path.exists(full_path):
-                print(f"Script file not found: {full_path}")
+                log.error("Script file not found: %s", full_path)
                 return
 
-            module_name = os.path.splitext(os.path.basename(script_path))[0]
-            spec = importlib.util.spec_from_file_location(module_name, full_path)
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[module_name] = module
-            spec.loader.exec_module(module)
-
-            # Find class inheriting from Script
-            for name, obj in inspect.getmembers(module):
-                if inspect.isclass(obj) and issubclass(obj, Script) and obj is not Script:
-                    # Instantiate
-                    instance = obj()
-                    instance.game_object = game_object
-                    instance.transform = game_object # Alias for convenience
-                    
-                    # Inject properties from Inspector
-                    if "Script" in game_object.components:
-                        props = game_object.components["Script"].get("properties", {})
-                        for key, value in props.items():
-                            setattr(instance, key, value)
-                            
-                    self.active_scripts.append(instance)
+            # The file runs once per scene: every instance shares its class, so System
+            # scripts batch and the per-class caches (collision handlers) are shared
+            if full_path not in self.script_classes:
+                module_name = os.path.splitext(os.path.basename(script_path))[0]
+                spec = importlib.util.spec_from_file_location(module_name, full_path)
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[module_name] = module
+                spec.loader.exec_module(module)
+
+                # Find class inheriting from Script
+                self.script_classes[full_path] = next(
+                    (obj for name, obj in inspect.getmembers(module)
+                     if inspect.isclass(obj) and issubclass(obj, Script) and obj is not Script), None)
+
+            script_cls = self.script_classes[full_path]
+            if script_cls is None:
+                return
+            name = script_cls.__name__
+
+            # Instantiate
+            instance = script_cls()
+            instance.game_object = game_object
+            instance.transform = game_object # Alias for convenience
+            if instance.parallel_safe:
+                # Writes from the thread pool are deferred through the proxy
+                instance.game_object = instance.transform = DeferredTransform(game_object)
+            
+            # Inject properties from Inspector
+            if "Script" in game_object.components:
+                props = game_object.components["Script"].get("properties", {})
+                for key, value in props.items():
+                    setattr(instance, key, value)
                     
-                    # Call Awake() immediately
-                    if hasattr(instance, "awake"):
-                        try:
-                            instance.awake()
-                        except Exception as e:
-                            print(f"Error in Awake() of {name}: {e}")
+            self.active_scripts.append(instance)
+            
+            # Call Awake() immediately
+            if hasattr(instance, "awake"):
+                try:
+                    self.watchdog.begin(instance, "awake")
+                    instance.awake()
+                    self.watchdog.end()
+                except Exception as e:
+                    self.watchdog.end()
+                    log.error("Error in Awake() of %s: %s", name, e)
 
-                    print(f"Attached script {name} to {game_object.name}")
-                    return
+            log.debug("Attached script %s to %s", name, game_object.name)
 
         except Exception as e:
-            print(f"Error loading script {script_path}: {e}")
+            log.error("Error loading script %s: %s", script_path, e)
 
     def load_level(self):
         try:
-            print(f"Loading scene: {self.scene_path}")
-            data = load_scene(self.scene_path)
+            log.info("Loading scene: %s", self.scene_path)
+            data = self.scene_data if self.scene_data is not None else load_scene(self.scene_path)
+            self.scene_data = None # Scene changes load from disk
             self.scene_settings = data.get("settings", {})
+
+            # Fresh physics world, threaded if the scene (or the command line) asks for it
+            threads = self.physics_threads or self.scene_settings.get("physics", {}).get("threads", 1)
+            self.physics = PhysicsSystem(threads=threads)
+            self.physics.profiler = self.profiler
+            self.lod = SimulationLOD(self.scene_settings.get("lod"), self.physics)
+            self.parallel.configure(self.scene_settings.get("scripts"))
+            self.script_costs.configure(self.scene_settings.get("script_costs"),
+                                        force=self.script_costs.enabled or self.profiler.show_overlay)
+            self.script_costs.begin_loading()
+            self.watchdog.configure(self.scene_settings.get("watchdog"))
+            self.tracer.configure(self.scene_settings.get("trace"), force=self.tracer.enabled)
+            self.memory.configure(self.scene_settings.get("memory"), force=self.memory.enabled)
+            self.gc_policy.configure(self.scene_settings.get("gc"))
+            if self.tracer.enabled:
+                self.profiler.enabled = True # Spans come from the profiler's sections
             
             # Sort objects for rendering order
             raw_objects = data.get("objects", [])
@@ -343,7 +736,7 @@ class GameRuntime:
                                 if os.path.exists(full_path):
                                     self.sprites[full_path] = pygame.image.load(full_path).convert_alpha()
                                 else:
-                                    print(f"Warning: Sprite not found: {full_path}")
+                                    log.warning("Sprite not found: %s", full_path)
                                     self.sprites[full_path] = None
                 
                 # Load Background
@@ -398,9 +791,19 @@ class GameRuntime:
                     
                     child.parent = parent
                     parent.children.append(child)
+
+            # Layers must be compiled before the first step creates the bodies
+            self.physics.configure_layers(self.scene_settings)
+
+            physics_settings = self.scene_settings.get("physics", {})
+            if physics_settings.get("merge_static_colliders", True):
+                self.physics.merge_static_colliders(self.objects)
+
+            # Broadphase depends on the colliders we just loaded
+            self.physics.configure_broadphase(physics_settings, self.objects)
                             
         except Exception as e:
-            print(f"Failed to load scene: {e}")
+            log.error("Failed to load scene: %s", e)
             self.running = False
 
     def start_scripts(self):
@@ -409,7 +812,9 @@ class GameRuntime:
             self._inject_api(script)
             
             try:
+                self.watchdog.begin(script, "start")
                 script.start()
+                self.watchdog.end()
                 
                 # Re-inject properties to override defaults set in start()
                 # This ensures Inspector values take precedence
@@ -418,7 +823,13 @@ class GameRuntime:
                     for key, value in props.items():
                          setattr(script, key, value)
             except Exception as e:
-                print(f"Error in Start() of {script}: {e}")
+                self.watchdog.end()
+                log.error("Error in Start() of %s: %s", script, e)
+
+        self._scripts_changed()
+        # Scene loading is over, back to sampling per frame
+        self.script_costs.sampling = False
+        self.watchdog.update_active()
 
 
 
@@ -428,28 +839,61 @@ class GameRuntime:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
+                    if self.profiler.show_overlay:
+                        self.script_costs.enabled = True
+                elif event.key == pygame.K_F4 and self.profiler.frames:
+                    path = time.strftime("profile_%Y%m%d_%H%M%S.csv")
+                    self._on_simulation(lambda: self.profiler.export_csv(path))
+                elif event.key == pygame.K_F6:
+                    self._on_simulation(self._write_trace)
+                elif event.key == pygame.K_F7:
+                    self._on_simulation(self._save_checkpoint)
+                elif event.key == pygame.K_F8 and self.checkpoint is not None:
+                    self._on_simulation(self._load_checkpoint)
         
-        # Update Input state
-        keys = pygame.key.get_pressed()
-        Input._keys = keys
+        # Update Input state (recorded keys when replaying)
+        if self.replay is not None:
+            Input._keys = self.replay.keys
+        else:
+            Input._keys = pygame.key.get_pressed()
 
-    def update_scripts(self, dt):
-        for script in self.active_scripts:
-            try:
-                script.update(dt)
-            except Exception as e:
-                print(f"Error in Update() of {script}: {e}")
+    def _on_simulation(self, fn):
+        """Runs fn now, or on the simulation thread before its next frame when pipelined."""
+        if self.pipeline is not None:
+            self.pipeline.post(fn)
+        else:
+            fn()
 
-    def draw(self):
-        # 1. Find Main Camera
-        camera_obj = None
-        camera_comp = None
-        for go in self.objects:
+    def _save_checkpoint(self):
+        self.checkpoint = self.capture_snapshot()
+        print(f"Snapshot: Checkpoint at tick {self.tick} ({len(self.objects)} objects)")
+
+    def _load_checkpoint(self):
+        try:
+            self.restore_snapshot(self.checkpoint)
+        except ValueError as e:
+            log.warning("Cannot restore the checkpoint: %s", e)
+
+    def get_main_camera(self, objects=None):
+        """Returns (GameObject, Camera component) of the main camera, or (None, None)."""
+        for go in (self.objects if objects is None else objects):
             cam = go.components.get("Camera")
             if cam and cam.get("is_main", True):
-                camera_obj = go
-                camera_comp = cam
-                break
+                return go, cam
+        return None, None
+
+    def draw(self, frame=None):
+        """Draws the live scene, or a RenderSnapshot published by the simulation thread (pipelined mode)."""
+        if frame is None:
+            objects, settings, sprites = self.objects, getattr(self, "scene_settings", None), self.sprites
+        else:
+            objects, settings, sprites = frame.objects, frame.settings, frame.sprites
+        
+        # 1. Find Main Camera
+        camera_obj, camera_comp = self.get_main_camera(objects)
         
         
         # Default settings if no camera
@@ -463,8 +907,8 @@ class GameRuntime:
         # Ideally, we should store the scene_data or settings on the class.
         # Hack: Parse it from scene file again or store it in load_level?
         # Better: GameRuntime should have self.scene_settings
-        if hasattr(self, "scene_settings"):
-            bg_color = tuple(self.scene_settings.get("background_color", [20, 20, 20])[:3])
+        if settings is not None:
+            bg_color = tuple(settings.get("background_color", [20, 20, 20])[:3])
             
         if camera_comp:
             screen_w = int(camera_comp.get("width", 800))
@@ -492,8 +936,13 @@ class GameRuntime:
             if tr: return tr.get("layer", 100) # Text defaults to top (100) to overlay sprites
             return 0
             
-        sorted_objects = sorted(self.objects, key=get_layer)
+        profiler = self.profiler if frame is None else self.render_profiler
+        profiler.start("draw.sort")
+        sorted_objects = sorted(objects, key=get_layer)
+        profiler.stop("draw.sort")
         
+        profiler.start("draw.blit")
+        blits = 0
         for go in sorted_objects:
             # Common Transform Calculation
             pos = go.world_position
@@ -523,8 +972,8 @@ class GameRuntime:
                     # Scale based on 100x100 base size if no sprite, or sprite size
                     base_w, base_h = 100, 100 # Default size
                     
-                    if path and path in self.sprites:
-                        base_w, base_h = self.sprites[path].get_size()
+                    if path and path in sprites:
+                        base_w, base_h = sprites[path].get_size()
                     
                     w = base_w * scale[0]
                     h = base_h * scale[1]
@@ -536,8 +985,8 @@ class GameRuntime:
                     target_rect.center = (screen_x, screen_y)
 
                 # Fetch Image or Create Surface
-                if path and path in self.sprites:
-                    img = self.sprites[path]
+                if path and path in sprites:
+                    img = sprites[path]
                     # Scale image to target rect
                     if img.get_size() != target_rect.size:
                         img = pygame.transform.scale(img, target_rect.size)
@@ -560,6 +1009,7 @@ class GameRuntime:
                         img.fill(color[:3], special_flags=pygame.BLEND_MULT)
                         
                     self.screen.blit(img, target_rect)
+                    blits += 1
                     
                 else:
                      # Color Fill
@@ -576,6 +1026,7 @@ class GameRuntime:
                              surf = pygame.transform.rotate(surf, -rot)
                              target_rect = surf.get_rect(center=target_rect.center)
                          self.screen.blit(surf, target_rect)
+                         blits += 1
             
             # --- 1. Draw Sprite (if exists and visible) ---
             sprite_data = go.components.get("SpriteRenderer")
@@ -591,8 +1042,8 @@ class GameRuntime:
                     else:
                         img = pygame.Surface((100, 100), pygame.SRCALPHA)
                         img.fill((255, 255, 255))
-                elif path in self.sprites:
-                    img = self.sprites[path]
+                elif path in sprites:
+                    img = sprites[path]
                 
                 if img:
                     rot = go.world_rotation
@@ -630,6 +1081,7 @@ class GameRuntime:
                                 img = pygame.transform.rotate(img, -rot)
                             rect = img.get_rect(center=(screen_x, screen_y))
                             self.screen.blit(img, rect)
+                            blits += 1
                         except:
                             pass
             
@@ -654,10 +1106,19 @@ class GameRuntime:
                     surf = font.render(text_content, True, color)
                     rect = surf.get_rect(center=(screen_x, screen_y))
                     self.screen.blit(surf, rect)
+                    blits += 1
+
+        profiler.stop("draw.blit")
+        profiler.count("blits", blits)
 
+        overlay_lines = self.script_costs.overlay_lines() if frame is None else frame.overlay_lines
+        profiler.draw_overlay(self.screen, overlay_lines)
+        profiler.start("draw.flip")
         pygame.display.flip()
+        profiler.stop("draw.flip")
 
-def run(scene_path):
+def run(scene_path, physics_threads=None, profile=False, profile_csv=None, trace_path=None, trace_hitch_ms=None,
+        memory_report=False, log_level=None, log_file=None, seed=None, record_path=None, pipelined=False):
     """Entry point for the Game Runtime"""
     # DPI Awareness for Windows
     if sys.platform == "win32":
@@ -668,7 +1129,11 @@ def run(scene_path):
             pass
     
     try:
-        runtime = GameRuntime(scene_path)
+        runtime = GameRuntime(scene_path, physics_threads=physics_threads,
+                              profile=profile, profile_csv=profile_csv,
+                              trace_path=trace_path, trace_hitch_ms=trace_hitch_ms,
+                              memory_report=memory_report, log_level=log_level, log_file=log_file,
+                              seed=seed, record_path=record_path, pipelined=pipelined)
         runtime.run()
     except Exception as e:
         import traceback
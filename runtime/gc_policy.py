@@ -0,0 +1,142 @@
+import gc
+import time
+import threading
+
+# Garbage collector policy for the game loop. CPython's cyclic collector runs
+# whenever enough container objects were allocated, which can be in the middle
+# of draw() or a physics sync, and a full collection over a big scene shows up
+# as a hitch.
+#   - freeze_after_load: after a scene loaded, collect once and gc.freeze() what is
+#     left, so the scene's long-lived objects are never scanned again. Before the
+#     next scene load everything is unfrozen so the old scene can be collected.
+#     Cycles that become garbage during the scene and were part of it at load time
+#     (e.g. a destroyed object with a script) wait for the next scene load.
+#   - manual: automatic collection is off; at the end of each frame the young
+#     generations are collected if the frame left at least idle_ms of the frame
+#     budget. When frames stay too busy for max_deferred frames, it collects anyway.
+# Every collection is timed through gc.callbacks and shows up as the "gc" section
+# of the profiler (and as spans in the trace). Python runs the callbacks on whichever
+# thread triggered the collection, so a pause is only recorded in the profiler bound
+# to that thread (bind_profiler); pipelined, the simulation thread has the runtime's
+# profiler and the main thread the render profiler. Pauses on other threads (script
+# workers, the watchdog) only go into the counters of format_report().
+#
+# Scene settings (all optional):
+#   "gc": {
+#       "freeze_after_load": true,
+#       "manual": false,
+#       "idle_ms": 2.0,          # time left in the frame needed for an idle collection
+#       "max_deferred": 30,      # frames a due collection may wait
+#       "threshold": [700, 10, 10]
+#   }
+
+
+class GCPolicy:
+    def __init__(self, budget_ms=1000.0 / 60.0):
+        self.budget_ms = budget_ms
+        self.freeze_after_load = True
+        self.manual = False
+        self.idle_ms = 2.0
+        self.max_deferred = 30
+        self.profilers = {} # Thread ident -> FrameProfiler receiving that thread's pauses
+
+        self.collections = [0, 0, 0] # Per generation, since start
+        self.total_pause_ms = 0.0
+        self.max_pause_ms = 0.0
+        self.unprofiled_pause_ms = 0.0 # Pauses on threads without a profiler
+        self.deferred = 0 # Frames a due collection has been waiting
+
+        self._default_threshold = gc.get_threshold()
+        self._pause_start = None
+        self._installed = False
+
+    def configure(self, settings):
+        settings = settings or {}
+        self.freeze_after_load = bool(settings.get("freeze_after_load", True))
+        self.manual = bool(settings.get("manual", False))
+        self.idle_ms = float(settings.get("idle_ms", 2.0))
+        self.max_deferred = max(1, int(settings.get("max_deferred", 30)))
+        threshold = settings.get("threshold")
+        gc.set_threshold(*(threshold or self._default_threshold))
+        if not self._installed:
+            gc.callbacks.append(self._on_gc)
+            self._installed = True
+
+    def bind_profiler(self, profiler):
+        """Records the pauses of collections triggered on the calling thread in profiler (None unbinds)."""
+        if profiler is None:
+            self.profilers.pop(threading.get_ident(), None)
+        else:
+            self.profilers[threading.get_ident()] = profiler
+
+    def shutdown(self):
+        if self._installed:
+            gc.callbacks.remove(self._on_gc)
+            self._installed = False
+        gc.unfreeze()
+        gc.enable()
+
+    # --- Scene loads ---
+
+    def scene_unloading(self):
+        """Before a scene is dropped: its frozen objects must be collectable again."""
+        gc.unfreeze()
+        gc.enable() # Automatic collection while loading, manual mode resumes afterwards
+
+    def scene_loaded(self):
+        if self.freeze_after_load:
+            gc.collect() # Garbage from loading (and the old scene) must not be frozen
+            gc.freeze()
+        if self.manual:
+            gc.disable()
+        self.deferred = 0
+
+    # --- Frames ---
+
+    def end_frame(self, frame_ms):
+        """Called with the frame's work time; runs a due collection in manual mode if there is time left."""
+        if not self.manual:
+            return
+        counts = gc.get_count()
+        threshold = gc.get_threshold()
+        if counts[0] < threshold[0]:
+            return
+        if self.budget_ms - frame_ms < self.idle_ms and self.deferred < self.max_deferred:
+            self.deferred += 1
+            return
+        self.deferred = 0
+        # Older generations are only collected as often as automatic collection would
+        generation = 0
+        if counts[1] >= threshold[1]:
+            generation = 1
+            if counts[2] >= threshold[2]:
+                generation = 2
+        gc.collect(generation)
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._pause_start = time.perf_counter()
+            return
+        start = self._pause_start
+        if start is None:
+            return
+        self._pause_start = None
+        elapsed = (time.perf_counter() - start) * 1000.0
+        self.collections[info.get("generation", 0)] += 1
+        self.total_pause_ms += elapsed
+        if elapsed > self.max_pause_ms:
+            self.max_pause_ms = elapsed
+        profiler = self.profilers.get(threading.get_ident())
+        if profiler is not None:
+            profiler.add("gc", start, elapsed)
+            profiler.count("gc_collections")
+        else:
+            self.unprofiled_pause_ms += elapsed
+
+    def format_report(self):
+        count = sum(self.collections)
+        average = self.total_pause_ms / count if count else 0.0
+        return (f"GC: {count} collections (gen0 {self.collections[0]}, gen1 {self.collections[1]}, "
+                f"gen2 {self.collections[2]}), {self.total_pause_ms:.1f} ms total, "
+                f"{average:.3f} ms average, {self.max_pause_ms:.2f} ms worst"
+                + (f", {self.unprofiled_pause_ms:.1f} ms on other threads" if self.unprofiled_pause_ms else ""))
@@ -0,0 +1,160 @@
+import pymunk
+from shared.component_defs import COMPONENT_RIGIDBODY, COMPONENT_BOX_COLLIDER
+from runtime.log import get_logger
+
+log = get_logger("lod")
+
+class SimulationLOD:
+    """
+    Simulation level-of-detail based on distance from the main camera.
+
+    Scene settings (all optional, LOD is off unless "enabled" is true):
+        "lod": {
+            "enabled": true,
+            "near_distance": 1200,   # full rate physics sync and script updates
+            "sleep_distance": 2500,  # beyond this dynamic bodies are put to sleep
+            "far_update_every": 4,   # between the two: sync/update every N ticks
+            "refresh_every": 10      # ticks between re-classifying objects
+        }
+
+    Objects are classified into three tiers:
+        near - synced with physics and scripts updated every tick
+        mid  - physics sync and script fixed_update() every far_update_every ticks,
+               update()/late_update() every far_update_every frames
+               (scripts get the accumulated dt), bodies keep simulating
+        far  - dynamic bodies sleep (no solver cost), scripts throttled like mid
+    Scripts that must run every tick set `always_update = True`. Objects without
+    colliders are never synced with physics at all.
+    """
+    NEAR, MID, FAR = 0, 1, 2
+
+    def __init__(self, settings, physics):
+        settings = settings or {}
+        self.enabled = bool(settings.get("enabled", False))
+        self.near_distance = float(settings.get("near_distance", 1200.0))
+        self.sleep_distance = float(settings.get("sleep_distance", 2500.0))
+        self.far_update_every = max(1, int(settings.get("far_update_every", 4)))
+        self.refresh_every = max(1, int(settings.get("refresh_every", 10)))
+
+        self.physics = physics
+        self.tiers = {} # object.id -> tier
+        self.near_objects = [] # synced every tick
+        self.all_objects = [] # near + mid, synced on throttled ticks
+        self._last_synced = [] # objects synced back last tick, checked for teleports this tick
+        self._refreshed = False
+        self.throttled_ids = set() # objects whose scripts run every far_update_every ticks
+        self.dirty = True
+
+        self.can_sleep = self.enabled and physics.threads <= 1
+        if self.enabled and not self.can_sleep:
+            # Chipmunk's threaded solver does not support sleeping bodies
+            log.info("Threaded physics, distant bodies will be throttled but not put to sleep.")
+        if self.can_sleep:
+            physics.space.sleep_time_threshold = float(settings.get("sleep_time_threshold", 1.0))
+
+    def mark_dirty(self):
+        """Objects were added or removed; re-classify on the next tick."""
+        self.dirty = True
+
+    def refresh(self, tick, objects, camera_pos):
+        """Re-classifies objects by distance to the camera every refresh_every ticks (or when dirty)."""
+        if not self.dirty and tick % self.refresh_every:
+            return
+        self.dirty = False
+
+        cx, cy = camera_pos
+        near_sq = self.near_distance * self.near_distance
+        sleep_sq = self.sleep_distance * self.sleep_distance
+        bodies = self.physics.bodies
+        tiers = {}
+        near = []
+        active = []
+        throttled = set()
+
+        merged = self.physics.merged_objects
+
+        for obj in objects:
+            pos = obj.world_position
+            dx = pos[0] - cx
+            dy = pos[1] - cy
+            d_sq = dx * dx + dy * dy
+
+            if d_sq <= near_sq:
+                tier = self.NEAR
+            elif d_sq <= sleep_sq:
+                tier = self.MID
+            else:
+                tier = self.FAR
+            tiers[obj.id] = tier
+
+            if tier != self.NEAR:
+                throttled.add(obj.id)
+
+            comps = obj.components
+            if obj.id in merged or not (COMPONENT_RIGIDBODY in comps or COMPONENT_BOX_COLLIDER in comps
+                                        or "CircleCollider" in comps):
+                continue # No body of its own to sync
+
+            body = bodies.get(obj.id)
+            if body is None:
+                # Body is created on the next sync, whatever the distance
+                near.append(obj)
+                active.append(obj)
+                continue
+            if body.body_type != pymunk.Body.DYNAMIC:
+                # Static/kinematic: only synced to catch script teleports
+                if tier == self.NEAR:
+                    near.append(obj)
+                if tier != self.FAR:
+                    active.append(obj)
+                continue
+
+            if tier == self.FAR and self.can_sleep:
+                if not body.is_sleeping:
+                    body.sleep()
+                continue
+
+            if body.is_sleeping and self.tiers.get(obj.id) == self.FAR:
+                body.activate()
+            if tier == self.NEAR:
+                near.append(obj)
+            active.append(obj)
+
+        self.tiers = tiers
+        self.near_objects = near
+        self.all_objects = active
+        self.throttled_ids = throttled
+        self._refreshed = True
+
+    def is_full_tick(self, tick):
+        """Ticks on which mid/far objects are synced and their scripts updated."""
+        return tick % self.far_update_every == 0
+
+    def physics_objects(self, tick):
+        """
+        (sync_to, sync_from) object lists for this tick. Objects are checked for
+        script teleports on the tick after they were synced back, while their
+        Transform still matches the body.
+        """
+        sync_from = self.all_objects if self.is_full_tick(tick) else self.near_objects
+        if self._refreshed:
+            # Lists were rebuilt: drop destroyed objects, add the ones that still need a body
+            self._refreshed = False
+            last_ids = set(obj.id for obj in self._last_synced)
+            bodies = self.physics.bodies
+            sync_to = [obj for obj in self.all_objects if obj.id in last_ids or obj.id not in bodies]
+        else:
+            sync_to = self._last_synced
+        self._last_synced = sync_from
+        return sync_to, sync_from
+
+    def should_update(self, script, count):
+        """
+        Whether a script runs this tick (fixed_update) or frame (update/late_update).
+        Throttled fixed_update() calls all land on the full ticks, right after their
+        objects were synced back from physics. The scheduler hands skipped scripts
+        the accumulated time on their next call.
+        """
+        if script.always_update or script.game_object.id not in self.throttled_ids:
+            return True
+        return count % self.far_update_every == 0
@@ -0,0 +1,128 @@
+import sys
+import time
+import threading
+import queue
+import atexit
+import logging
+import logging.handlers
+
+# Runtime logging. Engine modules log through get_logger("<module>") with %-style
+# arguments (log.warning("Prefab not found: %s", path)) instead of print():
+#   - records are put on a queue and written by a background thread, so a slow
+#     console or file never blocks the game loop
+#   - each distinct message (after formatting, so a crash in another script or a
+#     missing file at another path has its own budget) may be logged `burst` times
+#     per `interval` seconds; the rest are dropped and counted, and the next one
+#     that gets through says how many were suppressed (a script crashing every
+#     frame logs a few lines, not thousands)
+#   - the default level is WARNING, so per-object chatter (attached scripts,
+#     broadphase choices, destroy batches) stays quiet unless asked for
+#
+#   python main.py --run-scene X --log-level DEBUG --log-file runtime.log
+#
+# Reports the user asked for (profiler CSV, script costs, benchmark tables) are
+# still printed directly.
+
+ROOT_LOGGER = "aspis"
+DEFAULT_LEVEL = logging.WARNING
+FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+CONSOLE_FORMAT = "%(levelname)s %(name)s: %(message)s"
+
+_listener = None
+
+
+def get_logger(name):
+    """Logger below the runtime's root logger ("physics" -> "aspis.physics")."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets `burst` records per distinct message through every `interval` seconds.
+    Called from every thread that logs (main, simulation, script workers, the
+    watchdog), so the windows are only read and changed under a lock.
+    """
+    MAX_WINDOWS = 1024 # Expired windows are dropped beyond this many messages
+
+    def __init__(self, burst=5, interval=10.0):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self._windows = {} # (logger name, formatted message) -> [window start, records let through, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        message = record.getMessage() # Formatted outside the lock
+        key = (record.name, message)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window is not None else 0
+                if window is None and len(self._windows) >= self.MAX_WINDOWS:
+                    self._prune(now)
+                self._windows[key] = [now, 1, 0]
+            elif window[1] < self.burst:
+                window[1] += 1
+                return True
+            else:
+                window[2] += 1
+                return False
+        if suppressed:
+            record.msg = f"{message} (suppressed {suppressed} identical messages)"
+            record.args = None
+        return True
+
+    def _prune(self, now):
+        """Forgets expired windows; their suppressed counts are lost. Called with the lock held."""
+        self._windows = {k: w for k, w in self._windows.items() if now - w[0] < self.interval}
+
+
+def configure(level=None, path=None, burst=5, interval=10.0):
+    """
+    Sets up the runtime's root logger: rate limit, queue and a background writer
+    to stderr and, with a path, to a file. Calling it again replaces the setup.
+    """
+    global _listener
+    shutdown()
+
+    root = logging.getLogger(ROOT_LOGGER)
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = DEFAULT_LEVEL
+    root.setLevel(level if level is not None else DEFAULT_LEVEL)
+    root.propagate = False
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for old in list(root.filters):
+        root.removeFilter(old)
+
+    console = logging.StreamHandler(sys.stderr)
+    console.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+    handlers = [console]
+    if path:
+        file_handler = logging.FileHandler(path, encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter(FORMAT))
+        handlers.append(file_handler)
+
+    records = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(records)
+    queue_handler.addFilter(RateLimitFilter(burst, interval))
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown():
+    """Writes out queued records and stops the background writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown)
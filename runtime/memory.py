@@ -0,0 +1,200 @@
+import gc
+import sys
+import weakref
+import types
+import tracemalloc
+from collections import Counter
+
+# Memory diagnostics for scene transitions. Before a scene is unloaded, weak
+# references to its GameObjects, scripts, physics world and pymunk bodies are kept;
+# after each following load a full collection runs, and anything from an unloaded
+# scene that is still alive two loads later is reported as a leak (one load of grace:
+# a watchdog stack sample, for one, can keep an interrupted script alive until the next). Each load also records live
+# object counts per type (gc-tracked objects only), the size of sys.modules and,
+# with tracemalloc on, a snapshot, so growth between loads can be traced to types
+# and allocation sites.
+#
+# Scene settings (all optional, also enabled by --memory-report and the benchmark's --bench-memory):
+#   "memory": {
+#       "enabled": true,
+#       "tracemalloc": true,   # allocation sites (slows everything down noticeably)
+#       "frames": 1,           # stack frames kept per allocation
+#       "top": 10              # rows per report section
+#   }
+
+
+def _type_name(obj):
+    cls = type(obj)
+    module = cls.__module__
+    return cls.__qualname__ if module == "builtins" else f"{module}.{cls.__qualname__}"
+
+
+class SceneLoad:
+    __slots__ = ("label", "counts", "modules", "snapshot", "traced_kb")
+
+    def __init__(self, label, counts, modules, snapshot, traced_kb):
+        self.label = label
+        self.counts = counts # type name -> live objects
+        self.modules = modules # len(sys.modules)
+        self.snapshot = snapshot # tracemalloc.Snapshot or None
+        self.traced_kb = traced_kb
+
+
+class MemoryDiagnostics:
+    def __init__(self):
+        self.enabled = False
+        self.use_tracemalloc = True
+        self.frames = 1
+        self.top = 10
+        self.loads = [] # Baseline candidates and the latest SceneLoad, oldest first
+        self.load_count = 0
+        self.leaks = Counter() # type name -> objects of unloaded scenes that survived two loads
+
+        self._retired = [] # (weak reference, load_count when retired) for objects of unloaded scenes
+
+    def configure(self, settings, force=False):
+        settings = settings or {}
+        self.enabled = force or bool(settings.get("enabled", False))
+        self.use_tracemalloc = bool(settings.get("tracemalloc", self.use_tracemalloc))
+        self.frames = max(1, int(settings.get("frames", self.frames)))
+        self.top = max(1, int(settings.get("top", self.top)))
+        if self.enabled and self.use_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+    def retire_scene(self, runtime):
+        """Called before the runtime drops a scene: remembers what must be freed."""
+        if not self.enabled:
+            return
+        owned = list(runtime.objects) + list(runtime.active_scripts)
+        owned.append(runtime.physics)
+        owned.extend(runtime.physics.bodies.values())
+        for obj in owned:
+            try:
+                self._retired.append((weakref.ref(obj), self.load_count))
+            except TypeError:
+                pass # Not weak-referenceable
+
+    def scene_loaded(self, label):
+        """Called after a scene loaded and started: records counts and checks for leaks."""
+        if not self.enabled:
+            return
+        gc.collect()
+        own = self._own_ids()
+        counts = {} # Plain loop, so the allocations are filtered out of the snapshot with this file
+        for obj in gc.get_objects():
+            if id(obj) not in own:
+                name = _type_name(obj)
+                counts[name] = counts.get(name, 0) + 1
+        snapshot = None
+        traced_kb = 0.0
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ))
+            # Not get_traced_memory(): that would include the snapshots kept in self.loads
+            traced_kb = sum(stat.size for stat in snapshot.statistics("filename")) / 1024.0
+        self.loads.append(SceneLoad(label, counts, len(sys.modules), snapshot, traced_kb))
+        self.load_count += 1
+        if len(self.loads) > 3:
+            # Only the baseline (see _baseline) and the latest are compared
+            del self.loads[2:-1]
+
+        self._retired = [(ref, loaded) for ref, loaded in self._retired if ref() is not None]
+        self.leaks = Counter(_type_name(ref()) for ref, loaded in self._retired
+                             if self.load_count - loaded >= 2 and ref() is not None)
+
+        line = (f"MEMORY: Loaded '{label}' (load {self.load_count}): "
+                f"{sum(counts.values())} objects, {len(sys.modules)} modules")
+        if snapshot is not None:
+            line += f", {traced_kb:.0f} KB traced"
+        if self.leaks:
+            line += f", {sum(self.leaks.values())} objects of unloaded scenes still alive"
+        print(line)
+
+    def _own_ids(self):
+        """ids of the containers the diagnostics hold themselves (counts, snapshots), left out of the counts."""
+        roots = [self.loads, self._retired, self.leaks]
+        seen = {id(r) for r in roots}
+        while roots:
+            for ref in gc.get_referents(roots.pop()):
+                # Stop at classes and modules, they lead into the rest of the program
+                if id(ref) in seen or not gc.is_tracked(ref) or isinstance(ref, (type, types.ModuleType)):
+                    continue
+                seen.add(id(ref))
+                roots.append(ref)
+        return seen
+
+    def _baseline(self):
+        # The first load also pays for imports and caches, so the second one is the baseline when there is one
+        return self.loads[1] if len(self.loads) > 2 else self.loads[0]
+
+    # --- Reports ---
+
+    def growth(self):
+        """[(type name, baseline count, latest count)] of types that grew, largest growth first."""
+        if len(self.loads) < 2:
+            return []
+        base, last = self._baseline().counts, self.loads[-1].counts
+        rows = [(name, base.get(name, 0), count) for name, count in last.items() if count > base.get(name, 0)]
+        rows.sort(key=lambda r: r[2] - r[1], reverse=True)
+        return rows[:self.top]
+
+    def top_sites(self):
+        """tracemalloc StatisticDiff rows between the baseline and the latest load."""
+        if len(self.loads) < 2:
+            return []
+        base, last = self._baseline().snapshot, self.loads[-1].snapshot
+        if base is None or last is None:
+            return []
+        diffs = [d for d in last.compare_to(base, "lineno") if d.size_diff > 0]
+        return diffs[:self.top]
+
+    def leaked(self):
+        return bool(self.leaks)
+
+    def summary(self):
+        """JSON-friendly version of the report, used by the benchmark runner."""
+        if not self.loads:
+            return {}
+        base, last = self._baseline(), self.loads[-1]
+        return {
+            "loads": self.load_count,
+            "baseline": base.label,
+            "objects": [sum(base.counts.values()), sum(last.counts.values())],
+            "modules": [base.modules, last.modules],
+            "traced_kb": [round(base.traced_kb, 1), round(last.traced_kb, 1)],
+            "growth": {name: new - old for name, old, new in self.growth()},
+            "sites": [f"{d.traceback[0].filename}:{d.traceback[0].lineno} +{d.size_diff / 1024.0:.1f} KB ({d.count_diff:+d})"
+                      for d in self.top_sites()],
+            "leaks": dict(self.leaks),
+        }
+
+    def format_report(self):
+        if not self.loads:
+            return "Memory: No scene loads recorded."
+        base, last = self._baseline(), self.loads[-1]
+        lines = [f"Memory: '{base.label}' -> '{last.label}'",
+                 f"  objects {sum(base.counts.values())} -> {sum(last.counts.values())}, "
+                 f"modules {base.modules} -> {last.modules}"]
+        if last.snapshot is not None:
+            lines[-1] += f", traced {base.traced_kb:.0f} -> {last.traced_kb:.0f} KB"
+
+        growth = self.growth()
+        if growth:
+            lines.append(f"  {'Type':<48}{'before':>8}{'after':>8}")
+            for name, old, new in growth:
+                lines.append(f"  {name[-47:]:<48}{old:>8}{new:>8}")
+        sites = self.top_sites()
+        if sites:
+            lines.append("  Allocation growth:")
+            for d in sites:
+                frame = d.traceback[0]
+                lines.append(f"    {frame.filename}:{frame.lineno}  +{d.size_diff / 1024.0:.1f} KB ({d.count_diff:+d} blocks)")
+        if self.leaks:
+            lines.append("  LEAK: objects of unloaded scenes still alive:")
+            for name, count in self.leaks.most_common(self.top):
+                lines.append(f"    {name:<48}{count:>8}")
+        else:
+            lines.append("  No objects of unloaded scenes are alive.")
+        return "\n".join(lines)
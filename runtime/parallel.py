@@ -0,0 +1,341 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from runtime.log import get_logger
+
+log = get_logger("parallel")
+
+# Scripts that set `parallel_safe = True` have their update phases run in batches
+# on a thread pool. While a batch runs, anything that changes the world is recorded
+# instead of applied:
+#   - instantiate / destroy / load_scene / play_sound / start_coroutine /
+#     stop_coroutine / stop_all_coroutines / report_metric
+#   - writes through self.transform or self.game_object (the same DeferredTransform):
+#     position / rotation / scale, any other attribute, and component data
+#     (self.game_object.components["RigidBody"]["velocity"] = ..., in-place list
+#     edits included)
+# Once every batch finished, the recorded commands are applied on the main thread,
+# batch by batch and script by script, so the result does not depend on thread timing.
+# Reads during the batch see the world as it was before the phase, except for the
+# script's own pending writes.
+#
+# A parallel_safe script may only change its own object. Other GameObjects (from
+# find_object, raycasts or collisions) are the live objects; writing to them from a
+# batch is a data race. Removing a component inside a batch raises RuntimeError.
+#
+# Scene settings (all optional):
+#   "scripts": {
+#       "worker_threads": 4,       # default: CPU count, at most 8
+#       "parallel_min_batch": 16   # fewer scripts per batch than this run inline
+#   }
+
+_local = threading.local()
+
+def deferred_commands():
+    """Command list of the batch running on this thread, or None outside a parallel batch."""
+    return getattr(_local, "commands", None)
+
+
+def _copy_component(data):
+    # Lists (velocity, size, tint) are copied: scripts change them in place
+    return {k: (list(v) if isinstance(v, list) else v) for k, v in data.items()}
+
+
+class DeferredComponents:
+    """
+    The components of a parallel_safe script's object inside a parallel batch.
+    A component's data is copied on first access. When the batch's commands are
+    applied, only the keys that differ from that first copy are written back, so
+    a script that merely read a component does not undo another script's writes.
+    """
+    __slots__ = ("source", "pending", "base")
+
+    def __init__(self, source):
+        self.source = source
+        self.pending = {}
+        self.base = {} # name -> data as first read, None for components assigned whole
+
+    def __getitem__(self, name):
+        data = self.pending.get(name)
+        if data is None:
+            data = _copy_component(self.source[name])
+            self.pending[name] = data
+            self.base[name] = _copy_component(data)
+        return data
+
+    def __setitem__(self, name, data):
+        self.pending[name] = data
+        self.base[name] = None
+
+    def __delitem__(self, name):
+        raise RuntimeError("parallel_safe scripts cannot remove components during a parallel batch")
+
+    def pop(self, name, *default):
+        raise RuntimeError("parallel_safe scripts cannot remove components during a parallel batch")
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def __contains__(self, name):
+        return name in self.pending or name in self.source
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def keys(self):
+        return list(self.source) + [name for name in self.pending if name not in self.source]
+
+    def items(self):
+        return [(name, self[name]) for name in self.keys()]
+
+    def values(self):
+        return [self[name] for name in self.keys()]
+
+    def apply(self, components):
+        for name, data in self.pending.items():
+            base = self.base[name]
+            target = components.get(name)
+            if base is None or target is None:
+                components[name] = data
+                continue
+            for key, value in data.items():
+                if key not in base or base[key] != value:
+                    target[key] = value
+
+
+class DeferredTransform:
+    """
+    Stands in for script.transform and script.game_object on parallel_safe
+    scripts. Outside a parallel batch it reads and writes the GameObject directly.
+    Inside one, position, rotation and scale writes (including in-place edits of
+    the lists), other attribute writes and component data (see DeferredComponents)
+    are kept here and copied to the GameObject when the batch's commands are
+    applied. Reads are forwarded to the GameObject. Several parallel_safe scripts
+    on one object each have their own proxy; a list or component that was only
+    read is never written back, so it cannot undo another script's write.
+    """
+    __slots__ = ("game_object", "_position", "_position_base", "_rotation", "_scale", "_scale_base",
+                 "_components", "_attributes", "_queued")
+
+    def __init__(self, game_object):
+        object.__setattr__(self, "game_object", game_object)
+        object.__setattr__(self, "_position", None)
+        object.__setattr__(self, "_position_base", None)
+        object.__setattr__(self, "_rotation", None)
+        object.__setattr__(self, "_scale", None)
+        object.__setattr__(self, "_scale_base", None)
+        object.__setattr__(self, "_components", None)
+        object.__setattr__(self, "_attributes", None)
+        object.__setattr__(self, "_queued", False)
+
+    def _queue(self, commands):
+        if not self._queued:
+            object.__setattr__(self, "_queued", True)
+            commands.append(self._flush)
+
+    @staticmethod
+    def _write_list(target, value, base):
+        if base is None:
+            target[:] = value # Assigned through the setter
+            return
+        for i, (v, b) in enumerate(zip(value, base)):
+            if v != b: # Only elements edited in place
+                target[i] = v
+
+    def _flush(self):
+        obj = self.game_object
+        if self._position is not None:
+            self._write_list(obj.position, self._position, self._position_base)
+        if self._rotation is not None:
+            obj.rotation = self._rotation
+        if self._scale is not None:
+            self._write_list(obj.scale, self._scale, self._scale_base)
+        if self._attributes is not None:
+            for name, value in self._attributes.items():
+                setattr(obj, name, value)
+        if self._components is not None:
+            self._components.apply(obj.components)
+        object.__setattr__(self, "_position", None)
+        object.__setattr__(self, "_position_base", None)
+        object.__setattr__(self, "_rotation", None)
+        object.__setattr__(self, "_scale", None)
+        object.__setattr__(self, "_scale_base", None)
+        object.__setattr__(self, "_components", None)
+        object.__setattr__(self, "_attributes", None)
+        object.__setattr__(self, "_queued", False)
+
+    def _pending_list(self, slot, commands):
+        # Lists are copied on first access so in-place edits stay private to the batch.
+        # The flush is queued to find those edits; it writes nothing if there are none.
+        value = getattr(self, slot)
+        if value is None:
+            value = list(getattr(self.game_object, slot[1:]))
+            object.__setattr__(self, slot, value)
+            object.__setattr__(self, slot + "_base", list(value))
+            self._queue(commands)
+        return value
+
+    def _set_list(self, slot, value, commands):
+        object.__setattr__(self, slot, list(value))
+        object.__setattr__(self, slot + "_base", None)
+        self._queue(commands)
+
+    @property
+    def position(self):
+        commands = deferred_commands()
+        if commands is None:
+            return self.game_object.position
+        return self._pending_list("_position", commands)
+
+    @position.setter
+    def position(self, value):
+        commands = deferred_commands()
+        if commands is None:
+            self.game_object.position = value
+            return
+        self._set_list("_position", value, commands)
+
+    @property
+    def rotation(self):
+        if self._rotation is not None and deferred_commands() is not None:
+            return self._rotation
+        return self.game_object.rotation
+
+    @rotation.setter
+    def rotation(self, value):
+        commands = deferred_commands()
+        if commands is None:
+            self.game_object.rotation = value
+            return
+        object.__setattr__(self, "_rotation", value)
+        self._queue(commands)
+
+    @property
+    def scale(self):
+        commands = deferred_commands()
+        if commands is None:
+            return self.game_object.scale
+        return self._pending_list("_scale", commands)
+
+    @scale.setter
+    def scale(self, value):
+        commands = deferred_commands()
+        if commands is None:
+            self.game_object.scale = value
+            return
+        self._set_list("_scale", value, commands)
+
+    @property
+    def components(self):
+        commands = deferred_commands()
+        if commands is None:
+            return self.game_object.components
+        if self._components is None:
+            object.__setattr__(self, "_components", DeferredComponents(self.game_object.components))
+            self._queue(commands)
+        return self._components
+
+    def __getattr__(self, name):
+        attributes = self._attributes
+        if attributes is not None and name in attributes and deferred_commands() is not None:
+            return attributes[name]
+        return getattr(self.game_object, name)
+
+    def __setattr__(self, name, value):
+        if name in _PROPERTIES:
+            object.__setattr__(self, name, value) # Property setter, deferred inside a batch
+            return
+        commands = deferred_commands()
+        if commands is None:
+            setattr(self.game_object, name, value)
+            return
+        if self._attributes is None:
+            object.__setattr__(self, "_attributes", {})
+        self._attributes[name] = value
+        self._queue(commands)
+
+    def __eq__(self, other):
+        return self.game_object is getattr(other, "game_object", other)
+
+    def __hash__(self):
+        return hash(self.game_object)
+
+
+_PROPERTIES = ("position", "rotation", "scale")
+
+
+class ParallelScriptRunner:
+    """Runs parallel_safe scripts in batches on a thread pool, then applies their commands in order."""
+
+    def __init__(self):
+        self.workers = 1
+        self.min_batch = 16
+        self._executor = None
+        self.configure({})
+
+    def configure(self, settings):
+        settings = settings or {}
+        default_workers = min(8, os.cpu_count() or 1)
+        workers = max(1, int(settings.get("worker_threads", default_workers)))
+        self.min_batch = max(1, int(settings.get("parallel_min_batch", 16)))
+        if workers != self.workers and self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.workers = workers
+
+    def _batches(self, scripts):
+        count = len(scripts)
+        batch_count = min(self.workers, count // self.min_batch)
+        if batch_count <= 1:
+            return [scripts]
+        size = -(-count // batch_count) # ceil
+        return [scripts[i:i + size] for i in range(0, count, size)]
+
+    @staticmethod
+    def _run_batch(batch, call):
+        commands = []
+        errors = []
+        _local.commands = commands
+        try:
+            for script in batch:
+                try:
+                    call(script)
+                except Exception as e:
+                    errors.append((script, e))
+        finally:
+            _local.commands = None
+        return commands, errors
+
+    def run(self, scripts, call):
+        """
+        Calls call(item) for every item (a script, or whatever the caller batches),
+        batched across the pool. Applies the recorded commands and returns
+        [(item, exception)] in item order.
+        """
+        batches = self._batches(scripts)
+        if len(batches) == 1:
+            results = [self._run_batch(batches[0], call)]
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="script-worker")
+            futures = [self._executor.submit(self._run_batch, batch, call) for batch in batches]
+            results = [f.result() for f in futures]
+
+        errors = []
+        for commands, batch_errors in results:
+            for command in commands:
+                try:
+                    command()
+                except Exception as e:
+                    log.error("Error applying deferred script command: %s", e)
+            errors.extend(batch_errors)
+        return errors
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
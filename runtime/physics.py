@@ -1,61 +1,548 @@
 
 import pymunk
 from shared.component_defs import COMPONENT_RIGIDBODY, COMPONENT_BOX_COLLIDER
+from shared.physics_layers import compile_layer_masks, DEFAULT_LAYER
+from runtime.api import Collision, RaycastHit
 import math
+import sys
+
+from runtime.log import get_logger
+
+log = get_logger("physics")
+
+# Collision event kinds produced by PhysicsSystem.update()
+EVENT_COLLISION_ENTER = "on_collision_enter"
+EVENT_COLLISION_STAY = "on_collision_stay"
+EVENT_COLLISION_EXIT = "on_collision_exit"
+EVENT_TRIGGER_ENTER = "on_trigger_enter"
+EVENT_TRIGGER_EXIT = "on_trigger_exit"
+
+class ContactPair:
+    """An active contact between two shapes, with one Collision view per side."""
+    __slots__ = ("view_a", "view_b", "is_trigger", "entered_step")
+
+    def __init__(self, view_a, view_b, is_trigger, entered_step):
+        self.view_a = view_a
+        self.view_b = view_b
+        self.is_trigger = is_trigger
+        self.entered_step = entered_step # No stay event on the step we entered
+
+def merge_rects(rects, eps=0.01):
+    """
+    Greedy rectangle merging for axis-aligned boxes.
+    rects: list of [l, t, r, b, members]. Boxes sharing a full edge (same span on
+    the other axis, touching or overlapping) are merged until nothing changes.
+    Returns the merged list; members lists are concatenated.
+    """
+    def merge_axis(rects, axis):
+        # axis 0: merge along x (rows with the same t/b); axis 1: along y (columns with the same l/r)
+        lo, hi = (0, 2) if axis == 0 else (1, 3)
+        span_lo, span_hi = (1, 3) if axis == 0 else (0, 2)
+        rects.sort(key=lambda r: (round(r[span_lo] / eps), round(r[span_hi] / eps), r[lo]))
+        merged = []
+        for r in rects:
+            if merged:
+                last = merged[-1]
+                if (abs(last[span_lo] - r[span_lo]) <= eps and abs(last[span_hi] - r[span_hi]) <= eps
+                        and r[lo] <= last[hi] + eps):
+                    last[hi] = max(last[hi], r[hi])
+                    last[4].extend(r[4])
+                    continue
+            merged.append(r)
+        return merged
+
+    count = -1
+    while count != len(rects):
+        count = len(rects)
+        rects = merge_axis(rects, 0)
+        rects = merge_axis(rects, 1)
+    return rects
 
 class PhysicsSystem:
     # Pygame uses Y-down, Pymunk usually Y-up, but we can just use gravity=(0, 980)
     GRAVITY = (0.0, 980.0) 
 
-    def __init__(self):
-        self.space = pymunk.Space()
+    # Broadphase modes (scene settings -> "physics" -> "broadphase")
+    BROADPHASE_BBTREE = "bbtree"
+    BROADPHASE_SPATIAL_HASH = "spatial_hash"
+    BROADPHASE_AUTO = "auto"
+
+    # "auto" only switches to a spatial hash when the scene has enough bodies
+    # of roughly the same size for the grid to pay off.
+    AUTO_MIN_COLLIDERS = 50
+    AUTO_MAX_SIZE_SPREAD = 4.0 # largest / smallest dynamic collider extent
+
+    def __init__(self, threads=1):
+        self.threads = 1
+        if threads and threads > 1:
+            if sys.platform == "win32":
+                # pymunk silently ignores threaded=True on Windows
+                log.warning("Threaded physics is not supported on Windows, using 1 thread.")
+                self.space = pymunk.Space()
+            else:
+                self.space = pymunk.Space(threaded=True)
+                self.space.threads = int(threads)
+                self.threads = self.space.threads
+                if self.threads < threads:
+                    # Chipmunk's threaded solver caps the thread count (currently 2)
+                    log.info("Requested %d threads, solver uses %d.", threads, self.threads)
+        else:
+            self.space = pymunk.Space()
         self.space.gravity = self.GRAVITY
         self.bodies = {} # object.id -> pymunk.Body
         
-        # Collision Handler
-        # Use add_collision_handler(0, 0) for default types (we set everything to type 0)
         self.space.iterations = 60 # High stability for stacking
+
+        # Collision Pipeline
+        self.active_pairs = {} # (shape, shape) -> ContactPair, ordered by id()
+        self.events = [] # (event kind, Collision) buffer, reused between steps
+        self.listeners = set() # object ids with a script that handles collision/trigger events
+        self.stay_listeners = set() # object ids that handle on_collision_stay
+        self.step_count = 0
+        self.profiler = None # FrameProfiler for sub-phase timings, set by the runtime
+
+        # Continuous collision (RigidBody "continuous" / "bullet")
+        self.continuous_bodies = {} # object.id -> pymunk.Body
+        self._ccd_starts = [] # (body, position before step), reused between steps
+
+        # Merged static geometry (see merge_static_colliders)
+        self.static_body = None # Shared static body for merged boxes
+        self.merged_objects = {} # object.id -> merged pymunk.Poly containing its box
+
         try:
-            # Try newer API first
-            if hasattr(self.space, 'add_default_collision_handler'):
-                h = self.space.add_default_collision_handler()
+            if hasattr(self.space, 'on_collision'):
+                # pymunk >= 7
+                self.space.on_collision(begin=self._handle_begin, separate=self._handle_separate)
             else:
-                h = self.space.add_collision_handler(0, 0)
-            h.begin = self._handle_collision
+                if hasattr(self.space, 'add_default_collision_handler'):
+                    h = self.space.add_default_collision_handler()
+                else:
+                    h = self.space.add_collision_handler(0, 0)
+                h.begin = self._handle_begin
+                h.separate = self._handle_separate
         except Exception as e:
-            print(f"Warning: Could not set up collision handler: {e}")
+            log.warning("Could not set up collision handler: %s", e)
         
-        self.current_collisions = [] # Stores (obj_a, obj_b) for current step
+        self.broadphase = self.BROADPHASE_BBTREE
+        self.configure_layers({})
+
+    def configure_layers(self, scene_settings):
+        """Compiles the scene's named layers and collision matrix into one ShapeFilter per layer."""
+        self.layer_filters = {
+            name: pymunk.ShapeFilter(categories=cat, mask=mask)
+            for name, (cat, mask) in compile_layer_masks(scene_settings).items()
+        }
+
+    def layer_mask(self, *layer_names):
+        """Category bits of the given layers, for use as a query mask."""
+        mask = 0
+        for name in layer_names:
+            f = self.layer_filters.get(name)
+            if f is None:
+                log.warning("Unknown physics layer '%s'", name)
+                continue
+            mask |= f.categories
+        return mask
+
+    def _shape_filter(self, col_data):
+        """Filter for a collider: its named layer, or the raw bitmasks if only those are set."""
+        layer = col_data.get("layer")
+        if layer is None and ("category_bitmask" in col_data or "collision_mask" in col_data):
+            return pymunk.ShapeFilter(
+                categories=col_data.get("category_bitmask", 1),
+                mask=col_data.get("collision_mask", 0xFFFFFFFF))
+        f = self.layer_filters.get(layer or DEFAULT_LAYER)
+        if f is None:
+            log.warning("Unknown physics layer '%s', using %s", layer, DEFAULT_LAYER)
+            f = self.layer_filters[DEFAULT_LAYER]
+        return f
+
+    def configure_broadphase(self, settings, objects):
+        """
+        Chooses the broadphase from the scene's physics settings.
+        Keys (all optional):
+            broadphase: "bbtree" (default), "spatial_hash" or "auto"
+            spatial_hash_dim: grid cell size in pixels
+            spatial_hash_count: number of hash buckets
+            expected_bodies: body count to size the hash for (spawned objects)
+        Missing cell size / bucket count are derived from the colliders present at load time.
+        """
+        settings = settings or {}
+        mode = str(settings.get("broadphase", self.BROADPHASE_BBTREE)).lower()
+        if mode == self.BROADPHASE_BBTREE:
+            return
 
-    def _handle_collision(self, arbiter, space, data):
-        # Determine objects involved
+        extents = []
+        dynamic_extents = []
+        for obj in objects:
+            extent = self._collider_extent(obj)
+            if extent is None:
+                continue
+            extents.append(extent)
+            rb_data = obj.components.get(COMPONENT_RIGIDBODY)
+            if rb_data and rb_data.get("body_type", "dynamic").lower() == "dynamic":
+                dynamic_extents.append(extent)
+
+        # Static level geometry (floors, walls) is usually much larger than the
+        # moving bodies, so size the grid for the dynamic ones when we have any.
+        sample = sorted(dynamic_extents or extents)
+
+        if mode == self.BROADPHASE_AUTO:
+            expected = max(len(extents), int(settings.get("expected_bodies", 0)))
+            if expected < self.AUTO_MIN_COLLIDERS or not sample:
+                return
+            if sample[-1] > sample[0] * self.AUTO_MAX_SIZE_SPREAD:
+                return
+        elif mode != self.BROADPHASE_SPATIAL_HASH:
+            log.warning("Unknown broadphase '%s', keeping bounding box tree.", mode)
+            return
+
+        dim = settings.get("spatial_hash_dim")
+        if not dim:
+            # Median extent: a cell roughly the size of a typical body
+            dim = sample[len(sample) // 2] if sample else 50.0
+
+        count = settings.get("spatial_hash_count")
+        if not count:
+            # Chipmunk recommends ~10x the number of shapes
+            expected = max(len(extents), int(settings.get("expected_bodies", 0)))
+            count = max(1000, expected * 10)
+
+        self.space.use_spatial_hash(float(dim), int(count))
+        self.broadphase = self.BROADPHASE_SPATIAL_HASH
+        log.info("Using spatial hash broadphase (cell=%.1f, buckets=%d)", float(dim), int(count))
+
+    @staticmethod
+    def _collider_extent(obj):
+        """Largest scaled collider dimension of an object, or None if it has no collider."""
+        extent = None
+        box_data = obj.components.get(COMPONENT_BOX_COLLIDER)
+        if box_data:
+            size = box_data.get("size", [50, 50])
+            extent = max(size[0] * abs(obj.scale[0]), size[1] * abs(obj.scale[1]))
+        circ_data = obj.components.get("CircleCollider")
+        if circ_data:
+            radius = circ_data.get("radius", 25.0)
+            diameter = 2 * radius * max(abs(obj.scale[0]), abs(obj.scale[1]))
+            extent = diameter if extent is None else max(extent, diameter)
+        return extent
+
+    @staticmethod
+    def _pair_key(shape_a, shape_b):
+        return (shape_a, shape_b) if id(shape_a) < id(shape_b) else (shape_b, shape_a)
+
+    def _handle_begin(self, arbiter, space, data):
         shape_a, shape_b = arbiter.shapes
-        body_a, body_b = shape_a.body, shape_b.body
-        
-        obj_a = getattr(body_a, 'data', None)
-        obj_b = getattr(body_b, 'data', None)
+        obj_a = getattr(shape_a.body, 'data', None)
+        obj_b = getattr(shape_b.body, 'data', None)
+        if obj_a is None or obj_b is None:
+            # Merged static geometry: find the member box at the contact
+            points = arbiter.contact_point_set.points
+            point = points[0].point_a if points else None
+            obj_a = obj_a or self._shape_object(shape_a, point)
+            obj_b = obj_b or self._shape_object(shape_b, point)
         
         if obj_a and obj_b:
-            self.current_collisions.append((obj_a, obj_b))
-            self.current_collisions.append((obj_b, obj_a))
+            key = self._pair_key(shape_a, shape_b)
+            if key not in self.active_pairs:
+                is_trigger = shape_a.sensor or shape_b.sensor
+                pair = ContactPair(
+                    Collision(obj_a, obj_b, shape_a, shape_b, is_trigger),
+                    Collision(obj_b, obj_a, shape_b, shape_a, is_trigger),
+                    is_trigger, self.step_count)
+                self.active_pairs[key] = pair
+                self._emit(pair, EVENT_TRIGGER_ENTER if is_trigger else EVENT_COLLISION_ENTER)
             
         return True # Process collision normally
 
-    def update(self, dt, objects):
-        # 0. Clear previous collisions
-        self.current_collisions.clear()
+    def _handle_separate(self, arbiter, space, data):
+        shape_a, shape_b = arbiter.shapes
+        pair = self.active_pairs.pop(self._pair_key(shape_a, shape_b), None)
+        if pair:
+            self._emit(pair, EVENT_TRIGGER_EXIT if pair.is_trigger else EVENT_COLLISION_EXIT)
+
+    def _emit(self, pair, kind):
+        # Only objects with a script that cares get events
+        if pair.view_a.game_object.id in self.listeners:
+            self.events.append((kind, pair.view_a))
+        if pair.view_b.game_object.id in self.listeners:
+            self.events.append((kind, pair.view_b))
+
+    def update(self, dt, objects, sync_from=None):
+        """
+        Steps the world and returns the collision event buffer: (event kind, Collision) tuples.
+        The buffer is reused; the caller clears it once the events are dispatched.
+        Events from removing bodies between steps (exit on destroy) are kept until then.
+        objects are synced into physics before the step, sync_from (default: objects)
+        are synced back after it.
+        """
+        profiler = self.profiler
+        if profiler is not None and not profiler.enabled:
+            profiler = None
 
         # 1. Sync GameObjects -> Pymunk
+        if profiler: profiler.start("physics.sync_to")
         self._sync_to_physics(objects)
+        if profiler: profiler.stop("physics.sync_to")
         
         # 2. Step Simulation
-        self.space.step(dt)
+        if profiler: profiler.start("physics.step")
+        self.step_count += 1
+        if self.continuous_bodies:
+            starts = self._ccd_starts
+            starts.clear()
+            for body in self.continuous_bodies.values():
+                starts.append((body, body.position))
+            self.space.step(dt)
+            self._sweep_continuous(starts)
+        else:
+            self.space.step(dt)
+        if profiler: profiler.stop("physics.step")
         
         # 3. Sync Pymunk -> GameObjects
-        self._sync_from_physics(objects)
+        if profiler: profiler.start("physics.sync_from")
+        self._sync_from_physics(objects if sync_from is None else sync_from)
+        if profiler: profiler.stop("physics.sync_from")
         
-        # 4. Return collected collisions
-        return list(self.current_collisions) 
+        # 4. Stay events for pairs that were already touching
+        if self.stay_listeners:
+            stay = self.stay_listeners
+            step = self.step_count
+            for pair in self.active_pairs.values():
+                if pair.is_trigger or pair.entered_step == step:
+                    continue
+                if pair.view_a.game_object.id in stay:
+                    self.events.append((EVENT_COLLISION_STAY, pair.view_a))
+                if pair.view_b.game_object.id in stay:
+                    self.events.append((EVENT_COLLISION_STAY, pair.view_b))
+        
+        return self.events
+
+    # --- Queries ---
+    # Bodies are created on the first step, so queries see nothing before that.
+
+    def _query_filter(self, mask, category):
+        return pymunk.ShapeFilter(categories=category, mask=mask)
+
+    def _hit_from_segment_info(self, info, length):
+        return RaycastHit(
+            self._shape_object(info.shape, info.point),
+            (info.point.x, info.point.y),
+            (info.normal.x, info.normal.y),
+            info.alpha * length)
+
+    def _segment_hits(self, start, end, radius, mask, category, include_triggers):
+        """All segment query results that belong to a GameObject, nearest first."""
+        infos = self.space.segment_query(tuple(start), tuple(end), radius, self._query_filter(mask, category))
+        infos = [i for i in infos
+                 if self._shape_object(i.shape, i.point) is not None
+                 and (include_triggers or not i.shape.sensor)]
+        infos.sort(key=lambda i: i.alpha)
+        return infos
+
+    def raycast(self, start, end, mask=0xFFFFFFFF, category=0xFFFFFFFF, include_triggers=True):
+        return self.shape_cast(0.0, start, end, mask, category, include_triggers)
+
+    def shape_cast(self, radius, start, end, mask=0xFFFFFFFF, category=0xFFFFFFFF, include_triggers=True):
+        length = math.hypot(end[0] - start[0], end[1] - start[1])
+        if include_triggers:
+            # Single nearest-hit query, no list to build
+            info = self.space.segment_query_first(tuple(start), tuple(end), radius, self._query_filter(mask, category))
+            if info is None:
+                return None
+            if self._shape_object(info.shape, info.point) is not None:
+                return self._hit_from_segment_info(info, length)
+        infos = self._segment_hits(start, end, radius, mask, category, include_triggers)
+        return self._hit_from_segment_info(infos[0], length) if infos else None
+
+    def raycast_all(self, start, end, mask=0xFFFFFFFF, category=0xFFFFFFFF, include_triggers=True):
+        length = math.hypot(end[0] - start[0], end[1] - start[1])
+        return [self._hit_from_segment_info(i, length)
+                for i in self._segment_hits(start, end, 0.0, mask, category, include_triggers)]
+
+    def _objects_from_shapes(self, shapes, include_triggers, bounds):
+        """Unique GameObjects owning the given shapes, in query order. bounds = query (l, t, r, b)."""
+        result = []
+        seen = set()
+        for shape in shapes:
+            if not include_triggers and shape.sensor:
+                continue
+            obj = getattr(shape.body, 'data', None)
+            if obj is not None:
+                owners = (obj,)
+            else:
+                # Merged static geometry: every member box inside the query bounds
+                l, t, r, b = bounds
+                owners = [m for (ml, mt, mr, mb), m in getattr(shape, 'custom_members', ())
+                          if ml <= r and l <= mr and mt <= b and t <= mb]
+            for obj in owners:
+                if obj.id not in seen:
+                    seen.add(obj.id)
+                    result.append(obj)
+        return result
+
+    def overlap_circle(self, center, radius, mask=0xFFFFFFFF, category=0xFFFFFFFF, include_triggers=True):
+        infos = self.space.point_query(tuple(center), radius, self._query_filter(mask, category))
+        bounds = (center[0] - radius, center[1] - radius, center[0] + radius, center[1] + radius)
+        return self._objects_from_shapes((i.shape for i in infos), include_triggers, bounds)
+
+    def overlap_box(self, center, size, rotation=0.0, mask=0xFFFFFFFF, category=0xFFFFFFFF, include_triggers=True):
+        body = pymunk.Body(body_type=pymunk.Body.KINEMATIC)
+        body.position = (center[0], center[1])
+        body.angle = math.radians(rotation)
+        box = pymunk.Poly.create_box(body, (size[0], size[1]))
+        box.filter = self._query_filter(mask, category)
+        infos = self.space.shape_query(box)
+        bb = box.cache_bb()
+        return self._objects_from_shapes((i.shape for i in infos), include_triggers, (bb.left, bb.bottom, bb.right, bb.top))
+
+    def remove_body(self, obj_id):
+        """Removes an object's body and shapes from the world (destroy)."""
+        body = self.bodies.pop(obj_id, None)
+        if body is not None:
+            self.space.remove(body, *body.shapes)
+        self.continuous_bodies.pop(obj_id, None)
+
+        shape = self.merged_objects.pop(obj_id, None)
+        if shape is not None:
+            # Re-merge the remaining boxes of that shape
+            self.space.remove(shape)
+            rects = [[rect[0], rect[1], rect[2], rect[3], [(rect, obj)]]
+                     for rect, obj in shape.custom_members if obj.id != obj_id]
+            for l, t, r, b, members in merge_rects(rects):
+                self._add_static_rect((l, t, r, b), members, shape)
+
+    # --- Static Geometry Merging ---
+
+    def merge_static_colliders(self, objects):
+        """
+        Load-time pass that merges static level boxes (floors, walls built from many
+        adjacent BoxColliders) into fewer shapes on one shared static body.
+        Only script-less, non-trigger, unrotated, unparented static boxes are merged, and
+        only with boxes of the same material and layer. Merged objects no longer follow
+        Transform changes made at runtime.
+        """
+        groups = {} # (elasticity, friction, filter) -> [l, t, r, b, members]
+        for obj in objects:
+            comps = obj.components
+            box_data = comps.get(COMPONENT_BOX_COLLIDER)
+            rb_data = comps.get(COMPONENT_RIGIDBODY)
+            if not box_data or "CircleCollider" in comps or "Script" in comps:
+                continue
+            if box_data.get("is_trigger", False) or obj.parent or obj.children:
+                continue
+            if obj.rotation % 360 != 0:
+                continue
+            if rb_data:
+                if rb_data.get("body_type", "dynamic").lower() != "static":
+                    continue
+                elasticity = rb_data.get("restitution", 0.0)
+                friction = rb_data.get("friction", 0.5)
+            else:
+                elasticity, friction = 0.5, 0.5 # Same fallback as _create_body
+            pos = obj.position
+            if math.isnan(pos[0]) or math.isnan(pos[1]):
+                continue
+
+            size = box_data.get("size", [50, 50])
+            offset = box_data.get("offset", [0, 0])
+            w = size[0] * abs(obj.scale[0])
+            h = size[1] * abs(obj.scale[1])
+            cx = pos[0] + offset[0] * obj.scale[0]
+            cy = pos[1] + offset[1] * obj.scale[1]
+            rect = (cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2)
+
+            key = (elasticity, friction, self._shape_filter(box_data))
+            groups.setdefault(key, []).append([rect[0], rect[1], rect[2], rect[3], [(rect, obj)]])
+
+        if not groups:
+            return
+
+        before = sum(len(g) for g in groups.values())
+        after = 0
+        for (elasticity, friction, shape_filter), rects in groups.items():
+            for l, t, r, b, members in merge_rects(rects):
+                template = (elasticity, friction, shape_filter)
+                self._add_static_rect((l, t, r, b), members, template)
+                after += 1
+        log.info("Merged %d static colliders into %d shapes", before, after)
+
+    def _add_static_rect(self, rect, members, template):
+        """Adds one box to the shared static body. template: a shape or (elasticity, friction, filter)."""
+        if self.static_body is None:
+            self.static_body = pymunk.Body(body_type=pymunk.Body.STATIC)
+            self.space.add(self.static_body)
+        if isinstance(template, pymunk.Shape):
+            template = (template.elasticity, template.friction, template.filter)
+        l, t, r, b = rect
+        shape = pymunk.Poly(self.static_body, [(l, t), (r, t), (r, b), (l, b)])
+        shape.elasticity, shape.friction, shape.filter = template
+        shape.custom_members = members # [(rect, GameObject)] covered by this shape
+        self.space.add(shape)
+        for _, obj in members:
+            self.merged_objects[obj.id] = shape
+        return shape
+
+    @staticmethod
+    def _shape_object(shape, point=None):
+        """GameObject owning a shape. For merged static shapes, the member box nearest to point."""
+        obj = getattr(shape.body, 'data', None)
+        if obj is not None:
+            return obj
+        members = getattr(shape, 'custom_members', None)
+        if not members:
+            return None
+        if point is None or len(members) == 1:
+            return members[0][1]
+        px, py = point[0], point[1]
+        def distance_sq(member):
+            l, t, r, b = member[0]
+            dx = max(l - px, 0, px - r)
+            dy = max(t - py, 0, py - b)
+            return dx * dx + dy * dy
+        return min(members, key=distance_sq)[1]
+
+    def _sweep_continuous(self, starts):
+        """
+        Catches tunnelling for continuous bodies: sweeps each body's inner circle from its
+        position before the step to its new one and, if it passed through a solid shape
+        without the solver seeing it, moves it back to the time of impact and bounces it.
+        Obstacles are treated as immovable; only the fast body is corrected.
+        """
+        for body, start in starts:
+            end = body.position
+            radius = body.custom_ccd_radius
+            if (end - start).get_length_sqrd() <= radius * radius:
+                continue # Moved less than its own size, the discrete step cannot have skipped anything
+
+            hit = None
+            for info in self.space.segment_query(start, end, radius, body.custom_ccd_filter):
+                if info.shape.body is body or info.shape.sensor:
+                    continue
+                if hit is None or info.alpha < hit.alpha:
+                    hit = info
+            if hit is None:
+                continue
+
+            normal = hit.normal
+            v_n = body.velocity.dot(normal)
+            if v_n >= 0:
+                continue # Solver already resolved it (moving away from the surface)
+
+            body.position = start + (end - start) * hit.alpha
+            elasticity = body.custom_ccd_elasticity * hit.shape.elasticity
+            body.velocity = body.velocity - normal * ((1.0 + elasticity) * v_n)
+
+            # pymunk never saw this contact, so report it as a contact that began and ended this step
+            obj = body.data
+            other = self._shape_object(hit.shape, hit.point)
+            if other is not None and (obj.id in self.listeners or other.id in self.listeners):
+                pair = ContactPair(
+                    Collision(obj, other, body.custom_ccd_shape, hit.shape),
+                    Collision(other, obj, hit.shape, body.custom_ccd_shape),
+                    False, self.step_count)
+                self._emit(pair, EVENT_COLLISION_ENTER)
+                self._emit(pair, EVENT_COLLISION_EXIT)
 
     def _sync_to_physics(self, objects):
         """
@@ -76,6 +563,8 @@ class PhysicsSystem:
             
             if not rb_data and not box_data and not circ_data:
                 continue
+            if obj.id in self.merged_objects:
+                continue
 
             # Create Body if missing
             if obj.id not in self.bodies:
@@ -202,10 +691,6 @@ class PhysicsSystem:
             is_trigger = box_data.get("is_trigger", False)
             if is_trigger: is_trigger_any = True
             
-            # Filtering
-            cat = box_data.get("category_bitmask", 1)
-            mask = box_data.get("collision_mask", 0xFFFFFFFF)
-            
             # Apply Scale to Collider Size
             # Absolute processing for negative scales? Pymunk polys must be convex/ordered.
             # We usually use abs() for size.
@@ -226,7 +711,7 @@ class PhysicsSystem:
             shape.sensor = is_trigger
             shape.elasticity = restitution
             shape.friction = friction
-            shape.filter = pymunk.ShapeFilter(categories=cat, mask=mask)
+            shape.filter = self._shape_filter(box_data)
             shapes.append(shape)
 
         # 2. Circle Collider
@@ -237,10 +722,6 @@ class PhysicsSystem:
             is_trigger = circ_data.get("is_trigger", False)
             if is_trigger: is_trigger_any = True
             
-            # Filtering
-            cat = circ_data.get("category_bitmask", 1)
-            mask = circ_data.get("collision_mask", 0xFFFFFFFF)
-            
             # Apply Scale (Max Axis Uniform)
             max_scale = max(abs(obj.scale[0]), abs(obj.scale[1]))
             final_radius = radius * max_scale
@@ -252,7 +733,7 @@ class PhysicsSystem:
             shape.sensor = is_trigger
             shape.elasticity = restitution
             shape.friction = friction
-            shape.filter = pymunk.ShapeFilter(categories=cat, mask=mask)
+            shape.filter = self._shape_filter(circ_data)
             shapes.append(shape)
             
         # Add to Space
@@ -278,6 +759,24 @@ class PhysicsSystem:
                  
         self.bodies[obj.id] = body 
 
+        # Continuous collision: sweep the largest circle that fits inside the colliders
+        if rb_data and body_type == pymunk.Body.DYNAMIC and shapes and \
+                rb_data.get("continuous", rb_data.get("bullet", False)):
+            radii = []
+            for s in shapes:
+                if isinstance(s, pymunk.Circle):
+                    radii.append(s.radius)
+                else:
+                    verts = s.get_vertices()
+                    w = max(v.x for v in verts) - min(v.x for v in verts)
+                    h = max(v.y for v in verts) - min(v.y for v in verts)
+                    radii.append(min(w, h) / 2)
+            body.custom_ccd_radius = max(1.0, max(radii))
+            body.custom_ccd_shape = shapes[0]
+            body.custom_ccd_filter = shapes[0].filter
+            body.custom_ccd_elasticity = restitution
+            self.continuous_bodies[obj.id] = body
+
     def _sync_from_physics(self, objects):
         """
         Updates GameObject position/rotation from Pymunk simulation.
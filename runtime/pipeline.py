@@ -0,0 +1,187 @@
+import threading
+
+import pygame
+
+from runtime import log as runtime_log
+
+log = runtime_log.get_logger("pipeline")
+
+# Pipelined mode (main.py --run-scene X --pipelined): the simulation runs on its own
+# thread and drawing no longer takes time from it.
+#   - simulation thread: fixed steps (physics, collisions, fixed_update), update,
+#     late_update, coroutines and scene changes, paced to 60 frames per second like
+#     the sequential loop. At the end of every frame it builds a RenderSnapshot of
+#     what draw() needs and publishes it.
+#   - main thread: pygame events, the key state (Input), drawing the latest published
+#     snapshot and flipping the display. It never reads the live GameObjects.
+# Snapshots are double buffered: the simulation builds the back one privately and
+# publishing swaps it to the front under a lock, so the main thread always draws a
+# complete frame while the next one is being simulated. Physics (pymunk) and most
+# pygame drawing calls release the GIL, so the two threads overlap in practice.
+#
+# A snapshot copies, per drawn object: world position, rotation and scale, and the
+# Background, SpriteRenderer (visibility, tint), TextRenderer (text, size, color) and
+# Camera data, plus the scene's background color and sprite cache. With the F3
+# overlay open it also carries the simulation's profiler and script cost lines, so
+# the main thread never reads the simulation's profiler or ScriptCostTracker; it
+# times drawing with a profiler of its own (GameRuntime.render_profiler).
+#
+# Rules for scripts (they all run on the simulation thread):
+#   - every Script API (instantiate, destroy, load_scene, find_object, physics
+#     queries, coroutines, play_sound, report_metric) is safe, as before
+#   - Input.get_key reads the key state the main thread published last; a key
+#     pressed and released between two simulation frames is not seen
+#   - changes to transforms and components show up when the frame is published,
+#     never half way through a frame
+#   - pygame display, event and window calls (pygame.display.*, pygame.event.get,
+#     drawing on the screen surface) belong to the main thread; scripts must not
+#     make them
+# Code outside scripts (debug keys, tools) must not touch runtime.objects from the
+# main thread either: it queues a call with pipeline.post(fn), which runs on the
+# simulation thread at the start of its next frame (F4, F6, F7 and F8 do this).
+#
+# Scene settings (optional; --pipelined enables it for any scene):
+#   "pipeline": {"enabled": false}
+
+RENDER_COMPONENTS = ("Background", "SpriteRenderer", "TextRenderer", "Camera")
+SIM_FPS = 60
+
+
+class RenderItem:
+    """What draw() reads from a GameObject, copied at publish time."""
+    __slots__ = ("name", "components", "world_position", "world_rotation", "world_scale")
+
+    def __init__(self, go, components):
+        self.name = go.name
+        self.components = components
+        self.world_position = tuple(go.world_position)
+        self.world_rotation = go.world_rotation
+        self.world_scale = tuple(go.world_scale)
+
+
+class RenderSnapshot:
+    __slots__ = ("frame", "tick", "objects", "settings", "sprites", "overlay_lines")
+
+    def __init__(self, frame, tick, objects, settings, sprites, overlay_lines=()):
+        self.frame = frame # Simulation frame it was taken after
+        self.tick = tick
+        self.objects = objects # [RenderItem] in scene order
+        self.settings = settings # Scene settings (background color)
+        self.sprites = sprites # The runtime's sprite cache of that scene
+        self.overlay_lines = overlay_lines # Simulation profiler and script costs, for the F3 overlay
+
+    @classmethod
+    def capture(cls, runtime):
+        items = []
+        for go in runtime.objects:
+            source = go.components
+            components = None
+            for name in RENDER_COMPONENTS:
+                data = source.get(name)
+                if data is not None:
+                    if components is None:
+                        components = {}
+                    # Lists (tint, color, size) are copied: scripts change them in place
+                    components[name] = {k: (list(v) if isinstance(v, list) else v) for k, v in data.items()}
+            if components is None:
+                continue # Nothing to draw
+            if "CircleCollider" in source:
+                components["CircleCollider"] = True # Shape of the procedural sprite
+            items.append(RenderItem(go, components))
+        overlay_lines = ()
+        if runtime.profiler.show_overlay:
+            overlay_lines = ["", "simulation"] + runtime.profiler.summary_lines() + runtime.script_costs.overlay_lines()
+        return cls(runtime.frame, runtime.tick, items, runtime.scene_settings, runtime.sprites, overlay_lines)
+
+
+class SimulationPipeline:
+    """Runs the runtime's simulation frames on a thread and hands RenderSnapshots to the main thread."""
+
+    def __init__(self, runtime):
+        self.runtime = runtime
+        self.error = None # Exception that stopped the simulation thread
+        self.published = 0
+        self.drawn = 0
+
+        self._front = None
+        self._fresh = False
+        self._cond = threading.Condition()
+        self._posted = []
+        self._posted_lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._thread.start()
+
+    def join(self, timeout=5.0):
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                log.warning("Simulation thread did not stop within %.1f s", timeout)
+            self._thread = None
+
+    # --- Main thread ---
+
+    def post(self, fn):
+        """Runs fn() on the simulation thread before its next frame."""
+        with self._posted_lock:
+            self._posted.append(fn)
+
+    def take(self, timeout):
+        """The snapshot published since the last take(), waiting up to timeout seconds; None if there is none."""
+        with self._cond:
+            if not self._fresh and self.runtime.running:
+                self._cond.wait(timeout)
+            if not self._fresh:
+                return None
+            self._fresh = False
+            self.drawn += 1
+            return self._front
+
+    # --- Simulation thread ---
+
+    def publish(self, snapshot):
+        with self._cond:
+            self._front = snapshot
+            self._fresh = True
+            self.published += 1
+            self._cond.notify()
+
+    def _run_posted(self):
+        with self._posted_lock:
+            posted, self._posted = self._posted, []
+        for fn in posted:
+            fn()
+
+    def _run(self):
+        runtime = self.runtime
+        profiler = runtime.profiler
+        clock = pygame.time.Clock()
+        runtime.watchdog.bind_thread() # Runaway scripts are interrupted here, not on the main thread
+        runtime.gc_policy.bind_profiler(profiler) # GC pauses of this thread go to the simulation profiler
+        try:
+            while runtime.running:
+                frame_time = clock.tick(SIM_FPS) / 1000.0
+                profiler.fps = clock.get_fps()
+                if frame_time > 0.25: frame_time = 0.25 # Prevent spiral of death
+                frame_start = runtime.begin_frame()
+                self._run_posted()
+                runtime.simulate_frame(frame_time)
+                profiler.start("publish")
+                self.publish(RenderSnapshot.capture(runtime))
+                profiler.stop("publish")
+                runtime.end_frame(frame_start)
+        except Exception as e:
+            log.error("Simulation thread failed: %s", e)
+            self.error = e
+            runtime.running = False
+        finally:
+            runtime.gc_policy.bind_profiler(None)
+            with self._cond:
+                self._cond.notify_all()
+
+    def format_report(self):
+        return f"Pipeline: {self.published} frames simulated, {self.drawn} drawn"
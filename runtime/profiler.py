@@ -0,0 +1,210 @@
+import time
+import csv
+from collections import deque
+
+import pygame
+
+# Per-frame profiler. The runtime wraps each phase of a frame in start()/stop()
+# pairs; times of a phase that runs several times in one frame (the fixed steps)
+# are summed. Sub-phases are named "<phase>.<sub>" and are included in their
+# parent's time. The last HISTORY frames are kept in a ring buffer.
+#
+# Toggle the overlay with F3 (or --profile), export the ring buffer with F4
+# (or --profile-csv PATH on exit). With a TraceRecorder attached, every section
+# is also recorded as a timeline span (see runtime/trace_recorder.py).
+
+class FrameSample:
+    __slots__ = ("frame", "frame_ms", "sections", "counters")
+
+    def __init__(self, frame, frame_ms, sections, counters):
+        self.frame = frame
+        self.frame_ms = frame_ms # Work time from begin_frame to end_frame (excludes the frame cap sleep)
+        self.sections = sections # name -> ms
+        self.counters = counters # name -> count
+
+
+class FrameProfiler:
+    HISTORY = 600 # Frames kept
+    GRAPH_FRAMES = 120 # Frames shown in the overlay graph
+    BUDGET_MS = 1000.0 / 60.0
+
+    def __init__(self):
+        self.enabled = False
+        self.show_overlay = False
+        self.frames = deque(maxlen=self.HISTORY)
+        self.section_order = [] # First-seen order, used for the overlay and CSV columns
+        self._known = set()
+        self.fps = 0.0
+
+        self._sections = {}
+        self._counters = {}
+        self._starts = {}
+        self._frame_start = 0.0
+        self._frame_index = 0
+        self._font = None
+        self.tracer = None # TraceRecorder receiving every section as a span, if enabled
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+        if self.show_overlay:
+            self.enabled = True
+
+    # --- Recording ---
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._sections = {}
+        self._counters = {}
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        frame_ms = (time.perf_counter() - self._frame_start) * 1000.0
+        self.frames.append(FrameSample(self._frame_index, frame_ms, self._sections, self._counters))
+        if self.tracer is not None and self.tracer.enabled:
+            self.tracer.end_frame(self._frame_index, self._frame_start, frame_ms)
+        self._frame_index += 1
+
+    def start(self, name):
+        if self.enabled:
+            if name not in self._known:
+                # Registered on start so parents come before their sub-phases
+                self._known.add(name)
+                self.section_order.append(name)
+            self._starts[name] = time.perf_counter()
+
+    def stop(self, name):
+        if not self.enabled:
+            return
+        start = self._starts.pop(name, None)
+        if start is None:
+            return
+        elapsed = (time.perf_counter() - start) * 1000.0
+        sections = self._sections
+        sections[name] = sections.get(name, 0.0) + elapsed
+        if self.tracer is not None and self.tracer.enabled:
+            self.tracer.add(name, start, elapsed)
+
+    def add(self, name, start, elapsed_ms):
+        """Adds time measured elsewhere, e.g. a GC pause, which also counts towards the section it interrupted."""
+        if not self.enabled:
+            return
+        if name not in self._known:
+            self._known.add(name)
+            self.section_order.append(name)
+        sections = self._sections
+        sections[name] = sections.get(name, 0.0) + elapsed_ms
+        if self.tracer is not None and self.tracer.enabled:
+            self.tracer.add(name, start, elapsed_ms)
+
+    def span(self, name):
+        """Start/stop pair that only goes to the trace timeline, not to the per-frame sections."""
+        return _TraceSpan(self, name)
+
+    def count(self, name, value=1):
+        if self.enabled:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_counter(self, name, value):
+        if self.enabled:
+            self._counters[name] = value
+
+    # --- Reporting ---
+
+    def averages(self, frames=60):
+        """(average frame ms, {section: average ms}) over the last frames."""
+        recent = list(self.frames)[-frames:]
+        if not recent:
+            return 0.0, {}
+        totals = {}
+        for sample in recent:
+            for name, ms in sample.sections.items():
+                totals[name] = totals.get(name, 0.0) + ms
+        n = len(recent)
+        return sum(s.frame_ms for s in recent) / n, {k: v / n for k, v in totals.items()}
+
+    def export_csv(self, path):
+        counter_names = []
+        for sample in self.frames:
+            for name in sample.counters:
+                if name not in counter_names:
+                    counter_names.append(name)
+
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "frame_ms"] + [f"{s}_ms" for s in self.section_order] + counter_names)
+            for sample in self.frames:
+                row = [sample.frame, f"{sample.frame_ms:.4f}"]
+                row += [f"{sample.sections.get(s, 0.0):.4f}" for s in self.section_order]
+                row += [sample.counters.get(c, 0) for c in counter_names]
+                writer.writerow(row)
+        print(f"Profiler: Wrote {len(self.frames)} frames to {path}")
+
+    def summary_lines(self):
+        """The overlay's text: FPS and work time, per-section averages and the last frame's counters."""
+        frame_ms, sections = self.averages()
+        last = self.frames[-1] if self.frames else None
+        lines = [f"FPS {self.fps:5.1f}   work {frame_ms:6.2f} ms"]
+        for name in self.section_order:
+            indent = "  " * name.count(".")
+            lines.append(f"{indent}{name.split('.')[-1]:<14}{sections.get(name, 0.0):7.3f} ms")
+        if last is not None:
+            lines.append("  ".join(f"{k} {v}" for k, v in last.counters.items()))
+        return lines
+
+    def draw_overlay(self, screen, extra_lines=()):
+        """Draws FPS, per-section averages, counters and a frame time graph in the top-left corner."""
+        if not self.show_overlay:
+            return
+        if self._font is None:
+            self._font = pygame.font.SysFont("monospace", 13)
+        font = self._font
+
+        lines = self.summary_lines()
+        lines.extend(extra_lines)
+
+        line_h = font.get_linesize()
+        graph_h = 60
+        width = 300
+        height = line_h * len(lines) + graph_h + 16
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+
+        y = 4
+        for line in lines:
+            panel.blit(font.render(line, True, (220, 220, 220)), (6, y))
+            y += line_h
+
+        # Frame time graph, scaled so the 60 FPS budget sits at half height
+        graph_top = y + 6
+        scale = graph_h / (self.BUDGET_MS * 2.0)
+        recent = list(self.frames)[-self.GRAPH_FRAMES:]
+        bar_w = max(1, (width - 12) // self.GRAPH_FRAMES)
+        for i, sample in enumerate(recent):
+            h = min(graph_h, int(sample.frame_ms * scale))
+            color = (90, 200, 90) if sample.frame_ms <= self.BUDGET_MS else (220, 80, 60)
+            pygame.draw.rect(panel, color, (6 + i * bar_w, graph_top + graph_h - h, bar_w, h))
+        budget_y = graph_top + graph_h - int(self.BUDGET_MS * scale)
+        pygame.draw.line(panel, (200, 200, 80), (6, budget_y), (width - 6, budget_y))
+
+        screen.blit(panel, (8, 8))
+
+
+class _TraceSpan:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        tracer = self.profiler.tracer
+        if self.profiler.enabled and tracer is not None and tracer.enabled:
+            tracer.add(self.name, self.start, (time.perf_counter() - self.start) * 1000.0)
+        return False
@@ -0,0 +1,182 @@
+import os
+import gzip
+import json
+import time
+import struct
+import hashlib
+
+# Input record and replay for reproducible runs (main.py --record / --replay).
+# A recording holds the scene, the random seed the runtime was started with and,
+# per rendered frame, the frame time and the pressed keys (only when they changed).
+# Every hash_every-th fixed step it also stores a hash of the world state: object
+# transforms and physics body velocities. A replay restarts the scene with the same
+# seed and feeds the recorded frame times and keys back, so the same fixed steps run
+# with the same input; each stored hash is compared, and the first tick where the
+# world differs is reported. Replays run headless as fast as possible, which makes
+# them repeatable benchmark workloads (main.py --bench accepts replay files too).
+#
+#   python main.py --run-scene stress_test/scenes/02_interaction.scene.json --record play.replay.gz
+#   python main.py --replay play.replay.gz --replay-headless
+#
+# Things outside the recording still make a replay diverge: wall clock reads in
+# scripts, the watchdog interrupting a script (it runs on wall time), string hash
+# order when PYTHONHASHSEED differs from the recording, and threaded physics.
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+VERSION = 1
+REPLAY_SUFFIX = ".replay.gz"
+
+_TRANSFORM = struct.Struct("<3d")
+_VELOCITY = struct.Struct("<3d")
+
+
+def world_hash(runtime):
+    """Hex digest of the objects' names and transforms and the bodies' velocities, in scene order."""
+    digest = hashlib.blake2b(digest_size=8)
+    for obj in runtime.objects:
+        position = obj.position
+        digest.update(str(obj.name).encode()) # Not the id: instantiated objects get a random uuid
+        digest.update(_TRANSFORM.pack(float(position[0]), float(position[1]), float(obj.rotation)))
+    for body in runtime.physics.bodies.values():
+        velocity = body.velocity
+        digest.update(_VELOCITY.pack(velocity.x, velocity.y, body.angular_velocity))
+    return digest.hexdigest()
+
+
+def _relative(path):
+    path = os.path.abspath(path)
+    try:
+        relative = os.path.relpath(path, PROJECT_ROOT)
+    except ValueError:
+        return path # Other drive on Windows
+    return path if relative.startswith("..") else relative
+
+
+class InputRecorder:
+    def __init__(self, path, scene_path, seed, hash_every=1, physics_threads=None):
+        self.path = path
+        self.header = {
+            "version": VERSION,
+            "scene": _relative(scene_path),
+            "seed": seed,
+            "hash_seed": os.environ.get("PYTHONHASHSEED"),
+            "hash_every": max(1, int(hash_every)),
+            "physics_threads": physics_threads,
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self.frames = [] # [frame time, pressed scancodes or None when unchanged]
+        self.hashes = [] # One per hash_every fixed steps
+        self._last_keys = None
+
+    def record_frame(self, frame_time, keys):
+        pressed = [code for code, down in enumerate(keys) if down]
+        if pressed == self._last_keys:
+            self.frames.append([frame_time, None])
+        else:
+            self.frames.append([frame_time, pressed])
+            self._last_keys = pressed
+
+    def record_tick(self, runtime):
+        if runtime.tick % self.header["hash_every"] == 0:
+            self.hashes.append(world_hash(runtime))
+
+    def write(self):
+        data = dict(self.header, frames=self.frames, hashes=self.hashes)
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        return self.path
+
+
+class InputReplay:
+    def __init__(self, path):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != VERSION:
+            raise ValueError(f"{path}: unsupported replay version {data.get('version')}")
+        self.path = path
+        self.scene_path = os.path.join(PROJECT_ROOT, data["scene"])
+        self.seed = data["seed"]
+        self.hash_seed = data.get("hash_seed")
+        self.hash_every = data["hash_every"]
+        self.physics_threads = data.get("physics_threads")
+        self.frames = data["frames"]
+        self.hashes = data["hashes"]
+
+        self.cursor = 0 # Next frame to play
+        self.keys = None # Pressed keys of the frame being played (a pygame ScancodeWrapper)
+        self.checked = 0
+        self.mismatches = 0
+        self.first_mismatch = None # Tick
+
+    @property
+    def finished(self):
+        return self.cursor >= len(self.frames)
+
+    def next_frame(self):
+        """Moves to the next recorded frame and returns its frame time."""
+        import pygame
+        frame_time, pressed = self.frames[self.cursor]
+        self.cursor += 1
+        if pressed is not None or self.keys is None:
+            state = [False] * 512 # SDL_NUM_SCANCODES, the length of pygame.key.get_pressed()
+            for code in pressed or ():
+                state[code] = True
+            self.keys = pygame.key.ScancodeWrapper(state)
+        return frame_time
+
+    def check_tick(self, runtime):
+        tick = runtime.tick
+        if tick % self.hash_every:
+            return
+        index = tick // self.hash_every - 1
+        if index >= len(self.hashes):
+            return
+        self.checked += 1
+        if world_hash(runtime) != self.hashes[index]:
+            self.mismatches += 1
+            if self.first_mismatch is None:
+                self.first_mismatch = tick
+
+    def diverged(self):
+        return self.mismatches > 0
+
+    def summary(self):
+        return {"frames": self.cursor, "checked": self.checked, "mismatches": self.mismatches,
+                "first_mismatch": self.first_mismatch}
+
+    def format_report(self):
+        if not self.diverged():
+            return f"Replay: {self.cursor} frames, {self.checked} world hashes match the recording"
+        return (f"Replay: DIVERGED at tick {self.first_mismatch}, "
+                f"{self.mismatches} of {self.checked} world hashes differ from the recording")
+
+
+def run_replay(path, headless=False):
+    """Plays a recording back and verifies its world hashes; returns the process exit code."""
+    if headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from runtime.game_loop import GameRuntime
+
+    replay = InputReplay(path)
+    if replay.hash_seed != os.environ.get("PYTHONHASHSEED"):
+        print(f"Replay: Recorded with PYTHONHASHSEED={replay.hash_seed}, now "
+              f"{os.environ.get('PYTHONHASHSEED')}; scripts that iterate sets of strings may diverge.")
+    runtime = GameRuntime(replay.scene_path, physics_threads=replay.physics_threads,
+                          seed=replay.seed, replay=replay)
+    start = time.perf_counter()
+    while runtime.running and not replay.finished:
+        if not headless:
+            runtime.clock.tick(60)
+        runtime.advance_frame(replay.next_frame())
+    wall_s = time.perf_counter() - start
+
+    print(replay.format_report())
+    print(f"Replay: {runtime.tick} ticks in {wall_s:.2f} s")
+    runtime.parallel.shutdown()
+    runtime.watchdog.stop()
+    runtime.gc_policy.shutdown()
+    pygame.quit()
+    return 1 if replay.diverged() else 0
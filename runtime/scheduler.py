@@ -0,0 +1,394 @@
+import time
+import heapq
+import inspect
+import weakref
+from runtime.api import Script, WaitSeconds, WaitFrames, WaitUntil
+from runtime.log import get_logger
+from runtime.parallel import deferred_commands
+
+log = get_logger("scheduler")
+
+# Script phases, in the order they run:
+#   fixed_update(dt) - every fixed physics step (120 Hz), after collision events
+#   update(dt)       - once per rendered frame
+#   late_update(dt)  - once per rendered frame, after every update()
+PHASE_FIXED_UPDATE = "fixed_update"
+PHASE_UPDATE = "update"
+PHASE_LATE_UPDATE = "late_update"
+PHASES = (PHASE_FIXED_UPDATE, PHASE_UPDATE, PHASE_LATE_UPDATE)
+
+# Keyed weakly: every scene load imports its scripts again, and the classes of
+# unloaded scenes (with their modules) must be freed
+_phase_cache = weakref.WeakKeyDictionary() # Script subclass -> phases it overrides
+
+def get_overridden_phases(script_cls):
+    """Phases a Script subclass actually implements; base class no-ops are never called."""
+    phases = _phase_cache.get(script_cls)
+    if phases is None:
+        phases = tuple(p for p in PHASES
+                       if getattr(script_cls, p, None) is not getattr(Script, p, None))
+        _phase_cache[script_cls] = phases
+    return phases
+
+_batched_cache = weakref.WeakKeyDictionary() # Script subclass -> phases it handles with a class-level <phase>_all
+
+def get_batched_phases(script_cls):
+    """
+    Phases a Script subclass handles as a System: a classmethod such as
+    update_all(cls, instances, dt) called once with every live instance.
+    """
+    phases = _batched_cache.get(script_cls)
+    if phases is None:
+        phases = tuple(p for p in PHASES if callable(getattr(script_cls, p + "_all", None)))
+        _batched_cache[script_cls] = phases
+    return phases
+
+def is_rate_limited(script):
+    """Whether a script declares tick_rate / update_every_n for its per-frame phases."""
+    return bool(getattr(script, "tick_rate", 0)) or getattr(script, "update_every_n", 1) > 1
+
+
+class ScriptScheduler:
+    """
+    Calls each script phase only on the scripts that override it.
+
+    Per-frame phases honour the script's declared rate:
+        tick_rate = 10        # update()/late_update() at most 10 times per second
+        update_every_n = 4    # update()/late_update() every 4th frame
+    A skipped script gets the skipped time added to the dt of its next call, so
+    timers stay correct. The same applies to scripts skipped by the simulation LOD.
+
+    Script classes with a <phase>_all classmethod run as Systems: one call per
+    class with the list of live instances instead of one call per instance.
+    Their tick_rate / update_every_n apply to the whole class; the LOD does not
+    throttle them (the class decides what to do with distant instances).
+
+    Scripts with `parallel_safe = True` run in batches on the runner's thread pool
+    (see runtime/parallel.py) after the serial scripts of the same phase.
+    """
+
+    def __init__(self, runner=None):
+        self.runner = runner # ParallelScriptRunner, or None to run parallel_safe scripts serially
+        self.watchdog = None # ScriptWatchdog timing each main thread call, if any
+        self.direct = {p: [] for p in PHASES} # Run every call, no bookkeeping
+        self.limited = {p: [] for p in PHASES} # Rate limited or LOD throttled
+        self.parallel = {p: [] for p in PHASES} # parallel_safe scripts, batched on the runner
+        self.systems = {p: [] for p in PHASES} # (Script subclass, [instances]) batches
+        self.pending_dt = {} # (script, phase) -> time skipped since the last call
+        self.system_pending_dt = {} # (Script subclass, phase) -> time skipped since the last call
+
+    def rebuild(self, scripts):
+        """Re-sorts scripts into phase lists. Call whenever scripts are added or removed."""
+        direct = {p: [] for p in PHASES}
+        limited = {p: [] for p in PHASES}
+        parallel = {p: [] for p in PHASES}
+        batches = {p: {} for p in PHASES} # Insertion ordered, first instance decides class order
+        for script in scripts:
+            cls = type(script)
+            batched = get_batched_phases(cls)
+            for phase in batched:
+                batches[phase].setdefault(cls, []).append(script)
+
+            rate_limited = is_rate_limited(script)
+            parallel_safe = self.runner is not None and getattr(script, "parallel_safe", False)
+            for phase in get_overridden_phases(cls):
+                if phase in batched:
+                    continue
+                if parallel_safe:
+                    parallel[phase].append(script)
+                elif rate_limited and phase != PHASE_FIXED_UPDATE:
+                    limited[phase].append(script)
+                else:
+                    direct[phase].append(script)
+        self.direct = direct
+        self.limited = limited
+        self.parallel = parallel
+        self.systems = {p: list(batches[p].items()) for p in PHASES}
+        self.system_pending_dt = {k: v for k, v in self.system_pending_dt.items() if k[0] in batches[k[1]]}
+
+        alive = set(id(s) for s in scripts)
+        self.pending_dt = {k: v for k, v in self.pending_dt.items() if id(k[0]) in alive}
+
+    def _is_due(self, script, phase, count, pending):
+        if phase == PHASE_FIXED_UPDATE:
+            return True
+        every_n = getattr(script, "update_every_n", 1)
+        if every_n > 1 and count % every_n:
+            return False
+        tick_rate = getattr(script, "tick_rate", 0)
+        if tick_rate and pending < 1.0 / tick_rate - 1e-9: # float sums of frame times undershoot
+            return False
+        return True
+
+    def run(self, phase, dt, count, on_error, lod=None):
+        """
+        Runs one phase. count is the fixed tick (fixed_update) or frame number (per-frame phases).
+        on_error(script, phase, exception) is called for scripts that raise; for a System
+        the first argument is the list of its instances.
+        """
+        direct = self.direct[phase]
+        watchdog = self.watchdog if self.watchdog is not None and self.watchdog.active else None
+        if lod is None and watchdog is None:
+            for script in direct:
+                try:
+                    getattr(script, phase)(dt)
+                except Exception as e:
+                    on_error(script, phase, e)
+        elif lod is None:
+            for script in direct:
+                self._invoke(script, phase, getattr(script, phase), dt, on_error, watchdog)
+        else:
+            # With the LOD on every script may be skipped
+            for script in direct:
+                self._run_limited(script, phase, dt, count, on_error, lod)
+
+        for script in self.limited[phase]:
+            self._run_limited(script, phase, dt, count, on_error, lod)
+
+        if self.parallel[phase]:
+            # Which scripts are due is decided here, so pending_dt is only touched on this thread
+            due = []
+            for script in self.parallel[phase]:
+                if lod is None and (phase == PHASE_FIXED_UPDATE or not is_rate_limited(script)):
+                    due.append((script, dt))
+                    continue
+                script_dt = self._take_dt(script, phase, dt, count, lod)
+                if script_dt is not None:
+                    due.append((script, script_dt))
+            costs = self.watchdog.costs if self.watchdog is not None else None
+            if costs is not None and costs.sampling:
+                # Timed on the worker; the tracker is only written when the batch is applied
+                def call(item):
+                    script, script_dt = item
+                    start = time.perf_counter()
+                    try:
+                        getattr(script, phase)(script_dt)
+                    finally:
+                        elapsed = time.perf_counter() - start
+                        deferred_commands().append(lambda: costs.record(script, phase, elapsed))
+            else:
+                call = lambda item: getattr(item[0], phase)(item[1])
+            for (script, _), e in self.runner.run(due, call):
+                on_error(script, phase, e)
+
+        for cls, instances in self.systems[phase]:
+            if is_rate_limited(cls):
+                key = (cls, phase)
+                pending = self.system_pending_dt.get(key, 0.0) + dt
+                if not self._is_due(cls, phase, count, pending):
+                    self.system_pending_dt[key] = pending
+                    continue
+                self.system_pending_dt[key] = 0.0
+            else:
+                pending = dt
+            try:
+                if watchdog is not None:
+                    watchdog.begin(cls, phase + "_all")
+                getattr(cls, phase + "_all")(instances, pending)
+                if watchdog is not None:
+                    watchdog.end()
+            except Exception as e:
+                if watchdog is not None:
+                    watchdog.end()
+                on_error(instances, phase + "_all", e)
+
+    def _take_dt(self, script, phase, dt, count, lod):
+        """dt to run a throttled script with (including skipped time), or None to skip it this call."""
+        key = (script, phase)
+        pending = self.pending_dt.get(key, 0.0) + dt
+        if (lod is not None and not lod.should_update(script, count)) or \
+                not self._is_due(script, phase, count, pending):
+            self.pending_dt[key] = pending
+            return None
+        self.pending_dt[key] = 0.0
+        return pending
+
+    def _run_limited(self, script, phase, dt, count, on_error, lod):
+        script_dt = self._take_dt(script, phase, dt, count, lod)
+        if script_dt is None:
+            return
+        watchdog = self.watchdog if self.watchdog is not None and self.watchdog.active else None
+        self._invoke(script, phase, getattr(script, phase), script_dt, on_error, watchdog)
+
+    @staticmethod
+    def _invoke(script, phase, method, dt, on_error, watchdog):
+        try:
+            if watchdog is not None:
+                watchdog.begin(script, phase)
+            method(dt)
+            if watchdog is not None:
+                watchdog.end()
+        except Exception as e:
+            if watchdog is not None:
+                watchdog.end()
+            on_error(script, phase, e)
+
+
+def _close(generator):
+    try:
+        generator.close()
+    except ValueError:
+        pass # Generator is stopping itself; it is dropped at its next yield
+
+
+class Coroutine:
+    """Handle returned by Script.start_coroutine()."""
+    __slots__ = ("owner", "generator", "done", "waiters")
+
+    def __init__(self, owner, generator):
+        self.owner = owner
+        self.generator = generator
+        self.done = False
+        self.waiters = [] # Coroutines that yielded this one
+
+
+class CoroutineScheduler:
+    """
+    Drives script coroutines once per frame, after update().
+
+    Sleeping coroutines cost nothing per frame: wait_seconds / wait_frames go into
+    min-heaps keyed by wake time / wake frame and only the due ones are popped and
+    resumed. wait_until predicates are the exception and are polled every frame.
+    Stopped coroutines are marked done and dropped when they come up.
+    """
+    TIME_EPSILON = 1e-9 # Float sums of frame times undershoot exact wake times
+
+    def __init__(self, on_error=None):
+        self.time = 0.0 # Game time seen by coroutines
+        self.frame = 0
+        self.on_error = on_error # on_error(script, phase, exception)
+        self.watchdog = None # ScriptWatchdog timing each resume, if any
+        self._timers = [] # (wake time, seq, Coroutine)
+        self._frame_timers = [] # (wake frame, seq, Coroutine)
+        self._polling = [] # (predicate, Coroutine)
+        self._seq = 0 # Heap tie breaker so Coroutines are never compared
+        self.owned = {} # id(script) -> [Coroutine]
+
+    def start(self, owner, generator):
+        """Runs the generator up to its first yield and schedules the rest."""
+        if not inspect.isgenerator(generator):
+            log.warning("start_coroutine expects a generator, got %s", type(generator).__name__)
+            return None
+        co = Coroutine(owner, generator)
+        self.owned.setdefault(id(owner), []).append(co)
+        self._resume(co, None)
+        return co
+
+    def stop(self, co):
+        if co is not None and not co.done:
+            _close(co.generator)
+            self._finish(co)
+
+    def stop_owner(self, owner):
+        for co in list(self.owned.get(id(owner), ())):
+            self.stop(co)
+
+    def remove_dead_owners(self, scripts):
+        """Stops the coroutines of scripts that are no longer active."""
+        alive = set(id(s) for s in scripts)
+        dead = [oid for oid in self.owned if oid not in alive]
+        if not dead:
+            return
+        for oid in dead:
+            for co in self.owned.pop(oid):
+                co.done = True
+                _close(co.generator)
+        # Drop them now rather than when they come due
+        self._timers = [t for t in self._timers if not t[2].done]
+        heapq.heapify(self._timers)
+        self._frame_timers = [t for t in self._frame_timers if not t[2].done]
+        heapq.heapify(self._frame_timers)
+        self._polling = [p for p in self._polling if not p[1].done]
+
+    def run(self, dt):
+        """Resumes the coroutines due this frame, then advances the clock by dt."""
+        due = []
+        timers = self._timers
+        wake_limit = self.time + self.TIME_EPSILON
+        while timers and timers[0][0] <= wake_limit:
+            due.append(heapq.heappop(timers)[2])
+        frame_timers = self._frame_timers
+        while frame_timers and frame_timers[0][0] <= self.frame:
+            due.append(heapq.heappop(frame_timers)[2])
+        for co in due:
+            if not co.done:
+                self._resume(co, None)
+
+        if self._polling:
+            polling, self._polling = self._polling, []
+            for predicate, co in polling:
+                if co.done:
+                    continue
+                try:
+                    ready = predicate()
+                except Exception as e:
+                    self._fail(co, e)
+                    continue
+                if ready:
+                    self._resume(co, None)
+                else:
+                    self._polling.append((predicate, co))
+
+        self.time += dt
+        self.frame += 1
+
+    def _resume(self, co, value):
+        watchdog = self.watchdog if self.watchdog is not None and self.watchdog.active else None
+        try:
+            if watchdog is not None:
+                watchdog.begin(co.owner, "coroutine")
+            instruction = co.generator.send(value)
+            if watchdog is not None:
+                watchdog.end()
+        except StopIteration:
+            if watchdog is not None:
+                watchdog.end()
+            self._finish(co)
+            return
+        except Exception as e:
+            if watchdog is not None:
+                watchdog.end()
+            self._fail(co, e)
+            return
+        if not co.done: # Not stopped from inside its own body
+            self._schedule(co, instruction)
+
+    def _schedule(self, co, instruction):
+        self._seq += 1
+        if instruction is None:
+            heapq.heappush(self._frame_timers, (self.frame + 1, self._seq, co))
+        elif isinstance(instruction, WaitSeconds):
+            heapq.heappush(self._timers, (self.time + instruction.seconds, self._seq, co))
+        elif isinstance(instruction, WaitFrames):
+            heapq.heappush(self._frame_timers, (self.frame + instruction.frames, self._seq, co))
+        elif isinstance(instruction, WaitUntil):
+            self._polling.append((instruction.predicate, co))
+        elif isinstance(instruction, Coroutine) or inspect.isgenerator(instruction):
+            child = instruction if isinstance(instruction, Coroutine) else self.start(co.owner, instruction)
+            if child is None or child.done:
+                heapq.heappush(self._frame_timers, (self.frame + 1, self._seq, co))
+            else:
+                child.waiters.append(co)
+        else:
+            log.warning("Coroutine yielded unsupported value %r, waiting one frame", instruction)
+            heapq.heappush(self._frame_timers, (self.frame + 1, self._seq, co))
+
+    def _finish(self, co):
+        co.done = True
+        owned = self.owned.get(id(co.owner))
+        if owned is not None:
+            if co in owned:
+                owned.remove(co)
+            if not owned:
+                del self.owned[id(co.owner)]
+        waiters, co.waiters = co.waiters, []
+        for parent in waiters:
+            if not parent.done:
+                self._resume(parent, None)
+
+    def _fail(self, co, e):
+        self._finish(co)
+        if self.on_error:
+            self.on_error(co.owner, "coroutine", e)
+        else:
+            log.error("Error in coroutine of %s: %s", type(co.owner).__name__, e)
@@ -0,0 +1,168 @@
+import time
+
+from runtime.log import get_logger
+
+log = get_logger("script_costs")
+
+# Per-script cost accounting. On every sample_every-th frame the runtime times
+# each script call (update phases, Systems, coroutines, collision callbacks) via
+# the watchdog's begin()/end() marks; awake() and start() are always timed.
+# Times are inclusive: a start() triggered by instantiate() inside update() also
+# counts towards the calling script. parallel_safe scripts are timed per call on
+# their worker thread (the scheduler records them when the batch is applied);
+# those calls overlap, so their class's frame share is thread time, not wall time.
+# Instance rows are keyed by class and object id, so a destroyed object's row stays
+# as it was and a newly spawned object gets its own.
+#
+# Scene settings (all optional, also enabled by --profile / F3):
+#   "script_costs": {
+#       "enabled": true,
+#       "sample_every": 4,     # frames between sampled frames
+#       "warn_share": 0.25,    # warn when one script class uses this share of the frame budget
+#       "top": 8               # rows in the overlay table
+#   }
+
+ONE_OFF_PHASES = ("awake", "start")
+
+
+class CostEntry:
+    __slots__ = ("total", "calls", "worst")
+
+    def __init__(self):
+        self.total = 0.0 # seconds
+        self.calls = 0
+        self.worst = 0.0 # slowest single call, seconds
+
+    def add(self, elapsed):
+        self.total += elapsed
+        self.calls += 1
+        if elapsed > self.worst:
+            self.worst = elapsed
+
+
+class ScriptCostTracker:
+    WARN_INTERVAL = 5.0 # Seconds between repeated budget warnings for the same class
+    MAX_INSTANCES = 4096 # Instance rows kept; the cheapest half is dropped past this
+
+    def __init__(self, budget_ms=1000.0 / 60.0):
+        self.enabled = False
+        self.sampling = False # True while a sampled frame (or loading) is being timed
+        self.sample_every = 4
+        self.warn_share = 0.25
+        self.top = 8
+        self.budget = budget_ms / 1000.0
+
+        self.sampled_frames = 0
+        self.by_class = {} # (class name, phase) -> CostEntry
+        self.by_instance = {} # (class name, object id) or System class -> [class name, object name, CostEntry]
+        self.one_off = {} # (class name, phase) -> CostEntry, awake/start
+        self._frame_class = {} # class name -> seconds in the current sampled frame
+        self._last_warning = {} # class name -> time of the last warning
+
+    def configure(self, settings, force=False):
+        settings = settings or {}
+        self.enabled = force or bool(settings.get("enabled", False))
+        self.sample_every = max(1, int(settings.get("sample_every", 4)))
+        self.warn_share = float(settings.get("warn_share", 0.25))
+        self.top = max(1, int(settings.get("top", 8)))
+
+    def reset(self):
+        self.sampled_frames = 0
+        self.by_class = {}
+        self.by_instance = {}
+        self.one_off = {}
+
+    def begin_loading(self):
+        """awake()/start() calls while a scene loads are always timed."""
+        self.sampling = self.enabled
+
+    def begin_frame(self, frame):
+        self.sampling = self.enabled and frame % self.sample_every == 0
+        if self.sampling:
+            self._frame_class = {}
+
+    def end_frame(self):
+        if not self.sampling:
+            return
+        self.sampled_frames += 1
+        self.sampling = False
+
+        limit = self.budget * self.warn_share
+        now = time.monotonic()
+        for name, spent in self._frame_class.items():
+            if spent > limit and now - self._last_warning.get(name, -self.WARN_INTERVAL) >= self.WARN_INTERVAL:
+                self._last_warning[name] = now
+                log.warning("SCRIPT BUDGET: '%s' took %.2f ms this frame (%.0f%% of the %.1f ms frame budget)",
+                            name, spent * 1000, spent / self.budget * 100, self.budget * 1000)
+
+    def record(self, script, phase, elapsed):
+        """Called by the watchdog's end() for every bracketed call while sampling."""
+        if isinstance(script, type):
+            class_name, obj_name, key = script.__name__, "(System)", script
+        else:
+            class_name = type(script).__name__
+            obj = getattr(script, "game_object", None)
+            obj_name = obj.name if obj is not None else "?"
+            key = (class_name, obj.id if obj is not None else id(script))
+
+        if phase in ONE_OFF_PHASES:
+            table = self.one_off
+        else:
+            table = self.by_class
+            self._frame_class[class_name] = self._frame_class.get(class_name, 0.0) + elapsed
+
+        entry = table.get((class_name, phase))
+        if entry is None:
+            entry = table[(class_name, phase)] = CostEntry()
+        entry.add(elapsed)
+
+        instance = self.by_instance.get(key)
+        if instance is None:
+            if len(self.by_instance) >= self.MAX_INSTANCES:
+                # Scenes that keep spawning would grow this forever
+                keep = sorted(self.by_instance.items(), key=lambda kv: kv[1][2].total, reverse=True)
+                self.by_instance = dict(keep[:self.MAX_INSTANCES // 2])
+            instance = self.by_instance[key] = [class_name, obj_name, CostEntry()]
+        instance[2].add(elapsed)
+
+    # --- Reports ---
+
+    def top_classes(self, n=None):
+        """[(class name, phase, ms per frame, calls per frame, worst ms)], most expensive first."""
+        frames = max(1, self.sampled_frames)
+        rows = [(name, phase, e.total * 1000.0 / frames, e.calls / frames, e.worst * 1000.0)
+                for (name, phase), e in self.by_class.items()]
+        rows.sort(key=lambda r: r[2], reverse=True)
+        return rows[:n or self.top]
+
+    def top_instances(self, n=None):
+        """[(class name, object name, total ms, calls, worst ms)], most expensive first."""
+        rows = [(name, obj, e.total * 1000.0, e.calls, e.worst * 1000.0)
+                for name, obj, e in self.by_instance.values()]
+        rows.sort(key=lambda r: r[2], reverse=True)
+        return rows[:n or self.top]
+
+    def overlay_lines(self):
+        if not self.enabled:
+            return []
+        lines = ["", "script          phase       ms/frame"]
+        for name, phase, ms, _, _ in self.top_classes():
+            lines.append(f"{name[:15]:<15} {phase[:11]:<11}{ms:8.3f}")
+        return lines
+
+    def format_report(self):
+        lines = [f"Script costs ({self.sampled_frames} sampled frames, every {self.sample_every}):",
+                 f"  {'Class':<24}{'Phase':<20}{'ms/frame':>10}{'calls/frame':>13}{'worst ms':>10}"]
+        for name, phase, ms, calls, worst in self.top_classes():
+            lines.append(f"  {name:<24}{phase:<20}{ms:>10.3f}{calls:>13.1f}{worst:>10.3f}")
+
+        lines.append(f"  {'Instance':<24}{'Object':<20}{'total ms':>10}{'calls':>13}{'worst ms':>10}")
+        for name, obj, ms, calls, worst in self.top_instances():
+            lines.append(f"  {name:<24}{obj[:19]:<20}{ms:>10.3f}{calls:>13}{worst:>10.3f}")
+
+        if self.one_off:
+            lines.append(f"  {'One-off':<24}{'Phase':<20}{'total ms':>10}{'calls':>13}{'worst ms':>10}")
+            rows = sorted(self.one_off.items(), key=lambda kv: kv[1].total, reverse=True)[:self.top]
+            for (name, phase), e in rows:
+                lines.append(f"  {name:<24}{phase:<20}{e.total * 1000:>10.3f}{e.calls:>13}{e.worst * 1000:>10.3f}")
+        return "\n".join(lines)
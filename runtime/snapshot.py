@@ -0,0 +1,345 @@
+import sys
+import json
+import random
+import struct
+from array import array
+
+import pymunk
+from shared.component_defs import COMPONENT_RIGIDBODY
+
+# World-state snapshots for checkpoints, instant retry and debugging.
+# capture() packs the transforms of all objects (x, y, rotation, scale x, scale y)
+# and the state of all physics bodies (x, y, angle, velocity x/y, angular velocity)
+# into flat float arrays, and takes a shallow copy of every script's fields. It also
+# keeps the object, script and body lists, so objects instantiated after the capture
+# are removed again on restore() and destroyed ones come back with their bodies.
+# Restoring is a loop over the arrays, no scene file is read.
+#
+#   snapshot = runtime.capture_snapshot()
+#   ...
+#   runtime.restore_snapshot(snapshot)   # between frames, not from inside a script call
+#
+# F7 captures a checkpoint and F8 restores it in a running game.
+#
+# Not part of a snapshot: other component data (sprites, text), coroutines (they go
+# on from where they are) and script fields that are mutated in place (the copy is
+# shallow). The physics engine's cached contacts are dropped on restore (stale ones
+# would push bodies apart); touching bodies get exit and enter events again.
+#
+# Restoring is NOT exact, so snapshots are not usable for rollback netcode or other
+# re-simulation that must reproduce the original frames. Chipmunk keeps its contact
+# impulses (warm starting) and the broadphase order inside the space, and neither can
+# be captured through pymunk; neither can a copied or pickled Space. Bodies in
+# contact therefore re-simulate differently from the first step after a restore
+# (the resting stacks in scenes 01, 05, 09, 10 and 15 drift from the original run);
+# only bodies that touch nothing re-simulate exactly.
+# For exact reproduction, replay from the scene start (runtime/replay.py).
+#
+# save()/load() write the same arrays to disk. A loaded snapshot has no object
+# references; restore() then matches objects and scripts by object id, so it applies to
+# the scene it was saved from (objects instantiated at runtime get new ids and are
+# skipped), and only script fields that are JSON values are saved.
+
+MAGIC = b"ASNP"
+VERSION = 1
+_HEADER = struct.Struct("<4sII") # magic, version, JSON header length
+
+TRANSFORM_FIELDS = 5 # x, y, rotation, scale x, scale y
+BODY_FIELDS = 6 # x, y, angle, velocity x, velocity y, angular velocity
+
+
+def _json_value(value):
+    try:
+        json.dumps(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+class WorldSnapshot:
+    def __init__(self):
+        self.scene_path = None
+        self.tick = 0
+        self.accumulator = 0.0
+        self.random_state = None
+        self.object_ids = [] # Object ids in transform order
+        self.transforms = array("d")
+        self.body_ids = [] # Object ids in body state order
+        self.body_state = array("d")
+        self.script_state = [] # Field dicts in active_scripts order
+
+        # In-memory snapshots only (None when loaded from disk)
+        self.physics = None # PhysicsSystem the bodies belong to
+        self.objects = None
+        self.scripts = None
+        self.bodies = None # [(pymunk.Body, continuous)]
+        self._handles = None # cpBody of each body in body state order, None for static bodies
+        self._shapes = None # cpShapes of the moving bodies
+        self._rigidbodies = None # [(RigidBody component, its velocity)]
+
+    @classmethod
+    def capture(cls, runtime):
+        snap = cls()
+        snap.scene_path = runtime.scene_path
+        snap.tick = runtime.tick
+        snap.accumulator = runtime.accumulator
+        snap.random_state = random.getstate()
+
+        objects = list(runtime.objects)
+        values = []
+        extend = values.extend
+        for obj in objects:
+            position, scale = obj.position, obj.scale
+            extend((position[0], position[1], obj.rotation, scale[0], scale[1]))
+        snap.transforms = array("d", values)
+        snap.object_ids = [obj.id for obj in objects]
+        snap.objects = objects
+
+        # Bodies are read and written through the Chipmunk functions pymunk wraps (pymunk.cp),
+        # which skips the per-attribute Python layer of pymunk.Body in these loops
+        physics = runtime.physics
+        continuous = physics.continuous_bodies
+        cp = pymunk.cp
+        get_position, get_velocity = cp.cpBodyGetPosition, cp.cpBodyGetVelocity
+        get_angle, get_angular_velocity = cp.cpBodyGetAngle, cp.cpBodyGetAngularVelocity
+        get_type = cp.cpBodyGetType
+        values = []
+        extend = values.extend
+        bodies = []
+        handles = []
+        shapes = []
+        for obj_id, body in physics.bodies.items():
+            handle = body._body
+            position, velocity = get_position(handle), get_velocity(handle)
+            extend((position.x, position.y, get_angle(handle), velocity.x, velocity.y, get_angular_velocity(handle)))
+            bodies.append((body, obj_id in continuous))
+            body_type = get_type(handle)
+            if body_type == pymunk.Body.STATIC:
+                handles.append(None)
+                continue
+            handles.append(handle)
+            shapes.extend(shape._shape for shape in body.shapes)
+        snap.body_state = array("d", values)
+        snap.body_ids = list(physics.bodies)
+        snap.bodies = bodies
+        snap.physics = physics
+        snap._handles = handles
+        snap._shapes = shapes
+
+        # The RigidBody velocity is compared with the body's on the next step (a script
+        # override) and starts bodies that are created after the capture
+        snap._rigidbodies = []
+        for obj in objects:
+            rb_data = obj.components.get(COMPONENT_RIGIDBODY)
+            if rb_data is not None:
+                velocity = rb_data.get("velocity")
+                snap._rigidbodies.append((rb_data, list(velocity) if velocity is not None else None))
+
+        snap.scripts = list(runtime.active_scripts)
+        snap.script_state = [dict(script.__dict__) for script in snap.scripts]
+        return snap
+
+    # --- Restore ---
+
+    def restore(self, runtime):
+        """Puts the runtime back into the captured state."""
+        if self.objects is not None and runtime.physics is not self.physics:
+            raise ValueError("Snapshot was captured in another scene (the physics world was replaced)")
+        runtime.tick = self.tick
+        runtime.accumulator = self.accumulator
+        runtime.instantiate_queue.clear()
+        runtime.destroy_queue.clear()
+        if self.random_state is not None:
+            random.setstate(self.random_state)
+        if self.objects is not None:
+            self._restore_objects(runtime)
+        else:
+            self._restore_by_id(runtime)
+
+    def _restore_objects(self, runtime):
+        physics = runtime.physics
+        objects = self.objects
+
+        if runtime.objects != objects:
+            # Objects were instantiated or destroyed since the capture
+            kept = {id(obj) for obj in objects}
+            for obj in runtime.objects:
+                if id(obj) not in kept:
+                    physics.remove_body(obj.id)
+            runtime.objects = list(objects)
+            runtime.lod.mark_dirty()
+        for obj_id, (body, continuous) in zip(self.body_ids, self.bodies):
+            if physics.bodies.get(obj_id) is not body:
+                physics.remove_body(obj_id)
+                physics.space.add(body, *body.shapes)
+                physics.bodies[obj_id] = body
+                if continuous:
+                    physics.continuous_bodies[obj_id] = body
+        if len(physics.bodies) != len(self.body_ids):
+            # Bodies created by the first step after the capture are created again from the restored transforms
+            captured = set(self.body_ids)
+            for obj_id in [obj_id for obj_id in physics.bodies if obj_id not in captured]:
+                physics.remove_body(obj_id)
+        if runtime.active_scripts != self.scripts:
+            runtime.active_scripts = list(self.scripts)
+            runtime._scripts_changed()
+
+        t = self.transforms
+        for i, obj in enumerate(objects):
+            j = i * TRANSFORM_FIELDS
+            obj.position = [t[j], t[j + 1]]
+            obj.rotation = t[j + 2]
+            obj.scale = [t[j + 3], t[j + 4]]
+
+        cp = pymunk.cp
+        space = physics.space._space
+        remove_shape, add_shape = cp.cpSpaceRemoveShape, cp.cpSpaceAddShape
+        for shape in self._shapes:
+            # Re-adding drops the contacts the space cached for the state being left
+            remove_shape(space, shape)
+            add_shape(space, shape)
+
+        b = self.body_state
+        update_position, set_position, set_angle = cp.cpBodyUpdatePosition, cp.cpBodySetPosition, cp.cpBodySetAngle
+        set_velocity, set_angular_velocity = cp.cpBodySetVelocity, cp.cpBodySetAngularVelocity
+        for i, handle in enumerate(self._handles):
+            j = i * BODY_FIELDS
+            if handle is None:
+                self._restore_body(physics, self.bodies[i][0], b, j)
+                continue
+            update_position(handle, 0.0) # Clears the solver's bias velocity, see _restore_body
+            set_position(handle, (b[j], b[j + 1]))
+            set_angle(handle, b[j + 2])
+            set_velocity(handle, (b[j + 3], b[j + 4]))
+            set_angular_velocity(handle, b[j + 5])
+        for rb_data, velocity in self._rigidbodies:
+            if velocity is None:
+                rb_data.pop("velocity", None)
+            else:
+                rb_data["velocity"] = list(velocity)
+
+        for script, fields in zip(self.scripts, self.script_state):
+            state = script.__dict__
+            state.clear()
+            state.update(fields)
+
+    def _restore_by_id(self, runtime):
+        physics = runtime.physics
+        by_id = {obj.id: obj for obj in runtime.objects}
+        t = self.transforms
+        for i, obj_id in enumerate(self.object_ids):
+            obj = by_id.get(obj_id)
+            if obj is None:
+                continue
+            j = i * TRANSFORM_FIELDS
+            obj.position = [t[j], t[j + 1]]
+            obj.rotation = t[j + 2]
+            obj.scale = [t[j + 3], t[j + 4]]
+
+        self._reset_contacts(physics)
+        b = self.body_state
+        for i, obj_id in enumerate(self.body_ids):
+            body = physics.bodies.get(obj_id)
+            if body is not None:
+                self._restore_body(physics, body, b, i * BODY_FIELDS)
+            elif obj_id in by_id:
+                # Body not created yet: the first step creates it at the restored transform
+                rb_data = by_id[obj_id].components.get(COMPONENT_RIGIDBODY)
+                if rb_data is not None:
+                    rb_data["velocity"] = [b[i * BODY_FIELDS + 3], b[i * BODY_FIELDS + 4]]
+        self._sync_rigidbodies(runtime.objects, physics)
+
+        scripts = {(s.game_object.id, type(s).__name__): s for s in runtime.active_scripts}
+        for key, fields in self.script_state:
+            script = scripts.get(tuple(key))
+            if script is not None:
+                for name, value in fields.items():
+                    setattr(script, name, value)
+
+    @staticmethod
+    def _reset_contacts(physics):
+        """Re-adds the moving bodies, so the space drops the contacts it cached for the state being left."""
+        space = physics.space
+        for body in physics.bodies.values():
+            if body.body_type != pymunk.Body.STATIC:
+                shapes = list(body.shapes)
+                space.remove(body, *shapes)
+                space.add(body, *shapes)
+
+    @staticmethod
+    def _restore_body(physics, body, b, j):
+        if body.body_type != pymunk.Body.STATIC:
+            # A zero length position update clears the solver's bias velocity left over from
+            # the last step, which would otherwise nudge the restored position on the next one
+            pymunk.Body.update_position(body, 0.0)
+        body.position = (b[j], b[j + 1])
+        body.angle = b[j + 2]
+        if body.body_type == pymunk.Body.STATIC:
+            physics.space.reindex_shapes_for_body(body)
+            return
+        body.velocity = (b[j + 3], b[j + 4])
+        body.angular_velocity = b[j + 5]
+
+    @staticmethod
+    def _sync_rigidbodies(objects, physics):
+        """RigidBody velocities follow the bodies, or the next step would take them for a script override."""
+        bodies = physics.bodies
+        for obj in objects:
+            body = bodies.get(obj.id)
+            if body is None or body.body_type != pymunk.Body.DYNAMIC:
+                continue
+            rb_data = obj.components.get(COMPONENT_RIGIDBODY)
+            if rb_data is not None:
+                velocity = body.velocity
+                rb_data["velocity"] = [velocity.x, velocity.y]
+
+    # --- Disk ---
+
+    def save(self, path):
+        """Writes the snapshot in its packed form; returns path."""
+        if self.scripts is not None:
+            script_state = [[[script.game_object.id, type(script).__name__],
+                             {name: value for name, value in fields.items() if _json_value(value)}]
+                            for script, fields in zip(self.scripts, self.script_state)]
+        else:
+            script_state = self.script_state
+        header = json.dumps({
+            "scene": self.scene_path,
+            "tick": self.tick,
+            "accumulator": self.accumulator,
+            "random_state": self.random_state,
+            "byteorder": sys.byteorder,
+            "object_ids": self.object_ids,
+            "body_ids": self.body_ids,
+            "scripts": script_state,
+        }).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(header)))
+            f.write(header)
+            self.transforms.tofile(f)
+            self.body_state.tofile(f)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            magic, version, length = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path}: not a version {VERSION} world snapshot")
+            header = json.loads(f.read(length).decode("utf-8"))
+            snap = cls()
+            snap.object_ids = header["object_ids"]
+            snap.body_ids = header["body_ids"]
+            snap.transforms.fromfile(f, len(snap.object_ids) * TRANSFORM_FIELDS)
+            snap.body_state.fromfile(f, len(snap.body_ids) * BODY_FIELDS)
+        if header["byteorder"] != sys.byteorder:
+            snap.transforms.byteswap()
+            snap.body_state.byteswap()
+        snap.scene_path = header["scene"]
+        snap.tick = header["tick"]
+        snap.accumulator = header["accumulator"]
+        state = header["random_state"]
+        if state is not None:
+            snap.random_state = (state[0], tuple(state[1]), state[2])
+        snap.script_state = header["scripts"]
+        return snap
@@ -0,0 +1,103 @@
+import os
+import json
+import time
+from collections import deque
+
+from runtime.log import get_logger
+
+log = get_logger("trace")
+
+# Timeline recorder for the Chrome trace format (chrome://tracing, ui.perfetto.dev).
+# Every profiler section (see runtime/profiler.py) becomes a complete ("X") event;
+# nesting follows from the timestamps: frame > fixed_step > physics/collisions/
+# fixed_update/lifecycle, frame > update, frame > draw > sort/blit/flip.
+# The last `frames` frames are kept in memory. A trace is written:
+#   - on demand with F6, or on exit with --trace PATH
+#   - automatically when a frame takes longer than hitch_ms (flight recorder):
+#     the preceding frames, including the hitch, go to <dir>/hitch_<frame>_<time>.json
+#
+# Scene settings (all optional):
+#   "trace": {
+#       "enabled": true,
+#       "frames": 120,
+#       "hitch_ms": 50,        # 0 = no automatic dumps
+#       "dir": "traces",
+#       "min_interval": 5.0    # seconds between automatic dumps
+#   }
+
+class TraceRecorder:
+    def __init__(self):
+        self.enabled = False
+        self.hitch_ms = 0.0
+        self.output_dir = "traces"
+        self.min_interval = 5.0
+        self.frames = deque(maxlen=120) # [(frame index, [(name, start s, duration ms)])]
+        self.dumps = [] # Paths written by the flight recorder
+
+        self._events = []
+        self._last_dump = float("-inf")
+
+    def configure(self, settings, force=False):
+        settings = settings or {}
+        self.enabled = force or bool(settings.get("enabled", False))
+        frames = max(1, int(settings.get("frames", self.frames.maxlen)))
+        if frames != self.frames.maxlen:
+            self.frames = deque(self.frames, maxlen=frames)
+        if "hitch_ms" in settings:
+            self.hitch_ms = float(settings["hitch_ms"])
+        self.output_dir = settings.get("dir", self.output_dir)
+        self.min_interval = float(settings.get("min_interval", self.min_interval))
+
+    def add(self, name, start, duration_ms):
+        self._events.append((name, start, duration_ms))
+
+    def end_frame(self, frame, start, duration_ms):
+        """Closes the frame's event list; dumps the ring if the frame was a hitch."""
+        events = self._events
+        events.append(("frame", start, duration_ms))
+        self._events = []
+        self.frames.append((frame, events))
+
+        if self.hitch_ms > 0 and duration_ms > self.hitch_ms:
+            now = time.monotonic()
+            if now - self._last_dump >= self.min_interval:
+                self._last_dump = now
+                os.makedirs(self.output_dir, exist_ok=True)
+                path = os.path.join(self.output_dir, f"hitch_{frame}_{time.strftime('%Y%m%d_%H%M%S')}.json")
+                self.write(path)
+                self.dumps.append(path)
+                log.warning("Frame %d took %.1f ms (> %.0f ms), wrote the last %d frames to %s",
+                            frame, duration_ms, self.hitch_ms, len(self.frames), path)
+
+    def to_chrome_trace(self):
+        """The recorded frames as a Chrome trace dict (timestamps in microseconds)."""
+        pid = os.getpid()
+        trace_events = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "Aspis Runtime"}},
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "main"}},
+        ]
+        origin = None
+        for frame, events in self.frames:
+            for name, start, duration_ms in events:
+                if origin is None or start < origin:
+                    origin = start
+        for frame, events in self.frames:
+            for name, start, duration_ms in events:
+                event = {
+                    "name": name,
+                    "cat": name.split(".")[0],
+                    "ph": "X",
+                    "ts": (start - origin) * 1e6,
+                    "dur": duration_ms * 1000.0,
+                    "pid": pid,
+                    "tid": 0,
+                }
+                if name == "frame":
+                    event["args"] = {"frame": frame}
+                trace_events.append(event)
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+        return path
@@ -0,0 +1,165 @@
+import sys
+import time
+import ctypes
+import threading
+import traceback
+from collections import deque
+
+from runtime.log import get_logger
+
+log = get_logger("watchdog")
+
+# The watchdog catches scripts that hang instead of crashing. The runtime marks
+# every script call (update phases, Systems, coroutines and collision callbacks)
+# on the script thread: the main thread, or the simulation thread in pipelined
+# mode (see bind_thread). A background thread checks how long the current call
+# has been running and, past the budget, logs the script, its object and a
+# stack sample. With "interrupt" on it also raises ScriptTimeout inside the
+# script, which the sandbox handles like any other crash: the script is disabled.
+#
+# Scene settings (all optional):
+#   "watchdog": {
+#       "enabled": true,
+#       "budget_ms": 250,     # per call
+#       "interrupt": true     # false = report only
+#   }
+# awake() and start() are only reported, never interrupted: heavy setup while a
+# scene loads is legitimate, and a script disabled there would not run at all.
+#
+# The same begin()/end() marks feed the per-script cost accounting (ScriptCostTracker)
+# on its sampled frames, so script calls are only bracketed once.
+#
+# Interrupting uses an asynchronous exception, which Python delivers between
+# bytecodes: a script stuck inside a single blocking C call (e.g. time.sleep)
+# is reported at once but only interrupted when that call returns. A script that
+# swallows ScriptTimeout (a broad `except Exception`) and keeps running is
+# interrupted again every budget until the call ends.
+
+LOAD_PHASES = ("awake", "start") # Reported, not interrupted
+
+class ScriptTimeout(Exception):
+    """Raised inside a script that exceeded the watchdog's time budget."""
+
+
+class ScriptWatchdog:
+    STACK_DEPTH = 6 # Innermost frames kept in a report
+
+    def __init__(self):
+        self.enabled = True
+        self.budget = 0.25
+        self.interrupt = True
+        self.reports = deque(maxlen=32) # Recent reports, newest last
+        self.costs = None # ScriptCostTracker fed with call durations while it samples
+        self.active = True # Calls are bracketed: watchdog enabled or costs sampling
+
+        # Written by the script thread around each script call: (script, phase, start time, outer call).
+        # Calls nest when a script instantiates another one and its start() runs.
+        self.current = None
+        self._script_thread_id = threading.main_thread().ident
+        self._reported = None # The `current` tuple already reported
+        self._interrupted = 0.0 # When ScriptTimeout was last raised in the reported call
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def configure(self, settings):
+        settings = settings or {}
+        self.enabled = bool(settings.get("enabled", True))
+        self.budget = max(0.001, float(settings.get("budget_ms", 250)) / 1000.0)
+        self.interrupt = bool(settings.get("interrupt", True))
+        self.update_active()
+        if self.enabled:
+            self.start()
+
+    def bind_thread(self):
+        """Makes the calling thread the one whose script calls are reported and interrupted."""
+        self._script_thread_id = threading.get_ident()
+
+    def update_active(self):
+        self.active = self.enabled or (self.costs is not None and self.costs.sampling)
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="script-watchdog", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def begin(self, script, phase):
+        """Marks the start of a script call on the script thread."""
+        if self.active:
+            self.current = (script, phase, time.perf_counter(), self.current)
+
+    def end(self):
+        """Marks the end of the call. Call it inside the same try block as the script call."""
+        call = self.current
+        if call is None:
+            return
+        costs = self.costs
+        if costs is not None and costs.sampling:
+            costs.record(call[0], call[1], time.perf_counter() - call[2])
+        # Under the lock, so the watchdog cannot interrupt a call that is ending. A pending
+        # interrupt is cancelled before the call is popped: if it is delivered first, it
+        # surfaces before the pop and the caller's except branch ends the call itself.
+        with self._lock:
+            if call is self._reported:
+                if self.interrupt:
+                    # Cancel an interrupt that was not delivered inside the script
+                    ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(self._script_thread_id), None)
+                self._reported = None # Holds the script, which must not outlive its scene
+            self.current = call[3]
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._stop.wait(min(0.05, self.budget / 4.0))
+            call = self.current
+            if call is None or not self.enabled:
+                continue
+            interruptible = self.interrupt and call[1] not in LOAD_PHASES
+            if call is self._reported:
+                # Still running a budget after the interrupt: the script caught it, raise again
+                if interruptible and time.perf_counter() - self._interrupted >= self.budget:
+                    self._interrupt(call)
+                continue
+            elapsed = time.perf_counter() - call[2]
+            if elapsed < self.budget:
+                continue
+            self._reported = call
+            self._report(call, elapsed)
+            if interruptible:
+                self._interrupt(call)
+
+    def _report(self, call, elapsed):
+        script, phase = call[0], call[1]
+        if isinstance(script, type):
+            script_name, obj_name = script.__name__, "(System)"
+        else:
+            obj = getattr(script, "game_object", None)
+            script_name, obj_name = type(script).__name__, obj.name if obj is not None else "?"
+        frame = sys._current_frames().get(self._script_thread_id)
+        stack = traceback.format_stack(frame)[-self.STACK_DEPTH:] if frame is not None else []
+
+        report = {
+            "script": script_name,
+            "object": obj_name,
+            "phase": phase,
+            "elapsed_ms": elapsed * 1000.0,
+            "stack": stack,
+        }
+        self.reports.append(report)
+        log.warning("Script '%s' on '%s' has been in %s for %.0f ms (budget %.0f ms)\n%s",
+                    script_name, obj_name, phase, report["elapsed_ms"], self.budget * 1000,
+                    "".join(stack).rstrip())
+
+    def _interrupt(self, call):
+        with self._lock:
+            if self.current is not call:
+                return # Call finished while we were reporting
+            self._interrupted = time.perf_counter()
+            ctypes.pythonapi.PyThreadState_SetAsyncExc(
+                ctypes.c_ulong(self._script_thread_id), ctypes.py_object(ScriptTimeout))
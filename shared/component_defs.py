@@ -29,6 +29,7 @@ class BoxCollider:
     size: Tuple[float, float] = (50.0, 50.0)
     offset: Tuple[float, float] = (0.0, 0.0)
     is_trigger: bool = False
+    layer: str = "Default" # Named physics layer (scene settings)
 
 @dataclass
 class RigidBody:
@@ -38,6 +39,7 @@ class RigidBody:
     restitution: float = 0.5
     friction: float = 0.5
     fixed_rotation: bool = False
+    continuous: bool = False # Swept collision for fast bodies (bullets)
     velocity: Tuple[float, float] = (0.0, 0.0) # Runtime only
 
 @dataclass
@@ -45,6 +47,7 @@ class CircleCollider:
     radius: float = 25.0
     offset: Tuple[float, float] = (0.0, 0.0)
     is_trigger: bool = False
+    layer: str = "Default" # Named physics layer (scene settings)
 
 @dataclass
 class LightSource:
@@ -0,0 +1,62 @@
+from typing import Dict, List, Any, Tuple
+
+# Named physics layers live in the scene settings:
+#   "physics": {
+#       "layers": ["Default", "Player", "Bullet", "Debris"],
+#       "ignore_layer_collisions": [["Bullet", "Bullet"], ["Debris", "Debris"]]
+#   }
+# Each layer gets one category bit (in list order). The collision matrix is
+# symmetric: ignoring (A, B) also ignores (B, A). Colliders pick a layer by name
+# with their "layer" key.
+
+DEFAULT_LAYER = "Default"
+MAX_LAYERS = 32
+ALL_BITS = 0xFFFFFFFF
+
+def get_layer_names(settings: Dict[str, Any]) -> List[str]:
+    """Layer names from scene settings, always starting with the Default layer."""
+    physics = (settings or {}).get("physics", {}) or {}
+    names = [DEFAULT_LAYER]
+    for name in physics.get("layers", []):
+        if name and name not in names:
+            names.append(name)
+    if len(names) > MAX_LAYERS:
+        print(f"Warning: Only {MAX_LAYERS} physics layers are supported, ignoring {names[MAX_LAYERS:]}")
+        names = names[:MAX_LAYERS]
+    return names
+
+def get_ignored_pairs(settings: Dict[str, Any]) -> List[Tuple[str, str]]:
+    physics = (settings or {}).get("physics", {}) or {}
+    return [tuple(p) for p in physics.get("ignore_layer_collisions", []) if len(p) == 2]
+
+def layers_collide(settings: Dict[str, Any], layer_a: str, layer_b: str) -> bool:
+    for a, b in get_ignored_pairs(settings):
+        if (a, b) == (layer_a, layer_b) or (b, a) == (layer_a, layer_b):
+            return False
+    return True
+
+def set_layers_collide(settings: Dict[str, Any], layer_a: str, layer_b: str, collide: bool):
+    """Updates the ignore list in place (used by the editor's collision matrix)."""
+    physics = settings.setdefault("physics", {})
+    pairs = [p for p in physics.get("ignore_layer_collisions", [])
+             if sorted(p) != sorted([layer_a, layer_b])]
+    if not collide:
+        pairs.append([layer_a, layer_b])
+    physics["ignore_layer_collisions"] = pairs
+
+def compile_layer_masks(settings: Dict[str, Any]) -> Dict[str, Tuple[int, int]]:
+    """
+    Compiles the layer list and collision matrix into (category, mask) bits per layer name.
+    """
+    names = get_layer_names(settings)
+    bits = {name: 1 << i for i, name in enumerate(names)}
+    masks = {name: ALL_BITS for name in names}
+
+    for a, b in get_ignored_pairs(settings):
+        if a not in bits or b not in bits:
+            print(f"Warning: Unknown physics layer in ignore pair ({a}, {b})")
+            continue
+        masks[a] &= ~bits[b] & ALL_BITS
+        masks[b] &= ~bits[a] & ALL_BITS
+
+    return {name: (bits[name], masks[name]) for name in names}
@@ -0,0 +1,120 @@
+"""
+Broadphase benchmark: bounding box tree vs spatial hash.
+
+Steps the physics world of every stress scene with both broadphases and prints
+the average step time. Scenes that spawn objects at runtime (Spawner, ObjectCycler)
+are pre-filled with FallingBox prefabs so the numbers reflect a busy scene.
+
+Usage:
+    python stress_test/benchmarks/broadphase_bench.py [--ticks 600] [--spawn 300] [scene ...]
+"""
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+
+from shared.scene_loader import load_scene
+from runtime.api import GameObject
+from runtime.physics import PhysicsSystem
+
+PHYSICS_COMPONENTS = ("RigidBody", "BoxCollider", "CircleCollider")
+SPAWNING_SCRIPTS = ("Spawner.py", "ObjectCycler.py")
+PREFAB_PATH = os.path.join(ROOT, "stress_test", "prefabs", "FallingBox.json")
+FIXED_DT = 1.0 / 120.0
+
+
+def build_objects(scene_data, spawn_count):
+    """Creates runtime GameObjects with only the physics-relevant components."""
+    objects = []
+    spawns = False
+    for obj_data in scene_data.get("objects", []):
+        if not obj_data.get("active", True):
+            continue
+        comps = obj_data.get("components", {})
+        script_path = comps.get("Script", {}).get("script_path", "")
+        if script_path.endswith(SPAWNING_SCRIPTS):
+            spawns = True
+        if not any(c in comps for c in PHYSICS_COMPONENTS):
+            continue
+        transform = comps.get("Transform", {})
+        go = GameObject(obj_data["id"], obj_data.get("name", "Object"),
+                        transform.get("position", [0, 0]),
+                        transform.get("rotation", 0),
+                        transform.get("scale", [1, 1]))
+        for c in PHYSICS_COMPONENTS:
+            if c in comps:
+                go.components[c] = json.loads(json.dumps(comps[c]))
+        objects.append(go)
+
+    if spawns and spawn_count > 0:
+        with open(PREFAB_PATH, "r") as f:
+            prefab = json.load(f)
+        comps = prefab["components"]
+        scale = comps["Transform"].get("scale", [1, 1])
+        # Stack the clones in a grid above the floor, like a spawner would after a while
+        per_row = 10
+        for i in range(spawn_count):
+            x = 80 + (i % per_row) * 70
+            y = 500 - (i // per_row) * 70
+            go = GameObject(f"spawn_{i}", "FallingBox", [x, y], 0, scale)
+            for c in PHYSICS_COMPONENTS:
+                if c in comps:
+                    go.components[c] = dict(comps[c])
+            objects.append(go)
+
+    return objects
+
+
+def bench_scene(path, broadphase, ticks, spawn_count):
+    data = load_scene(path)
+    objects = build_objects(data, spawn_count)
+    if not objects:
+        return None, 0
+
+    settings = dict(data.get("settings", {}).get("physics", {}))
+    settings["broadphase"] = broadphase
+    settings.setdefault("expected_bodies", len(objects))
+
+    physics = PhysicsSystem()
+    try:
+        physics.configure_broadphase(settings, objects)
+        physics.update(FIXED_DT, objects) # Creates bodies, not timed
+    except ValueError as e:
+        print(f"  skipped: {e}")
+        return None, 0
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        physics.update(FIXED_DT, objects)
+    elapsed = time.perf_counter() - start
+    return elapsed / ticks * 1000.0, len(physics.bodies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare pymunk broadphases on the stress scenes")
+    parser.add_argument("scenes", nargs="*", help="Scene files (default: stress_test/scenes/*.scene.json)")
+    parser.add_argument("--ticks", type=int, default=600, help="Fixed steps per run")
+    parser.add_argument("--spawn", type=int, default=300, help="FallingBox clones added to spawner scenes")
+    args = parser.parse_args()
+
+    scenes = args.scenes or sorted(glob.glob(os.path.join(ROOT, "stress_test", "scenes", "*.scene.json")))
+
+    print(f"{'Scene':<40} {'Bodies':>7} {'BBTree ms':>10} {'Hash ms':>10} {'Speedup':>8}")
+    for path in scenes:
+        tree_ms, bodies = bench_scene(path, PhysicsSystem.BROADPHASE_BBTREE, args.ticks, args.spawn)
+        if tree_ms is None:
+            continue
+        hash_ms, _ = bench_scene(path, PhysicsSystem.BROADPHASE_SPATIAL_HASH, args.ticks, args.spawn)
+        if hash_ms is None:
+            continue
+        print(f"{os.path.basename(path):<40} {bodies:>7} {tree_ms:>10.3f} {hash_ms:>10.3f} {tree_ms / hash_ms:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
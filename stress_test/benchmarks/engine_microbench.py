@@ -0,0 +1,232 @@
+"""
+Microbenchmarks for engine hot paths, measured in isolation on synthetic scenes.
+
+Each case builds its fixture once, then times the call `--number` times per round
+for `--repeat` rounds and prints the best and median time per call:
+    load_scene          - shared.scene_loader.load_scene on a scene file with N objects
+    load_level          - GameRuntime.load_level for N physics objects
+    sync_to_physics     - PhysicsSystem._sync_to_physics over N bodies
+    sync_from_physics   - PhysicsSystem._sync_from_physics over N bodies
+    instantiate         - GameRuntime._perform_instantiate of the FallingBox prefab
+    snapshot_capture    - WorldSnapshot.capture with N physics objects
+    snapshot_restore    - WorldSnapshot.restore with N physics objects
+    draw_<kind>         - GameRuntime.draw with N renderables of one kind
+                          (rect, circle, sprite, text)
+    world_position_<d>  - GameObject.world_position at hierarchy depth d
+
+Runs without a display (SDL dummy drivers).
+
+Usage:
+    python stress_test/benchmarks/engine_microbench.py [--size 1000] [--repeat 5] [--number 20] [case ...]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+
+from shared.scene_loader import load_scene, save_scene
+from runtime.api import GameObject
+from runtime.game_loop import GameRuntime, FIXED_DT
+
+PREFAB = "stress_test/prefabs/FallingBox.json"
+SPRITE = "aspis.png"
+DEPTHS = (0, 1, 4, 16, 64)
+DEVNULL = open(os.devnull, "w") # Swallows the runtime's load messages
+
+
+# --- Fixtures ---
+
+def make_object(i, kind, columns):
+    x = 20 + (i % columns) * 24
+    y = 20 + (i // columns) * 24
+    comps = {"Transform": {"position": [x, y], "rotation": 0, "scale": [0.2, 0.2]}}
+    if kind == "physics":
+        comps["RigidBody"] = {"mass": 1.0, "body_type": "dynamic"}
+        comps["BoxCollider"] = {"size": [100, 100]}
+    elif kind == "rect":
+        comps["SpriteRenderer"] = {"sprite_path": "", "tint": [255, 100, 50, 255]}
+    elif kind == "circle":
+        comps["SpriteRenderer"] = {"sprite_path": "", "tint": [50, 100, 255, 255]}
+        comps["CircleCollider"] = {"radius": 50}
+    elif kind == "sprite":
+        comps["SpriteRenderer"] = {"sprite_path": SPRITE}
+    elif kind == "text":
+        comps["TextRenderer"] = {"text": f"Label {i}", "font_size": 14, "color": [220, 220, 220]}
+    return {"id": f"{kind}_{i}", "name": f"{kind} {i}", "components": comps}
+
+
+def make_scene(size, kind):
+    """Scene dict with `size` objects of one kind on a grid, plus a camera."""
+    columns = max(1, int(size ** 0.5))
+    objects = [make_object(i, kind, columns) for i in range(size)]
+    objects.append({"id": "cam", "name": "Main Camera", "components": {
+        "Transform": {"position": [400, 300]}, "Camera": {"is_main": True}}})
+    return {"metadata": {"name": f"bench {kind} x{size}"}, "objects": objects,
+            "settings": {"physics": {"expected_bodies": size}}}
+
+
+def write_scene(tmp_dir, size, kind):
+    path = os.path.join(tmp_dir, f"{kind}_{size}.scene.json")
+    save_scene(make_scene(size, kind), path)
+    return path
+
+
+def make_runtime(path):
+    with contextlib.redirect_stdout(DEVNULL):
+        return GameRuntime(path)
+
+
+def make_chain(depth):
+    """Returns the leaf of a parent chain `depth` links deep."""
+    node = GameObject("root", "root", [10, 10], 15.0, [1.1, 0.9])
+    for i in range(depth):
+        child = GameObject(f"n{i}", f"n{i}", [5, 3], 10.0, [1.0, 1.0])
+        child.parent = node
+        node.children.append(child)
+        node = child
+    return node
+
+
+# --- Cases: each returns (function to time, GameRuntime to shut down or None) ---
+
+def case_load_scene(size, tmp_dir):
+    path = write_scene(tmp_dir, size, "physics")
+    return lambda: load_scene(path), None
+
+
+def case_load_level(size, tmp_dir):
+    runtime = make_runtime(write_scene(tmp_dir, size, "physics"))
+
+    def reload():
+        runtime.active_scripts.clear()
+        runtime.objects.clear()
+        runtime.sprites.clear()
+        with contextlib.redirect_stdout(DEVNULL):
+            runtime.load_level()
+    return reload, runtime
+
+
+def _physics_runtime(size, tmp_dir):
+    runtime = make_runtime(write_scene(tmp_dir, size, "physics"))
+    runtime.physics.update(FIXED_DT, runtime.objects) # Creates the bodies
+    return runtime
+
+
+def case_sync_to_physics(size, tmp_dir):
+    runtime = _physics_runtime(size, tmp_dir)
+    return lambda: runtime.physics._sync_to_physics(runtime.objects), runtime
+
+
+def case_sync_from_physics(size, tmp_dir):
+    runtime = _physics_runtime(size, tmp_dir)
+    return lambda: runtime.physics._sync_from_physics(runtime.objects), runtime
+
+
+def case_instantiate(size, tmp_dir):
+    runtime = make_runtime(write_scene(tmp_dir, size, "physics"))
+    base = len(runtime.objects)
+
+    def instantiate():
+        runtime._perform_instantiate(PREFAB, [400, 300], 0)
+        if len(runtime.objects) > base + 1000:
+            del runtime.objects[base:] # Keep the list near the fixture size
+    return instantiate, runtime
+
+
+def case_snapshot_capture(size, tmp_dir):
+    runtime = _physics_runtime(size, tmp_dir)
+    return runtime.capture_snapshot, runtime
+
+
+def case_snapshot_restore(size, tmp_dir):
+    runtime = _physics_runtime(size, tmp_dir)
+    snapshot = runtime.capture_snapshot()
+    return lambda: runtime.restore_snapshot(snapshot), runtime
+
+
+def draw_case(kind):
+    def case(size, tmp_dir):
+        runtime = make_runtime(write_scene(tmp_dir, size, kind))
+        return runtime.draw, runtime
+    return case
+
+
+def position_case(depth):
+    def case(size, tmp_dir):
+        leaf = make_chain(depth)
+        return lambda: leaf.world_position, None
+    return case
+
+
+CASES = {
+    "load_scene": case_load_scene,
+    "load_level": case_load_level,
+    "sync_to_physics": case_sync_to_physics,
+    "sync_from_physics": case_sync_from_physics,
+    "instantiate": case_instantiate,
+    "snapshot_capture": case_snapshot_capture,
+    "snapshot_restore": case_snapshot_restore,
+}
+for _kind in ("rect", "circle", "sprite", "text"):
+    CASES[f"draw_{_kind}"] = draw_case(_kind)
+for _depth in DEPTHS:
+    CASES[f"world_position_{_depth}"] = position_case(_depth)
+
+
+def measure(fn, number, repeat):
+    """(best, median) seconds per call over `repeat` rounds of `number` calls."""
+    fn() # Warm caches (fonts, sprites, bodies)
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - start) / number)
+    rounds.sort()
+    return rounds[0], rounds[len(rounds) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time engine hot paths on synthetic scenes")
+    parser.add_argument("cases", nargs="*", help=f"Cases to run (default: all): {', '.join(CASES)}")
+    parser.add_argument("--size", type=int, default=1000, help="Objects in the synthetic scenes")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed rounds per case")
+    parser.add_argument("--number", type=int, default=20, help="Calls per round")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    names = args.cases or list(CASES)
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+
+    results = {}
+    print(f"{'Case':<22} {'Size':>6} {'Best ms':>10} {'Median ms':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in names:
+            fn, runtime = CASES[name](args.size, tmp_dir)
+            with contextlib.redirect_stdout(DEVNULL):
+                best, median = measure(fn, args.number, args.repeat)
+            if runtime is not None:
+                runtime.watchdog.stop()
+                runtime.gc_policy.shutdown()
+            results[name] = {"size": args.size, "best_ms": best * 1000.0, "median_ms": median * 1000.0}
+            print(f"{name:<22} {args.size:>6} {best * 1000.0:>10.4f} {median * 1000.0:>10.4f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
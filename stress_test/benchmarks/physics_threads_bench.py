@@ -0,0 +1,56 @@
+"""
+Threaded solver benchmark: steps the physics-heavy stress scenes with 1 and N
+solver threads (pymunk Space(threaded=True), not available on Windows).
+
+Usage:
+    python stress_test/benchmarks/physics_threads_bench.py [--threads 2] [--ticks 600] [--spawn 1000] [scene ...]
+"""
+import os
+import sys
+import time
+import argparse
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+
+from shared.scene_loader import load_scene
+from runtime.physics import PhysicsSystem
+from stress_test.benchmarks.broadphase_bench import build_objects, FIXED_DT
+
+DEFAULT_SCENES = ("05_stress_performance.scene.json", "09_object_cycling.scene.json", "10_physics_stacking.scene.json")
+
+
+def bench_scene(path, threads, ticks, spawn_count):
+    data = load_scene(path)
+    objects = build_objects(data, spawn_count)
+    physics = PhysicsSystem(threads=threads)
+    physics.configure_layers(data.get("settings", {}))
+    physics.update(FIXED_DT, objects) # Creates bodies, not timed
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        physics.update(FIXED_DT, objects)
+    return (time.perf_counter() - start) / ticks * 1000.0, len(physics.bodies), physics.threads
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare single and multi-threaded pymunk stepping")
+    parser.add_argument("scenes", nargs="*", help="Scene files (default: stress, cycling and stacking scenes)")
+    parser.add_argument("--threads", type=int, default=2, help="Solver threads for the threaded run")
+    parser.add_argument("--ticks", type=int, default=600, help="Fixed steps per run")
+    parser.add_argument("--spawn", type=int, default=1000, help="FallingBox clones added to spawner scenes")
+    args = parser.parse_args()
+
+    scenes = args.scenes or [os.path.join(ROOT, "stress_test", "scenes", s) for s in DEFAULT_SCENES]
+
+    print(f"{'Scene':<40} {'Bodies':>7} {'1 thread ms':>12} {'N threads ms':>13} {'Speedup':>8}")
+    for path in scenes:
+        single_ms, bodies, _ = bench_scene(path, 1, args.ticks, args.spawn)
+        multi_ms, _, used = bench_scene(path, args.threads, args.ticks, args.spawn)
+        label = f"{os.path.basename(path)} ({used}t)"
+        print(f"{label:<40} {bodies:>7} {single_ms:>12.3f} {multi_ms:>13.3f} {single_ms / multi_ms:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
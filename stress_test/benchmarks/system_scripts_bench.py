@@ -0,0 +1,123 @@
+"""
+System script benchmark: per-instance update() vs a batched update_all().
+
+Rotates N objects for a number of frames with three script styles and prints
+the average cost per frame:
+    per-instance  - ordinary Script.update, one call per object
+    system loop   - update_all(instances, dt) with a plain Python loop
+    system numpy  - update_all using TransformView (skipped without NumPy)
+
+Each style is a script file attached to N objects of a generated scene and loaded
+by GameRuntime, so the instances come from GameRuntime.load_script exactly as in a
+real scene; the "batches" column shows how many System calls a frame makes.
+Runs without a display (SDL dummy drivers).
+
+Usage:
+    python stress_test/benchmarks/system_scripts_bench.py [--objects 500] [--frames 600]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+
+from shared.scene_loader import save_scene
+from runtime.game_loop import GameRuntime
+from runtime.scheduler import PHASE_UPDATE
+
+FRAME_DT = 1.0 / 60.0
+DEVNULL = open(os.devnull, "w") # Swallows the runtime's load messages
+
+SCRIPTS = {
+    "InstanceRotator": """
+from runtime.api import Script
+
+class InstanceRotator(Script):
+    speed = 90.0
+    def update(self, dt):
+        self.transform.rotation += self.speed * dt
+""",
+    "LoopRotator": """
+from runtime.api import Script
+
+class LoopRotator(Script):
+    speed = 90.0
+    @classmethod
+    def update_all(cls, instances, dt):
+        for rotator in instances:
+            rotator.transform.rotation += rotator.speed * dt
+""",
+    "NumpyRotator": """
+from runtime.api import Script, TransformView
+
+class NumpyRotator(Script):
+    speed = 90.0
+    @classmethod
+    def update_all(cls, instances, dt):
+        view = TransformView(instances)
+        view.rotations += cls.speed * dt
+        view.write_back()
+""",
+}
+
+
+def write_scene(tmp_dir, script_name, count):
+    script_path = os.path.join(tmp_dir, f"{script_name}.py")
+    with open(script_path, "w") as f:
+        f.write(SCRIPTS[script_name])
+    objects = [{"id": f"r{i}", "name": f"Rotator {i}", "components": {
+        "Transform": {"position": [i, 0], "rotation": 0, "scale": [1, 1]},
+        "Script": {"script_path": script_path}}} for i in range(count)]
+    path = os.path.join(tmp_dir, f"{script_name}.scene.json")
+    save_scene({"metadata": {"name": f"bench {script_name} x{count}"}, "objects": objects}, path)
+    return path
+
+
+def bench(script_name, count, frames, tmp_dir):
+    """(ms per frame, System batches per frame) for `count` objects running script_name; None if it failed."""
+    with contextlib.redirect_stdout(DEVNULL):
+        runtime = GameRuntime(write_scene(tmp_dir, script_name, count))
+    try:
+        if len(runtime.active_scripts) != count:
+            return None
+        start = time.perf_counter()
+        for frame in range(frames):
+            runtime.scheduler.run(PHASE_UPDATE, FRAME_DT, frame, runtime._on_script_error)
+        elapsed = time.perf_counter() - start
+        if runtime.crashes:
+            return None # The runtime logged why (NumpyRotator without NumPy)
+        return elapsed / frames * 1000.0, len(runtime.scheduler.systems[PHASE_UPDATE])
+    finally:
+        runtime.parallel.shutdown()
+        runtime.watchdog.stop()
+        runtime.gc_policy.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-instance and batched System scripts")
+    parser.add_argument("--objects", type=int, default=500, help="Rotating objects")
+    parser.add_argument("--frames", type=int, default=600, help="Frames per run")
+    args = parser.parse_args()
+
+    print(f"{'Style':<15} {'ms/frame':>10} {'batches':>8}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, name in (("per-instance", "InstanceRotator"), ("system loop", "LoopRotator"),
+                            ("system numpy", "NumpyRotator")):
+            result = bench(name, args.objects, args.frames, tmp_dir)
+            if result is None:
+                print(f"{label:<15} {'n/a':>10}  (failed, see the log; NumPy not installed?)")
+                continue
+            ms, batches = result
+            print(f"{label:<15} {ms:>10.4f} {batches:>8}")
+
+
+if __name__ == "__main__":
+    main()
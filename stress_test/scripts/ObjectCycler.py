@@ -1,19 +1,18 @@
-from runtime.api import Script
+from runtime.api import Script, wait_seconds
 import random
 
 class ObjectCycler(Script):
-    timer = 0.0
     spawn_interval = 0.1
     max_objects = 10
 
     def start(self):
         self.objects = []
         print("ObjectCycler Started. Spawning FallingBoxes...")
+        self.start_coroutine(self.cycle())
 
-    def update(self, dt):
-        self.timer += dt
-        if self.timer > self.spawn_interval:
-            self.timer = 0
+    def cycle(self):
+        while True:
+            yield wait_seconds(self.spawn_interval)
             
             # Spawn
             pos = [random.randint(100, 700), 0]
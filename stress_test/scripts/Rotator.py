@@ -3,8 +3,8 @@ from runtime.api import Script
 class Rotator(Script):
     speed = 90.0 # Degrees per second
 
-    def update(self, dt):
-        # Debug who is rotating
-        print(f"Rotating: {self.game_object.name}")
-        current_rot = self.transform.rotation
-        self.transform.rotation = current_rot + self.speed * dt
+    # Runs as a System: one call per frame for every Rotator in the scene
+    @classmethod
+    def update_all(cls, instances, dt):
+        for rotator in instances:
+            rotator.transform.rotation += rotator.speed * dt
@@ -0,0 +1,15 @@
+from runtime.api import Script
+
+class RunawayScript(Script):
+    timer = 0.0
+
+    def start(self):
+        print("RunawayScript attached. Will hang in 1 second.")
+
+    def update(self, dt):
+        self.timer += dt
+        if self.timer > 1.0:
+            print("RunawayScript: Entering infinite loop...")
+            n = 0
+            while True:
+                n += 1
@@ -1,12 +1,12 @@
-from runtime.api import Script
+from runtime.api import Script, wait_seconds
 
 class SceneSwitcher(Script):
-    timer = 0.0
     next_scene = ""
     
-    def update(self, dt):
-        self.timer += dt
-        if self.timer > 1.0: # Switch every 1 second
-            self.timer = -999 # Prevent multiple calls
-            print(f"Switching to {self.next_scene}...")
-            self.load_scene(self.next_scene)
+    def start(self):
+        self.start_coroutine(self.switch_later())
+
+    def switch_later(self):
+        yield wait_seconds(1.0) # Switch every 1 second
+        print(f"Switching to {self.next_scene}...")
+        self.load_scene(self.next_scene)
@@ -1,18 +1,17 @@
-from runtime.api import Script
+from runtime.api import Script, wait_seconds
 import random
 
 class Spawner(Script):
-    spawn_timer = 0.0
     spawn_rate = 0.1 # Spawn every 0.1s
     count = 0
     max_count = 200
 
-    def update(self, dt):
-        if self.count >= self.max_count: return
+    def start(self):
+        self.start_coroutine(self.spawn_loop())
 
-        self.spawn_timer += dt
-        if self.spawn_timer >= self.spawn_rate:
-            self.spawn_timer = 0
+    def spawn_loop(self):
+        while self.count < self.max_count:
+            yield wait_seconds(self.spawn_rate)
             self.spawn_object()
 
     def spawn_object(self):